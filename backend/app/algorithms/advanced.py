@@ -1,17 +1,19 @@
-from typing import List, Tuple, Any
-from ..models import AlgorithmStep
+from typing import List, Tuple, Any, Iterator
+from ..steps import Step
+from ..registry import register, register_cost, register_result
+from ..cost import json_size
 import math
 import cmath
 
-def generate_n_queens_steps(n: int) -> List[AlgorithmStep]:
-    steps = []
+@register("n-queens", params={"n": 4})
+def generate_n_queens_steps(n: int) -> Iterator[Step]:
     board = [[0] * n for _ in range(n)]
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting N-Queens for N={n}",
         data={"board": [row[:] for row in board]}
-    ))
+    )
     
     def is_safe(row, col):
         # Check col
@@ -33,59 +35,58 @@ def generate_n_queens_steps(n: int) -> List[AlgorithmStep]:
     def solve(row):
         if row >= n:
             solutions.append([r[:] for r in board])
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"sol-{len(solutions)}",
                 description="✅ Found a solution!",
                 data={"board": [r[:] for r in board], "solution_found": True}
-            ))
+            )
             return True # Find one solution for visualization simplicity? Or all? Let's stop at one for clean viz or find all. The TS version finds all.
             # return False to find all
             
         for col in range(n):
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"try-{row}-{col}",
                 description=f"Trying Queen at ({row}, {col})",
                 data={"board": [r[:] for r in board], "highlight": [row, col]}
-            ))
+            )
             
             if is_safe(row, col):
                 board[row][col] = 1
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"place-{row}-{col}",
                     description=f"Placed Queen at ({row}, {col})",
                     data={"board": [r[:] for r in board]}
-                ))
+                )
                 
-                if solve(row + 1):
+                if (yield from solve(row + 1)):
                     return True # Return first solution logic
                     
                 board[row][col] = 0
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"backtrack-{row}-{col}",
                     description=f"Backtracking from ({row}, {col})",
                     data={"board": [r[:] for r in board]}
-                ))
+                )
                 
         return False
 
-    solve(0)
+    yield from solve(0)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ N-Queens Complete. Found solution.",
         data={"finished": True}
-    ))
-    return steps
+    )
 
-def generate_sudoku_solver_steps(grid: List[List[int]]) -> List[AlgorithmStep]:
-    steps = []
+@register("sudoku-solver", params={"board": []})
+def generate_sudoku_solver_steps(grid: List[List[int]]) -> Iterator[Step]:
     board = [row[:] for row in grid]
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Starting Sudoku Solver",
         data={"board": [row[:] for row in board]}
-    ))
+    )
     
     def valid(num, pos):
         # Check row
@@ -115,43 +116,42 @@ def generate_sudoku_solver_steps(grid: List[List[int]]) -> List[AlgorithmStep]:
                     for num in range(1, 10):
                         if valid(num, (i, j)):
                             board[i][j] = num
-                            steps.append(AlgorithmStep(
+                            yield Step(
                                 id=f"try-{i}-{j}-{num}",
                                 description=f"Placed {num} at ({i}, {j})",
                                 data={"board": [r[:] for r in board], "pos": [i, j]}
-                            ))
+                            )
                             
-                            if solve():
+                            if (yield from solve()):
                                 return True
                                 
                             board[i][j] = 0
-                            steps.append(AlgorithmStep(
+                            yield Step(
                                 id=f"backtrack-{i}-{j}",
                                 description=f"Backtracking at ({i}, {j})",
                                 data={"board": [r[:] for r in board], "pos": [i, j]}
-                            ))
+                            )
                     return False
         return True
 
-    solve()
+    yield from solve()
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ Sudoku Solved",
         data={"board": [r[:] for r in board], "finished": True}
-    ))
-    return steps
+    )
 
-def generate_kmp_steps(text: str, pattern: str) -> List[AlgorithmStep]:
-    steps = []
+@register("kmp", params={"text": "", "pattern": ""})
+def generate_kmp_steps(text: str, pattern: str) -> Iterator[Step]:
     n = len(text)
     m = len(pattern)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting KMP Search. Text: '{text}', Pattern: '{pattern}'",
         data={"text": text, "pattern": pattern}
-    ))
+    )
     
     # Compute LPS
     lps = [0] * m
@@ -162,11 +162,11 @@ def generate_kmp_steps(text: str, pattern: str) -> List[AlgorithmStep]:
             len_lps += 1
             lps[i] = len_lps
             i += 1
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"lps-{i}",
                 description=f"Computing LPS for pattern: matched len {len_lps}",
                 data={"lps": list(lps)}
-            ))
+            )
         else:
             if len_lps != 0:
                 len_lps = lps[len_lps - 1]
@@ -174,51 +174,50 @@ def generate_kmp_steps(text: str, pattern: str) -> List[AlgorithmStep]:
                 lps[i] = 0
                 i += 1
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="lps-done",
         description="LPS Table Computed",
         data={"lps": list(lps)}
-    ))
+    )
     
     i = 0
     j = 0
     while i < n:
         if pattern[j] == text[i]:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"match-{i}-{j}",
                 description=f"Match at text[{i}] and pattern[{j}]",
                 data={"text_idx": i, "pattern_idx": j}
-            ))
+            )
             i += 1
             j += 1
         
         if j == m:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"found-{i-j}",
                 description=f"✅ Pattern found at index {i-j}",
                 data={"found_index": i-j, "finished": True}
-            ))
+            )
             j = lps[j-1]
         elif i < n and pattern[j] != text[i]:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"mismatch-{i}-{j}",
                 description=f"Mismatch at text[{i}] vs pattern[{j}]",
                 data={"text_idx": i, "pattern_idx": j}
-            ))
+            )
             if j != 0:
                 j = lps[j-1]
             else:
                 i += 1
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="KMP Search Complete",
         data={"finished": True}
-    ))
-    return steps
+    )
 
-def generate_rabin_karp_steps(text: str, pattern: str) -> List[AlgorithmStep]:
-    steps = []
+@register("rabin-karp", params={"text": "", "pattern": ""})
+def generate_rabin_karp_steps(text: str, pattern: str) -> Iterator[Step]:
     d = 256
     q = 101
     n = len(text)
@@ -227,55 +226,54 @@ def generate_rabin_karp_steps(text: str, pattern: str) -> List[AlgorithmStep]:
     p = 0
     t = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Rabin-Karp. Hash Prime: {q}",
         data={"text": text, "pattern": pattern}
-    ))
+    )
     
     for i in range(m):
         p = (d * p + ord(pattern[i])) % q
         t = (d * t + ord(text[i])) % q
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="hash-init",
         description=f"Initial Hashes: Pattern={p}, Text_Window={t}",
         data={"p_hash": p, "t_hash": t}
-    ))
+    )
     
     for i in range(n - m + 1):
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"window-{i}",
             description=f"Checking window at {i}. Hash match: {p == t}",
             data={"index": i, "t_hash": t, "p_hash": p}
-        ))
+        )
         
         if p == t:
             if text[i:i+m] == pattern:
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"found-{i}",
                     description=f"✅ Pattern found at index {i}",
                     data={"found_index": i, "finished": True}
-                ))
+                )
                 
         if i < n - m:
             t = (d*(t - ord(text[i])*h) + ord(text[i+m])) % q
             if t < 0: t = t + q
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"hash-update-{i+1}",
                 description=f"Rolling hash updated for next window: {t}",
                 data={"new_hash": t}
-            ))
+            )
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="Rabin-Karp Search Complete",
         data={"finished": True}
-    ))
-    return steps
+    )
 
-def generate_karatsuba_steps(x: int, y: int) -> List[AlgorithmStep]:
-    steps = []
+@register("karatsuba", params={"x": 0, "y": 0})
+def generate_karatsuba_steps(x: int, y: int) -> Iterator[Step]:
     
     def karatsuba_recursive(num1, num2):
         if num1 < 10 or num2 < 10:
@@ -287,32 +285,31 @@ def generate_karatsuba_steps(x: int, y: int) -> List[AlgorithmStep]:
         high1, low1 = divmod(num1, 10**m2)
         high2, low2 = divmod(num2, 10**m2)
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"split-{num1}-{num2}",
             description=f"Split: {num1} -> ({high1}, {low1}), {num2} -> ({high2}, {low2})",
             data={"num1": num1, "num2": num2, "high1": high1, "low1": low1}
-        ))
+        )
         
-        z0 = karatsuba_recursive(low1, low2)
-        z1 = karatsuba_recursive((low1 + high1), (low2 + high2))
-        z2 = karatsuba_recursive(high1, high2)
+        z0 = yield from karatsuba_recursive(low1, low2)
+        z1 = yield from karatsuba_recursive((low1 + high1), (low2 + high2))
+        z2 = yield from karatsuba_recursive(high1, high2)
         
         return (z2 * 10**(2*m2)) + ((z1 - z2 - z0) * 10**m2) + z0
 
-    result = karatsuba_recursive(x, y)
+    result = yield from karatsuba_recursive(x, y)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Result: {result}",
         data={"result": result, "finished": True}
-    ))
-    return steps
+    )
 
 # Other advanced algorithms (simplified implementation or placeholders due to complexity/params)
-def generate_closest_pair_steps(points: List[List[int]]) -> List[AlgorithmStep]:
+@register("closest-pair", params={"points": []})
+def generate_closest_pair_steps(points: List[List[int]]) -> Iterator[Step]:
     # Simplified brute force for visualization or placeholder
-    steps = []
-    steps.append(AlgorithmStep(id="init", description="Closest Pair Logic (Python Stub)", data={"points": points}))
+    yield Step(id="init", description="Closest Pair Logic (Python Stub)", data={"points": points})
     
     min_dist = float('inf')
     p1 = None
@@ -321,33 +318,246 @@ def generate_closest_pair_steps(points: List[List[int]]) -> List[AlgorithmStep]:
     for i in range(len(points)):
         for j in range(i+1, len(points)):
             dist = math.sqrt((points[i][0]-points[j][0])**2 + (points[i][1]-points[j][1])**2)
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"check-{i}-{j}", 
                 description=f"Dist({i}, {j}) = {dist:.2f}", 
                 data={"p1": points[i], "p2": points[j], "dist": dist}
-            ))
+            )
             if dist < min_dist:
                 min_dist = dist
                 p1 = points[i]
                 p2 = points[j]
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Min Dist: {min_dist:.2f}",
         data={"min_dist": min_dist, "pair": [p1, p2], "finished": True}
-    ))
-    return steps
+    )
 
-def generate_fft_steps(coeffs: List[int]) -> List[AlgorithmStep]:
+@register("fft", params={"coeffs": []})
+def generate_fft_steps(coeffs: List[int]) -> Iterator[Step]:
     # Placeholder for FFT steps
-    steps = [AlgorithmStep(id="init", description="FFT steps (Python Stub)", data={"coeffs": coeffs})]
+    yield Step(id="init", description="FFT steps (Python Stub)", data={"coeffs": coeffs})
     # In a real implementation this would show recursive DFT calls
-    steps.append(AlgorithmStep(id="complete", description="FFT Complete", data={"finished": True}))
-    return steps
+    yield Step(id="complete", description="FFT Complete", data={"finished": True})
 
-def generate_convex_hull_steps(points: List[List[int]]) -> List[AlgorithmStep]:
+@register("convex-hull", params={"points": []})
+def generate_convex_hull_steps(points: List[List[int]]) -> Iterator[Step]:
     # Placeholder for Convex Hull (e.g., Jarvis March)
-    steps = [AlgorithmStep(id="init", description="Convex Hull (Python Stub)", data={"points": points})]
+    yield Step(id="init", description="Convex Hull (Python Stub)", data={"points": points})
     # Real impl...
-    steps.append(AlgorithmStep(id="complete", description="Convex Hull Complete", data={"finished": True}))
-    return steps
+    yield Step(id="complete", description="Convex Hull Complete", data={"finished": True})
+
+# Trace-free implementations for mode=result: same algorithms, no steps
+
+@register_result("n-queens")
+def n_queens_result(n: int):
+    queens = []
+    cols, diag1, diag2 = set(), set(), set()
+    placements = backtracks = 0
+
+    def solve(row):
+        nonlocal placements, backtracks
+        if row >= n:
+            return True
+        for col in range(n):
+            if col not in cols and row - col not in diag1 and row + col not in diag2:
+                queens.append(col)
+                cols.add(col); diag1.add(row - col); diag2.add(row + col)
+                placements += 1
+                if solve(row + 1):
+                    return True
+                queens.pop()
+                cols.discard(col); diag1.discard(row - col); diag2.discard(row + col)
+                backtracks += 1
+        return False
+
+    found = solve(0)
+    board = [[1 if queens[row] == col else 0 for col in range(n)] for row in range(n)] if found else None
+    return {"solution_found": found, "board": board}, {"placements": placements, "backtracks": backtracks}
+
+@register_result("sudoku-solver")
+def sudoku_solver_result(grid: List[List[int]]):
+    board = [row[:] for row in grid]
+    placements = backtracks = 0
+
+    def valid(num, i, j):
+        if num in board[i] or any(row[j] == num for row in board):
+            return False
+        box_i, box_j = i // 3 * 3, j // 3 * 3
+        return all(num not in board[r][box_j:box_j + 3] for r in range(box_i, box_i + 3))
+
+    def solve():
+        nonlocal placements, backtracks
+        for i in range(len(board)):
+            for j in range(len(board[0])):
+                if board[i][j] == 0:
+                    for num in range(1, 10):
+                        if valid(num, i, j):
+                            board[i][j] = num
+                            placements += 1
+                            if solve():
+                                return True
+                            board[i][j] = 0
+                            backtracks += 1
+                    return False
+        return True
+
+    solve()
+    return {"board": board}, {"placements": placements, "backtracks": backtracks}
+
+@register_result("kmp")
+def kmp_result(text: str, pattern: str):
+    n, m = len(text), len(pattern)
+    if m == 0:
+        return {"matches": []}, {"comparisons": 0}
+    lps = [0] * m
+    len_lps = 0
+    i = 1
+    comparisons = 0
+    while i < m:
+        comparisons += 1
+        if pattern[i] == pattern[len_lps]:
+            len_lps += 1
+            lps[i] = len_lps
+            i += 1
+        elif len_lps != 0:
+            len_lps = lps[len_lps - 1]
+        else:
+            i += 1
+
+    matches = []
+    i = j = 0
+    while i < n:
+        comparisons += 1
+        if pattern[j] == text[i]:
+            i += 1
+            j += 1
+        if j == m:
+            matches.append(i - j)
+            j = lps[j-1]
+        elif i < n and pattern[j] != text[i]:
+            comparisons += 1
+            if j != 0:
+                j = lps[j-1]
+            else:
+                i += 1
+    return {"matches": matches}, {"comparisons": comparisons}
+
+@register_result("rabin-karp")
+def rabin_karp_result(text: str, pattern: str):
+    d = 256
+    q = 101
+    n, m = len(text), len(pattern)
+    if m == 0 or m > n:
+        return {"matches": []}, {"windows": 0, "verifications": 0}
+    h = pow(d, m-1) % q
+    p = t = 0
+    for i in range(m):
+        p = (d * p + ord(pattern[i])) % q
+        t = (d * t + ord(text[i])) % q
+    matches = []
+    verifications = 0
+    for i in range(n - m + 1):
+        if p == t:
+            verifications += 1
+            if text[i:i+m] == pattern:
+                matches.append(i)
+        if i < n - m:
+            t = (d*(t - ord(text[i])*h) + ord(text[i+m])) % q
+    return {"matches": matches}, {"windows": n - m + 1, "verifications": verifications}
+
+@register_result("karatsuba")
+def karatsuba_result(x: int, y: int):
+    multiplications = splits = 0
+
+    def karatsuba_recursive(num1, num2):
+        nonlocal multiplications, splits
+        if num1 < 10 or num2 < 10:
+            multiplications += 1
+            return num1 * num2
+        splits += 1
+        m2 = max(len(str(num1)), len(str(num2))) // 2
+        high1, low1 = divmod(num1, 10**m2)
+        high2, low2 = divmod(num2, 10**m2)
+        z0 = karatsuba_recursive(low1, low2)
+        z1 = karatsuba_recursive((low1 + high1), (low2 + high2))
+        z2 = karatsuba_recursive(high1, high2)
+        return (z2 * 10**(2*m2)) + ((z1 - z2 - z0) * 10**m2) + z0
+
+    result = karatsuba_recursive(x, y)
+    return {"result": result}, {"multiplications": multiplications, "splits": splits}
+
+@register_result("closest-pair")
+def closest_pair_result(points: List[List[int]]):
+    min_dist = float('inf')
+    p1 = p2 = None
+    for i in range(len(points)):
+        for j in range(i+1, len(points)):
+            dist = math.sqrt((points[i][0]-points[j][0])**2 + (points[i][1]-points[j][1])**2)
+            if dist < min_dist:
+                min_dist = dist
+                p1 = points[i]
+                p2 = points[j]
+    n = len(points)
+    return {"min_dist": min_dist, "pair": [p1, p2]}, {"distances": n * (n - 1) // 2}
+
+# fft and convex-hull are stubs that compute nothing; their results mirror that
+@register_result("fft")
+def fft_result(coeffs: List[int]):
+    return {}, {}
+
+@register_result("convex-hull")
+def convex_hull_result(points: List[List[int]]):
+    return {}, {}
+
+
+# Cost models for admission control: (steps, bytes per step, operations)
+
+# Placements plus backtracks until the first solution, for n = 1..25
+_QUEENS_TRIES = [
+    1, 4, 10, 12, 5, 56, 11, 218, 73, 194, 93, 510, 209, 3784, 2703, 20088, 10731, 82580, 5071, 399250,
+    17103, 3474354, 50833, 823192, 97341,
+]
+
+@register_cost("n-queens")
+def n_queens_cost(n: int):
+    if n < 1:
+        return 2, 0, 0
+    # Past the table, assume the search keeps growing by about 3x per queen
+    tries = _QUEENS_TRIES[n - 1] if n <= len(_QUEENS_TRIES) else max(_QUEENS_TRIES) * 3 ** (n - len(_QUEENS_TRIES))
+    return 0.6 * n * tries + 2, 3 * n * n, n * tries
+
+@register_cost("sudoku-solver")
+def sudoku_solver_cost(grid: List[List[int]]):
+    # Near-complete boards fill in linearly; below ~36 clues backtracking takes over
+    blanks = sum(row.count(0) for row in grid)
+    tries = 2 * blanks * 2 ** (max(0, blanks - 45) / 4)
+    return tries + 2, 250, 9 * tries
+
+@register_cost("kmp")
+def kmp_cost(text: str, pattern: str):
+    return 2 * len(text) + len(pattern) + 2, 30, 2 * len(text) + len(pattern)
+
+@register_cost("rabin-karp")
+def rabin_karp_cost(text: str, pattern: str):
+    return 2 * len(text) + 2, 30, len(text) + len(pattern)
+
+@register_cost("karatsuba")
+def karatsuba_cost(x: int, y: int):
+    digits = max(len(str(abs(x))), len(str(abs(y))))
+    multiplications = digits ** math.log2(3)
+    return 0.7 * multiplications + 2, 4 * digits, multiplications
+
+@register_cost("closest-pair")
+def closest_pair_cost(points: List[List[int]]):
+    pairs = len(points) * (len(points) - 1) / 2
+    return pairs + 2, 40, pairs
+
+@register_cost("fft")
+def fft_cost(coeffs: List[int]):
+    return 2, json_size(coeffs) / 2, 0
+
+@register_cost("convex-hull")
+def convex_hull_cost(points: List[List[int]]):
+    return 2, json_size(points) / 2, 0
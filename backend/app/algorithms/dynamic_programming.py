@@ -1,213 +1,221 @@
-from typing import List, Dict, Any
-from ..models import AlgorithmStep
+from typing import List, Iterator
+from collections import deque
+from ..steps import Step, Trace
+from ..registry import register, register_cost, register_result
+from ..cost import OPERATIONS_PER_STEP, json_size
 
-def generate_fibonacci_dp_steps(n: int) -> List[AlgorithmStep]:
-    steps = []
+@register("fibonacci-dp", params={"n": 0})
+def generate_fibonacci_dp_steps(n: int) -> Iterator[Step]:
     dp = [0] * (n + 1)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Initialized DP table for Fibonacci({n})",
         data={"dp": list(dp)}
-    ))
+    )
     
     if n >= 0:
         dp[0] = 0
-        steps.append(AlgorithmStep(
+        yield Step(
             id="base-0",
             description="Base case: F(0) = 0",
             highlightedIndices=[0],
             data={"dp": list(dp)}
-        ))
+        )
     if n >= 1:
         dp[1] = 1
-        steps.append(AlgorithmStep(
+        yield Step(
             id="base-1",
             description="Base case: F(1) = 1",
             highlightedIndices=[1],
             data={"dp": list(dp)}
-        ))
+        )
         
     for i in range(2, n + 1):
         dp[i] = dp[i-1] + dp[i-2]
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"calc-{i}",
             description=f"F({i}) = F({i-1}) + F({i-2}) = {dp[i-1]} + {dp[i-2]} = {dp[i]}",
             highlightedIndices=[i],
             comparedIndices=[i-1, i-2],
             data={"dp": list(dp)}
-        ))
+        )
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Fibonacci({n}) = {dp[n]}",
         data={"result": dp[n], "finished": True}
-    ))
-    return steps
+    )
+    return {"cells": len(dp)}
 
-def generate_knapsack_01_steps(weights: List[int], values: List[int], capacity: int) -> List[AlgorithmStep]:
-    steps = []
+@register("knapsack-0-1", params={"weights": [], "values": [], "capacity": 0})
+def generate_knapsack_01_steps(weights: List[int], values: List[int], capacity: int) -> Iterator[Step]:
     n = len(weights)
     dp = [[0 for _ in range(capacity + 1)] for _ in range(n + 1)]
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Initialized DP table for 0/1 Knapsack (Items: {n}, Capacity: {capacity})",
-        data={"dp": dp} # 2D array might need formatting for frontend
-    ))
+        data={"dp": [row[:] for row in dp]} # 2D array might need formatting for frontend
+    )
     
     for i in range(1, n + 1):
         for w in range(1, capacity + 1):
             wt = weights[i-1]
             val = values[i-1]
             
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"check-{i}-{w}",
                 description=f"Item {i} (Wt:{wt}, Val:{val}) at Capacity {w}",
                 data={"i": i, "w": w}
-            ))
+            )
             
             if wt <= w:
                 include_val = val + dp[i-1][w-wt]
                 exclude_val = dp[i-1][w]
                 dp[i][w] = max(include_val, exclude_val)
                 
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"update-{i}-{w}",
                     description=f"Max(Include: {include_val}, Exclude: {exclude_val}) = {dp[i][w]}",
                     data={"dp": [row[:] for row in dp], "highlight": [i, w]}
-                ))
+                )
             else:
                 dp[i][w] = dp[i-1][w]
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"skip-{i}-{w}",
                     description=f"Cannot include (Wt {wt} > Cap {w}). Value: {dp[i][w]}",
                     data={"dp": [row[:] for row in dp], "highlight": [i, w]}
-                ))
+                )
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Max Value: {dp[n][capacity]}",
         data={"max_value": dp[n][capacity], "finished": True}
-    ))
-    return steps
+    )
+    return {"cells": n * max(capacity, 0)}
 
-def generate_lcs_steps(s1: str, s2: str) -> List[AlgorithmStep]:
-    steps = []
+@register("lcs", params={"s1": "", "s2": ""})
+def generate_lcs_steps(s1: str, s2: str) -> Iterator[Step]:
     m, n = len(s1), len(s2)
     dp = [[0] * (n + 1) for _ in range(m + 1)]
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Initialized LCS DP Table for '{s1}' vs '{s2}'",
-        data={"dp": dp}
-    ))
+        data={"dp": [row[:] for row in dp]}
+    )
     
     for i in range(1, m + 1):
         for j in range(1, n + 1):
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"compare-{i}-{j}",
                 description=f"Comparing '{s1[i-1]}' and '{s2[j-1]}'",
                 data={"i": i, "j": j}
-            ))
+            )
             
             if s1[i-1] == s2[j-1]:
                 dp[i][j] = dp[i-1][j-1] + 1
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"match-{i}-{j}",
                     description=f"Match! 1 + LCS({i-1}, {j-1}) = {dp[i][j]}",
                     data={"dp": [row[:] for row in dp], "highlight": [i, j]}
-                ))
+                )
             else:
                 dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"mismatch-{i}-{j}",
                     description=f"Mismatch. Max(Up: {dp[i-1][j]}, Left: {dp[i][j-1]}) = {dp[i][j]}",
                     data={"dp": [row[:] for row in dp], "highlight": [i, j]}
-                ))
+                )
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ LCS Length: {dp[m][n]}",
         data={"lcs_length": dp[m][n], "finished": True}
-    ))
-    return steps
+    )
+    return {"cells": m * n}
 
-def generate_unbounded_knapsack_steps(weights: List[int], values: List[int], capacity: int) -> List[AlgorithmStep]:
-    steps = []
+@register("unbounded-knapsack", params={"weights": [], "values": [], "capacity": 0})
+def generate_unbounded_knapsack_steps(weights: List[int], values: List[int], capacity: int) -> Iterator[Step]:
     n = len(values)
     dp = [0] * (capacity + 1)
+    comparisons = updates = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Initialized DP table for Unbounded Knapsack",
         data={"dp": list(dp)}
-    ))
+    )
     
     for i in range(capacity + 1):
         for j in range(n):
             if weights[j] <= i:
-                steps.append(AlgorithmStep(
+                comparisons += 1
+                yield Step(
                     id=f"check-{i}-{j}",
                     description=f"Checking item {j} at capacity {i}",
                     data={"dp": list(dp), "current_cap": i}
-                ))
+                )
                 if dp[i - weights[j]] + values[j] > dp[i]:
                     dp[i] = dp[i - weights[j]] + values[j]
-                    steps.append(AlgorithmStep(
+                    updates += 1
+                    yield Step(
                         id=f"update-{i}",
                         description=f"Updated max value at capacity {i} to {dp[i]}",
                         highlightedIndices=[i],
                         data={"dp": list(dp)}
-                    ))
+                    )
                     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Max Value (Unbounded): {dp[capacity]}",
         data={"max_value": dp[capacity], "finished": True}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons, "updates": updates}
 
-def generate_lis_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("lis", params={"array": []})
+def generate_lis_steps(arr: List[int]) -> Iterator[Step]:
     n = len(arr)
-    if n == 0: return steps
+    if n == 0: return {"comparisons": 0, "updates": 0}
     
     lis = [1] * n
+    updates = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Initialized LIS array with 1s",
         data={"array": list(arr), "lis": list(lis)}
-    ))
+    )
     
     for i in range(1, n):
         for j in range(0, i):
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"compare-{i}-{j}",
                 description=f"Comparing arr[{i}]={arr[i]} with arr[{j}]={arr[j]}",
                 comparedIndices=[i, j],
                 data={"array": list(arr), "lis": list(lis)}
-            ))
+            )
             
             if arr[i] > arr[j] and lis[i] < lis[j] + 1:
                 lis[i] = lis[j] + 1
-                steps.append(AlgorithmStep(
+                updates += 1
+                yield Step(
                     id=f"update-{i}",
                     description=f"LIS at {i} updated: {lis[i]}",
                     highlightedIndices=[i],
                     data={"array": list(arr), "lis": list(lis)}
-                ))
+                )
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Longest Increasing Subsequence Length: {max(lis)}",
         data={"max_lis": max(lis), "finished": True}
-    ))
-    return steps
+    )
+    return {"comparisons": n * (n - 1) // 2, "updates": updates}
 
-def generate_edit_distance_steps(s1: str, s2: str) -> List[AlgorithmStep]:
-    steps = []
+@register("edit-distance", params={"s1": "", "s2": ""})
+def generate_edit_distance_steps(s1: str, s2: str) -> Iterator[Step]:
     m, n = len(s1), len(s2)
     dp = [[0] * (n + 1) for _ in range(m + 1)]
     
@@ -216,96 +224,98 @@ def generate_edit_distance_steps(s1: str, s2: str) -> List[AlgorithmStep]:
             if i == 0: dp[i][j] = j
             elif j == 0: dp[i][j] = i
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Initialized Edit Distance Matrix for '{s1}' -> '{s2}'",
         data={"dp": [row[:] for row in dp]}
-    ))
+    )
     
     for i in range(1, m + 1):
         for j in range(1, n + 1):
             if s1[i-1] == s2[j-1]:
                 dp[i][j] = dp[i-1][j-1]
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"match-{i}-{j}",
                     description=f"Match '{s1[i-1]}': No op needed. Cost={dp[i][j]}",
                     data={"dp": [row[:] for row in dp], "highlight": [i, j]}
-                ))
+                )
             else:
                 dp[i][j] = 1 + min(dp[i][j-1], dp[i-1][j], dp[i-1][j-1])
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"op-{i}-{j}",
                     description=f"Mismatch. Min(Insert, Remove, Replace) + 1 = {dp[i][j]}",
                     data={"dp": [row[:] for row in dp], "highlight": [i, j]}
-                ))
+                )
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Edit Distance: {dp[m][n]}",
         data={"distance": dp[m][n], "finished": True}
-    ))
-    return steps
+    )
+    return {"cells": m * n}
 
-def generate_rod_cutting_steps(prices: List[int], length: int) -> List[AlgorithmStep]:
-    steps = []
+@register("rod-cutting", params={"prices": [], "length": 0})
+def generate_rod_cutting_steps(prices: List[int], length: int) -> Iterator[Step]:
     val = [0] * (length + 1)
+    cuts = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Initialized value array for Rod Length {length}",
         data={"max_values": list(val)}
-    ))
+    )
     
     for i in range(1, length + 1):
         max_val = -float('inf')
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"calc-start-{i}",
             description=f"Calculating max value for length {i}",
             highlightedIndices=[i],
             data={"max_values": list(val)}
-        ))
+        )
         
         # Note: prices array is usually 0-indexed where index 0 is length 1 or similar. 
         # Assuming prices[i] is price for rod of length i+1.
         for j in range(i):
             if j < len(prices):
                 current_val = prices[j] + val[i - j - 1]
-                steps.append(AlgorithmStep(
+                cuts += 1
+                yield Step(
                     id=f"cut-{i}-{j+1}",
                     description=f"Try cut length {j+1} (Price: {prices[j]}) + MaxVal({i-(j+1)}): {current_val}",
                     data={"max_values": list(val)}
-                ))
+                )
                 if current_val > max_val:
                     max_val = current_val
                     
         val[i] = max_val if max_val != -float('inf') else 0
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"update-{i}",
             description=f"Max value for length {i} is {val[i]}",
             highlightedIndices=[i],
             data={"max_values": list(val)}
-        ))
+        )
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Max Revenue: {val[length]}",
         data={"max_revenue": val[length], "finished": True}
-    ))
-    return steps
+    )
+    return {"cuts": cuts}
 
-def generate_subset_sum_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("subset-sum", params={"array": [], "target": 0})
+def generate_subset_sum_steps(arr: List[int], target: int) -> Iterator[Step]:
     n = len(arr)
     dp = [[False for _ in range(target + 1)] for _ in range(n + 1)]
     
     for i in range(n + 1):
         dp[i][0] = True
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Initialized subset sum table for Target {target}",
         data={"dp_preview": "Grid initialized"} # Full boolean grid might be heavy
-    ))
+    )
     
     for i in range(1, n + 1):
         for j in range(1, target + 1):
@@ -313,88 +323,274 @@ def generate_subset_sum_steps(arr: List[int], target: int) -> List[AlgorithmStep
             if arr[i-1] <= j:
                 dp[i][j] = dp[i][j] or dp[i-1][j - arr[i-1]]
                 
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"cell-{i}-{j}",
                 description=f"Using items 0..{i-1} can sum to {j}? {dp[i][j]}",
                 data={"i": i, "j": j, "val": dp[i][j]}
-            ))
+            )
             
     result = dp[n][target]
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Subset Sum Exists: {result}",
         data={"exists": result, "finished": True}
-    ))
-    return steps
+    )
+    return {"cells": n * max(target, 0)}
 
-def generate_partition_problem_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("partition-problem", params={"array": []})
+def generate_partition_problem_steps(arr: List[int]) -> Iterator[Step]:
     total_sum = sum(arr)
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Checking if array can be partitioned. Total Sum: {total_sum}",
         data={"array": list(arr), "sum": total_sum}
-    ))
+    )
     
     if total_sum % 2 != 0:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="fail-odd",
             description="Total sum is odd, cannot partition into equal halves.",
             data={"finished": True, "possible": False}
-        ))
-        return steps
+        )
+        return {"cells": 0}
         
     target = total_sum // 2
-    # Reuse subset sum logic effectively
-    subset_steps = generate_subset_sum_steps(arr, target)
+    # Reuse subset sum logic effectively, keeping only its final step
+    subset_trace = Trace(generate_subset_sum_steps(arr, target))
+    last_subset_step = deque(subset_trace, maxlen=1)[0]
     
     # Map subset steps to partition context or just append
     # For simplicity, we create new steps indicating progress towards target = sum/2
-    can_partition = subset_steps[-1].data.get("exists", False)
+    can_partition = last_subset_step.data.get("exists", False)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="check-subset",
         description=f"Checking if subset with sum {target} exists...",
         data={"target": target}
-    ))
+    )
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Partition Possible: {can_partition}",
         data={"possible": can_partition, "finished": True}
-    ))
-    return steps
+    )
+    return subset_trace.operations
 
-def generate_matrix_chain_multiplication_steps(dims: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("matrix-chain-multiplication", params={"dimensions": []})
+def generate_matrix_chain_multiplication_steps(dims: List[int]) -> Iterator[Step]:
     n = len(dims) - 1
     m = [[0 for _ in range(n)] for _ in range(n)]
+    splits = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Initialized cost matrix",
         data={"m": [row[:] for row in m]}
-    ))
+    )
     
     for length in range(2, n + 1):
         for i in range(n - length + 1):
             j = i + length - 1
             m[i][j] = float('inf')
             
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"calc-range-{i}-{j}",
                 description=f"Calculating minimum cost for chain {i} to {j}",
                 data={"m": [row[:] for row in m]}
-            ))
+            )
             
             for k in range(i, j):
+                splits += 1
                 q = m[i][k] + m[k+1][j] + dims[i] * dims[k+1] * dims[j+1]
                 if q < m[i][j]:
                     m[i][j] = q
                     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Min Matrix Multiplication Cost: {m[0][n-1]}",
         data={"min_cost": m[0][n-1], "finished": True}
-    ))
-    return steps
+    )
+    return {"splits": splits}
+
+# Trace-free implementations for mode=result: same algorithms, no steps
+
+@register_result("fibonacci-dp")
+def fibonacci_dp_result(n: int):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return {"result": a}, {"cells": max(n + 1, 0)}
+
+@register_result("knapsack-0-1")
+def knapsack_01_result(weights: List[int], values: List[int], capacity: int):
+    # One row is enough when capacities are visited from high to low
+    dp = [0] * (capacity + 1)
+    for wt, val in zip(weights, values):
+        for w in range(capacity, max(wt, 1) - 1, -1):
+            include_val = val + dp[w - wt]
+            if include_val > dp[w]:
+                dp[w] = include_val
+    return {"max_value": dp[capacity]}, {"cells": len(weights) * max(capacity, 0)}
+
+@register_result("lcs")
+def lcs_result(s1: str, s2: str):
+    m, n = len(s1), len(s2)
+    prev = [0] * (n + 1)
+    for i in range(1, m + 1):
+        cur = [0] * (n + 1)
+        a = s1[i-1]
+        for j in range(1, n + 1):
+            if a == s2[j-1]:
+                cur[j] = prev[j-1] + 1
+            else:
+                cur[j] = max(prev[j], cur[j-1])
+        prev = cur
+    return {"lcs_length": prev[n]}, {"cells": m * n}
+
+@register_result("unbounded-knapsack")
+def unbounded_knapsack_result(weights: List[int], values: List[int], capacity: int):
+    dp = [0] * (capacity + 1)
+    comparisons = updates = 0
+    for i in range(capacity + 1):
+        for j in range(len(values)):
+            if weights[j] <= i:
+                comparisons += 1
+                if dp[i - weights[j]] + values[j] > dp[i]:
+                    dp[i] = dp[i - weights[j]] + values[j]
+                    updates += 1
+    return {"max_value": dp[capacity]}, {"comparisons": comparisons, "updates": updates}
+
+@register_result("lis")
+def lis_result(arr: List[int]):
+    n = len(arr)
+    if n == 0:
+        return {"max_lis": 0}, {"comparisons": 0, "updates": 0}
+    lis = [1] * n
+    updates = 0
+    for i in range(1, n):
+        for j in range(0, i):
+            if arr[i] > arr[j] and lis[i] < lis[j] + 1:
+                lis[i] = lis[j] + 1
+                updates += 1
+    return {"max_lis": max(lis)}, {"comparisons": n * (n - 1) // 2, "updates": updates}
+
+@register_result("edit-distance")
+def edit_distance_result(s1: str, s2: str):
+    m, n = len(s1), len(s2)
+    prev = list(range(n + 1))
+    for i in range(1, m + 1):
+        cur = [i] + [0] * n
+        a = s1[i-1]
+        for j in range(1, n + 1):
+            if a == s2[j-1]:
+                cur[j] = prev[j-1]
+            else:
+                cur[j] = 1 + min(cur[j-1], prev[j], prev[j-1])
+        prev = cur
+    return {"distance": prev[n]}, {"cells": m * n}
+
+@register_result("rod-cutting")
+def rod_cutting_result(prices: List[int], length: int):
+    val = [0] * (length + 1)
+    cuts = 0
+    for i in range(1, length + 1):
+        max_val = -float('inf')
+        for j in range(min(i, len(prices))):
+            cuts += 1
+            current_val = prices[j] + val[i - j - 1]
+            if current_val > max_val:
+                max_val = current_val
+        val[i] = max_val if max_val != -float('inf') else 0
+    return {"max_revenue": val[length]}, {"cuts": cuts}
+
+@register_result("subset-sum")
+def subset_sum_result(arr: List[int], target: int):
+    # Bit j of reachable is set when some subset sums to j
+    reachable = 1
+    mask = (1 << (target + 1)) - 1
+    for x in arr:
+        if x <= target:
+            reachable |= (reachable << x) & mask
+    return {"exists": bool(reachable >> target & 1)}, {"cells": len(arr) * max(target, 0)}
+
+@register_result("partition-problem")
+def partition_problem_result(arr: List[int]):
+    total_sum = sum(arr)
+    if total_sum % 2 != 0:
+        return {"possible": False}, {"cells": 0}
+    state, counts = subset_sum_result(arr, total_sum // 2)
+    return {"possible": state["exists"]}, counts
+
+@register_result("matrix-chain-multiplication")
+def matrix_chain_multiplication_result(dims: List[int]):
+    n = len(dims) - 1
+    m = [[0] * n for _ in range(n)]
+    splits = 0
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            m[i][j] = float('inf')
+            for k in range(i, j):
+                splits += 1
+                q = m[i][k] + m[k+1][j] + dims[i] * dims[k+1] * dims[j+1]
+                if q < m[i][j]:
+                    m[i][j] = q
+    return {"min_cost": m[0][n-1]}, {"splits": splits}
+
+
+# Cost models for admission control: (steps, bytes per step, operations).
+# Table-filling steps carry a copy of the table, about half of them in full.
+
+@register_cost("fibonacci-dp")
+def fibonacci_dp_cost(n: int):
+    # F(i) has about 0.209 * i digits and the table fills up as the trace goes
+    return n + 3, 0.035 * n * n + 2 * n, n
+
+@register_cost("knapsack-0-1")
+def knapsack_01_cost(weights: List[int], values: List[int], capacity: int):
+    cells = (len(weights) + 1) * (capacity + 1)
+    return 2 * cells + 2, 1.6 * cells, cells
+
+@register_cost("lcs")
+def lcs_cost(s1: str, s2: str):
+    cells = (len(s1) + 1) * (len(s2) + 1)
+    return 2 * cells + 2, 1.2 * cells, cells
+
+@register_cost("unbounded-knapsack")
+def unbounded_knapsack_cost(weights: List[int], values: List[int], capacity: int):
+    return 1.5 * capacity * len(weights) + 2, 3 * (capacity + 1), capacity * len(weights)
+
+@register_cost("lis")
+def lis_cost(arr: List[int]):
+    # Steps carry the array and the lis table
+    n = len(arr)
+    return 0.6 * n * n + 2, 1.6 * json_size(arr), 0.6 * n * n
+
+@register_cost("edit-distance")
+def edit_distance_cost(s1: str, s2: str):
+    cells = (len(s1) + 1) * (len(s2) + 1)
+    return cells + 2, 2.5 * cells, cells
+
+@register_cost("rod-cutting")
+def rod_cutting_cost(prices: List[int], length: int):
+    return length * length / 2 + 2, 3.3 * (length + 1), length * length / 2
+
+@register_cost("subset-sum")
+def subset_sum_cost(arr: List[int], target: int):
+    # Steps only carry the cell being filled
+    cells = len(arr) * (max(target, 0) + 1)
+    return cells + 2, 20, cells
+
+@register_cost("partition-problem")
+def partition_problem_cost(arr: List[int]):
+    total = sum(arr)
+    if total % 2:
+        return 2, json_size(arr) / 2, len(arr)
+    # The subset-sum steps are built but not emitted: count them as work
+    subset_steps, _, cells = subset_sum_cost(arr, total // 2)
+    return 3, json_size(arr) / 3, cells + OPERATIONS_PER_STEP * subset_steps
+
+@register_cost("matrix-chain-multiplication")
+def matrix_chain_multiplication_cost(dims: List[int]):
+    n = max(len(dims) - 1, 0)
+    return n * n / 2 + 2, 3 * n * n, n ** 3 / 6
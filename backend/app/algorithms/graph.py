@@ -1,88 +1,97 @@
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterator
 import heapq
-from ..models import AlgorithmStep
+from collections import deque
+from ..steps import Step
+from ..registry import register, register_cost, register_result
+from ..cost import json_size, log2
 
-def generate_bfs_steps(graph: Dict[str, List[str]], start_node: str) -> List[AlgorithmStep]:
-    steps = []
+@register("bfs", params={"graph": {}, "startNode": "A"})
+def generate_bfs_steps(graph: Dict[str, List[str]], start_node: str) -> Iterator[Step]:
     queue = [start_node]
     visited = {start_node}
+    visits = edges = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting BFS from node {start_node}",
         data={"queue": list(queue), "visited": list(visited)}
-    ))
+    )
     
     while queue:
         node = queue.pop(0)
-        steps.append(AlgorithmStep(
+        visits += 1
+        yield Step(
             id=f"visit-{node}",
             description=f"Visiting node {node}",
             highlightedIndices=[], # Graph viz needs specific node mapping
             data={"current_node": node, "queue": list(queue)}
-        ))
+        )
         
         if node in graph:
             for neighbor in graph[node]:
+                edges += 1
                 if neighbor not in visited:
                     visited.add(neighbor)
                     queue.append(neighbor)
-                    steps.append(AlgorithmStep(
+                    yield Step(
                         id=f"explore-{node}-{neighbor}",
                         description=f"Found unvisited neighbor {neighbor}",
                         data={"neighbor": neighbor, "queue": list(queue)}
-                    ))
+                    )
                     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ BFS Traversal Complete",
         data={"visited": list(visited), "finished": True}
-    ))
-    return steps
+    )
+    return {"visits": visits, "edges": edges}
 
-def generate_dfs_steps(graph: Dict[str, List[str]], start_node: str) -> List[AlgorithmStep]:
-    steps = []
+@register("dfs", params={"graph": {}, "startNode": "A"})
+def generate_dfs_steps(graph: Dict[str, List[str]], start_node: str) -> Iterator[Step]:
     visited = set()
     stack = [start_node]
+    visits = edges = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting DFS from node {start_node}",
         data={"stack": list(stack), "visited": list(visited)}
-    ))
+    )
     
     while stack:
         node = stack.pop()
         
         if node not in visited:
             visited.add(node)
-            steps.append(AlgorithmStep(
+            visits += 1
+            yield Step(
                 id=f"visit-{node}",
                 description=f"Visiting node {node}",
                 data={"current_node": node, "visited": list(visited)}
-            ))
+            )
             
             # Add neighbors to stack in reverse order to visit them in order
             if node in graph:
                 neighbors = graph[node]
                 for neighbor in reversed(neighbors):
+                    edges += 1
                     if neighbor not in visited:
                         stack.append(neighbor)
-                        steps.append(AlgorithmStep(
+                        yield Step(
                             id=f"push-{neighbor}",
                             description=f"Pushing neighbor {neighbor} to stack",
                             data={"stack": list(stack)}
-                        ))
+                        )
                         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ DFS Traversal Complete",
         data={"visited": list(visited), "finished": True}
-    ))
-    return steps
+    )
+    return {"visits": visits, "edges": edges}
 
-def generate_topological_sort_steps(graph: Dict[str, List[str]]) -> List[AlgorithmStep]:
-    steps = []
+@register("topological-sort", params={"graph": {}})
+def generate_topological_sort_steps(graph: Dict[str, List[str]]) -> Iterator[Step]:
     # Calculate in-degrees
     in_degree = {node: 0 for node in graph}
     for u in graph:
@@ -91,49 +100,51 @@ def generate_topological_sort_steps(graph: Dict[str, List[str]]) -> List[Algorit
             
     queue = [node for node in in_degree if in_degree[node] == 0]
     topo_order = []
+    edges = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Initialized In-Degrees and Queue",
-        data={"in_degree": in_degree, "queue": list(queue)}
-    ))
+        data={"in_degree": dict(in_degree), "queue": list(queue)}
+    )
     
     while queue:
         u = queue.pop(0)
         topo_order.append(u)
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"process-{u}",
             description=f"Processing node {u} (In-degree 0)",
             data={"node": u, "topo_order": list(topo_order)}
-        ))
+        )
         
         if u in graph:
             for v in graph[u]:
+                edges += 1
                 in_degree[v] -= 1
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"decrement-{v}",
                     description=f"Decremented in-degree of {v} to {in_degree[v]}",
-                    data={"node": v, "in_degree": in_degree}
-                ))
+                    data={"node": v, "in_degree": dict(in_degree)}
+                )
                 
                 if in_degree[v] == 0:
                     queue.append(v)
-                    steps.append(AlgorithmStep(
+                    yield Step(
                         id=f"enqueue-{v}",
                         description=f"Node {v} has in-degree 0, added to queue",
                         data={"queue": list(queue)}
-                    ))
+                    )
                     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Topological Sort: {topo_order}",
         data={"result": topo_order, "finished": True}
-    ))
-    return steps
+    )
+    return {"visits": len(topo_order), "edges": edges}
 
-def generate_dijkstra_steps(graph_edges: List[Dict[str, Any]], start_node: int, num_nodes: int) -> List[AlgorithmStep]:
-    steps = []
+@register("dijkstra", params={"edges": [], "startNode": 0, "numNodes": 0})
+def generate_dijkstra_steps(graph_edges: List[Dict[str, Any]], start_node: int, num_nodes: int) -> Iterator[Step]:
     # Convert edge list to adjacency list: u -> [(v, w)]
     adj = {i: [] for i in range(num_nodes)}
     for edge in graph_edges:
@@ -143,44 +154,47 @@ def generate_dijkstra_steps(graph_edges: List[Dict[str, Any]], start_node: int,
     distances = {i: float('inf') for i in range(num_nodes)}
     distances[start_node] = 0
     pq = [(0, start_node)]
+    visits = relaxations = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Dijkstra from node {start_node}",
-        data={"distances": distances}
-    ))
+        data={"distances": dict(distances)}
+    )
     
     while pq:
         d, u = heapq.heappop(pq)
         
         if d > distances[u]:
             continue
+        visits += 1
             
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"visit-{u}",
             description=f"Visiting node {u} with distance {d}",
             data={"node": u, "distance": d}
-        ))
+        )
         
         for v, weight in adj[u]:
             if distances[u] + weight < distances[v]:
                 distances[v] = distances[u] + weight
                 heapq.heappush(pq, (distances[v], v))
-                steps.append(AlgorithmStep(
+                relaxations += 1
+                yield Step(
                     id=f"relax-{u}-{v}",
                     description=f"Relaxing edge {u}-{v}: New dist {distances[v]}",
-                    data={"distances": distances, "v": v}
-                ))
+                    data={"distances": dict(distances), "v": v}
+                )
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ Dijkstra Complete",
-        data={"distances": distances, "finished": True}
-    ))
-    return steps
+        data={"distances": dict(distances), "finished": True}
+    )
+    return {"visits": visits, "relaxations": relaxations}
 
-def generate_kruskal_steps(edges: List[Dict[str, Any]], num_nodes: int) -> List[AlgorithmStep]:
-    steps = []
+@register("kruskal", params={"edges": [], "numNodes": 0})
+def generate_kruskal_steps(edges: List[Dict[str, Any]], num_nodes: int) -> Iterator[Step]:
     sorted_edges = sorted(edges, key=lambda x: x['w'])
     
     parent = list(range(num_nodes))
@@ -197,46 +211,48 @@ def generate_kruskal_steps(edges: List[Dict[str, Any]], num_nodes: int) -> List[
         
     mst_weight = 0
     mst_edges = []
+    unions = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Sorted edges by weight",
         data={"edges": sorted_edges}
-    ))
+    )
     
     for edge in sorted_edges:
         u, v, w = edge['u'], edge['v'], edge['w']
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{u}-{v}",
             description=f"Checking edge {u}-{v} (Weight: {w})",
             data={"edge": edge}
-        ))
+        )
         
         if union(u, v):
+            unions += 1
             mst_weight += w
             mst_edges.append(edge)
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"add-{u}-{v}",
                 description=f"Added edge {u}-{v} to MST",
-                data={"mst_edges": mst_edges, "mst_weight": mst_weight}
-            ))
+                data={"mst_edges": list(mst_edges), "mst_weight": mst_weight}
+            )
         else:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"cycle-{u}-{v}",
                 description=f"Skipping edge {u}-{v} (Cycle detected)",
                 data={}
-            ))
+            )
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ MST Weight: {mst_weight}",
         data={"mst_weight": mst_weight, "finished": True}
-    ))
-    return steps
+    )
+    return {"edges": len(sorted_edges), "unions": unions}
 
-def generate_prim_steps(graph_edges: List[Dict[str, Any]], num_nodes: int) -> List[AlgorithmStep]:
-    steps = []
+@register("prim", params={"edges": [], "numNodes": 0})
+def generate_prim_steps(graph_edges: List[Dict[str, Any]], num_nodes: int) -> Iterator[Step]:
     adj = {i: [] for i in range(num_nodes)}
     for edge in graph_edges:
         adj[edge['u']].append((edge['v'], edge['w']))
@@ -247,45 +263,48 @@ def generate_prim_steps(graph_edges: List[Dict[str, Any]], num_nodes: int) -> Li
     key[0] = 0
     mst_set = [False] * num_nodes
     pq = [(0, 0)]
+    visits = updates = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Starting Prim's Algorithm from node 0",
-        data={"keys": key}
-    ))
+        data={"keys": list(key)}
+    )
     
     while pq:
         d, u = heapq.heappop(pq)
         
         if mst_set[u]: continue
         mst_set[u] = True
+        visits += 1
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"include-{u}",
             description=f"Included node {u} in MST",
-            data={"node": u, "mst_set": mst_set}
-        ))
+            data={"node": u, "mst_set": list(mst_set)}
+        )
         
         for v, w in adj[u]:
             if not mst_set[v] and w < key[v]:
                 key[v] = w
                 parent[v] = u
                 heapq.heappush(pq, (key[v], v))
-                steps.append(AlgorithmStep(
+                updates += 1
+                yield Step(
                     id=f"update-{v}",
                     description=f"Updated key used for {v} to {w} (Parent: {u})",
-                    data={"keys": key, "parents": parent}
-                ))
+                    data={"keys": list(key), "parents": list(parent)}
+                )
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ Prim's MST Complete",
         data={"mst_weight": sum([k for k in key if k != float('inf')]), "finished": True}
-    ))
-    return steps
+    )
+    return {"visits": visits, "updates": updates}
 
-def generate_floyd_warshall_steps(graph_matrix: List[List[int]]) -> List[AlgorithmStep]:
-    steps = []
+@register("floyd-warshall", params={"matrix": []})
+def generate_floyd_warshall_steps(graph_matrix: List[List[int]]) -> Iterator[Step]:
     n = len(graph_matrix)
     dist = [row[:] for row in graph_matrix]
     
@@ -296,59 +315,64 @@ def generate_floyd_warshall_steps(graph_matrix: List[List[int]]) -> List[Algorit
             if dist[i][j] == -1: # Assuming -1 or specific value for infinity in input
                 dist[i][j] = float('inf')
                 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Initialized Distance Matrix",
         data={"matrix": [[str(x) if x == float('inf') else x for x in row] for row in dist]}
-    ))
+    )
     
+    relaxations = 0
     for k in range(n):
         for i in range(n):
             for j in range(n):
                 if dist[i][k] != float('inf') and dist[k][j] != float('inf') and dist[i][k] + dist[k][j] < dist[i][j]:
                     dist[i][j] = dist[i][k] + dist[k][j]
-                    steps.append(AlgorithmStep(
+                    relaxations += 1
+                    yield Step(
                         id=f"update-{k}-{i}-{j}",
                         description=f"Updated dist[{i}][{j}] using node {k}: {dist[i][j]}",
                         data={"matrix": [[str(x) if x == float('inf') else x for x in row] for row in dist], "highlight": [i, j, k]}
-                    ))
+                    )
                     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ All-Pairs Shortest Paths Computed",
         data={"matrix": [[str(x) if x == float('inf') else x for x in row] for row in dist], "finished": True}
-    ))
-    return steps
+    )
+    return {"cells": n ** 3, "relaxations": relaxations}
 
-def generate_bellman_ford_steps(edges: List[Dict[str, Any]], num_nodes: int, start_node: int) -> List[AlgorithmStep]:
-    steps = []
+@register("bellman-ford", params={"edges": [], "numNodes": 0, "startNode": 0})
+def generate_bellman_ford_steps(edges: List[Dict[str, Any]], num_nodes: int, start_node: int) -> Iterator[Step]:
     dist = [float('inf')] * num_nodes
     dist[start_node] = 0
+    passes = relaxations = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Bellman-Ford from node {start_node}",
         data={"distances": [str(d) for d in dist]}
-    ))
+    )
     
     for i in range(num_nodes - 1):
         changed = False
-        steps.append(AlgorithmStep(
+        passes += 1
+        yield Step(
             id=f"iter-{i}",
             description=f"Iteration {i+1}",
             data={}
-        ))
+        )
         
         for edge in edges:
             u, v, w = edge['u'], edge['v'], edge['w']
             if dist[u] != float('inf') and dist[u] + w < dist[v]:
                 dist[v] = dist[u] + w
                 changed = True
-                steps.append(AlgorithmStep(
+                relaxations += 1
+                yield Step(
                     id=f"relax-{u}-{v}-{i}",
                     description=f"Relaxed edge {u}-{v}: {dist[v]}",
                     data={"distances": [str(d) for d in dist], "highlight_edge": edge}
-                ))
+                )
                 
         if not changed:
             break
@@ -357,16 +381,222 @@ def generate_bellman_ford_steps(edges: List[Dict[str, Any]], num_nodes: int, sta
     for edge in edges:
         u, v, w = edge['u'], edge['v'], edge['w']
         if dist[u] != float('inf') and dist[u] + w < dist[v]:
-             steps.append(AlgorithmStep(
+             yield Step(
                 id="cycle-detected",
                 description="❌ Negative Weight Cycle Detected!",
                 data={"cycle": True, "finished": True}
-            ))
-             return steps
+            )
+             return {"passes": passes, "relaxations": relaxations}
              
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ Shortest Paths Computed",
         data={"distances": [str(d) for d in dist], "finished": True}
-    ))
-    return steps
+    )
+    return {"passes": passes, "relaxations": relaxations}
+
+# Trace-free implementations for mode=result: same algorithms, no steps
+
+@register_result("bfs")
+def bfs_result(graph: Dict[str, List[str]], start_node: str):
+    queue = deque([start_node])
+    visited = {start_node}
+    visits = edges = 0
+    while queue:
+        node = queue.popleft()
+        visits += 1
+        for neighbor in graph.get(node, ()):
+            edges += 1
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return {"visited": list(visited)}, {"visits": visits, "edges": edges}
+
+@register_result("dfs")
+def dfs_result(graph: Dict[str, List[str]], start_node: str):
+    visited = set()
+    stack = [start_node]
+    visits = edges = 0
+    while stack:
+        node = stack.pop()
+        if node not in visited:
+            visited.add(node)
+            visits += 1
+            for neighbor in reversed(graph.get(node, ())):
+                edges += 1
+                if neighbor not in visited:
+                    stack.append(neighbor)
+    return {"visited": list(visited)}, {"visits": visits, "edges": edges}
+
+@register_result("topological-sort")
+def topological_sort_result(graph: Dict[str, List[str]]):
+    in_degree = {node: 0 for node in graph}
+    for u in graph:
+        for v in graph[u]:
+            in_degree[v] = in_degree.get(v, 0) + 1
+    queue = deque(node for node in in_degree if in_degree[node] == 0)
+    topo_order = []
+    edges = 0
+    while queue:
+        u = queue.popleft()
+        topo_order.append(u)
+        for v in graph.get(u, ()):
+            edges += 1
+            in_degree[v] -= 1
+            if in_degree[v] == 0:
+                queue.append(v)
+    return {"result": topo_order}, {"visits": len(topo_order), "edges": edges}
+
+@register_result("dijkstra")
+def dijkstra_result(graph_edges: List[Dict[str, Any]], start_node: int, num_nodes: int):
+    adj = {i: [] for i in range(num_nodes)}
+    for edge in graph_edges:
+        adj[edge['u']].append((edge['v'], edge['w']))
+        adj[edge['v']].append((edge['u'], edge['w']))
+    distances = {i: float('inf') for i in range(num_nodes)}
+    distances[start_node] = 0
+    pq = [(0, start_node)]
+    visits = relaxations = 0
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > distances[u]:
+            continue
+        visits += 1
+        for v, weight in adj[u]:
+            if d + weight < distances[v]:
+                distances[v] = d + weight
+                heapq.heappush(pq, (distances[v], v))
+                relaxations += 1
+    return {"distances": distances}, {"visits": visits, "relaxations": relaxations}
+
+@register_result("kruskal")
+def kruskal_result(edges: List[Dict[str, Any]], num_nodes: int):
+    parent = list(range(num_nodes))
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+    mst_weight = 0
+    unions = 0
+    for edge in sorted(edges, key=lambda x: x['w']):
+        root_u, root_v = find(edge['u']), find(edge['v'])
+        if root_u != root_v:
+            parent[root_u] = root_v
+            mst_weight += edge['w']
+            unions += 1
+    return {"mst_weight": mst_weight}, {"edges": len(edges), "unions": unions}
+
+@register_result("prim")
+def prim_result(graph_edges: List[Dict[str, Any]], num_nodes: int):
+    adj = {i: [] for i in range(num_nodes)}
+    for edge in graph_edges:
+        adj[edge['u']].append((edge['v'], edge['w']))
+        adj[edge['v']].append((edge['u'], edge['w']))
+    key = [float('inf')] * num_nodes
+    key[0] = 0
+    mst_set = [False] * num_nodes
+    pq = [(0, 0)]
+    visits = updates = 0
+    while pq:
+        d, u = heapq.heappop(pq)
+        if mst_set[u]: continue
+        mst_set[u] = True
+        visits += 1
+        for v, w in adj[u]:
+            if not mst_set[v] and w < key[v]:
+                key[v] = w
+                heapq.heappush(pq, (w, v))
+                updates += 1
+    return {"mst_weight": sum([k for k in key if k != float('inf')])}, {"visits": visits, "updates": updates}
+
+@register_result("floyd-warshall")
+def floyd_warshall_result(graph_matrix: List[List[int]]):
+    n = len(graph_matrix)
+    inf = float('inf')
+    dist = [[inf if x == -1 else x for x in row] for row in graph_matrix]
+    relaxations = 0
+    for k in range(n):
+        dist_k = dist[k]
+        for i in range(n):
+            dist_i = dist[i]
+            if dist_i[k] == inf:
+                continue
+            for j in range(n):
+                if dist_k[j] != inf and dist_i[k] + dist_k[j] < dist_i[j]:
+                    dist_i[j] = dist_i[k] + dist_k[j]
+                    relaxations += 1
+    matrix = [[str(x) if x == inf else x for x in row] for row in dist]
+    return {"matrix": matrix}, {"cells": n ** 3, "relaxations": relaxations}
+
+@register_result("bellman-ford")
+def bellman_ford_result(edges: List[Dict[str, Any]], num_nodes: int, start_node: int):
+    dist = [float('inf')] * num_nodes
+    dist[start_node] = 0
+    passes = relaxations = 0
+    for _ in range(num_nodes - 1):
+        passes += 1
+        changed = False
+        for edge in edges:
+            u, v, w = edge['u'], edge['v'], edge['w']
+            if dist[u] != float('inf') and dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+                changed = True
+                relaxations += 1
+        if not changed:
+            break
+    counts = {"passes": passes, "relaxations": relaxations}
+    for edge in edges:
+        if dist[edge['u']] != float('inf') and dist[edge['u']] + edge['w'] < dist[edge['v']]:
+            return {"cycle": True}, counts
+    return {"distances": [str(d) for d in dist]}, counts
+
+
+# Cost models for admission control: (steps, bytes per step, operations)
+
+def _adjacency_size(graph: Dict[str, List[str]]) -> Tuple[int, int]:
+    return len(graph), sum(len(neighbors) for neighbors in graph.values())
+
+@register_cost("bfs")
+def bfs_cost(graph: Dict[str, List[str]], start_node: str):
+    nodes, edges = _adjacency_size(graph)
+    return 2 * nodes + 1, json_size(list(graph)) / 3, nodes + edges
+
+@register_cost("dfs")
+def dfs_cost(graph: Dict[str, List[str]], start_node: str):
+    # Steps carry the visited set and a stack that grows with the degree
+    nodes, edges = _adjacency_size(graph)
+    return nodes + edges / 2 + 2, json_size(list(graph)) * max(0.4, edges / (8 * max(nodes, 1))), nodes + edges
+
+@register_cost("topological-sort")
+def topological_sort_cost(graph: Dict[str, List[str]]):
+    nodes, edges = _adjacency_size(graph)
+    return 2 * nodes + edges + 1, json_size(list(graph)), nodes + edges
+
+def _shortest_path_cost(num_edges: int, num_nodes: int):
+    # Steps are node visits plus the relaxations that improve a distance
+    steps = 2 * num_nodes + num_nodes * log2(num_edges / max(num_nodes, 1) + 1) / 2
+    return steps, 6 * num_nodes, (num_nodes + num_edges) * log2(num_nodes)
+
+@register_cost("dijkstra")
+def dijkstra_cost(graph_edges: List[Dict[str, Any]], start_node: int, num_nodes: int):
+    return _shortest_path_cost(len(graph_edges), num_nodes)
+
+@register_cost("kruskal")
+def kruskal_cost(edges: List[Dict[str, Any]], num_nodes: int):
+    return 2 * len(edges) + 2, 200, len(edges) * log2(len(edges))
+
+@register_cost("prim")
+def prim_cost(graph_edges: List[Dict[str, Any]], num_nodes: int):
+    return _shortest_path_cost(len(graph_edges), num_nodes)
+
+@register_cost("floyd-warshall")
+def floyd_warshall_cost(graph_matrix: List[List[int]]):
+    # A step per improved distance, each carrying a fresh copy of the whole matrix
+    n = len(graph_matrix)
+    steps = n ** 3 / 10 + n
+    return steps, 4 * n * n, n ** 3 + steps * n * n
+
+@register_cost("bellman-ford")
+def bellman_ford_cost(edges: List[Dict[str, Any]], num_nodes: int, start_node: int):
+    steps, step_bytes, _ = _shortest_path_cost(len(edges), num_nodes)
+    return steps, step_bytes, num_nodes * len(edges)
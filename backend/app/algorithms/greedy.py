@@ -1,9 +1,11 @@
-from typing import List, Dict, Any
+from typing import List, Iterator
 import heapq
-from ..models import AlgorithmStep
+from ..steps import Step
+from ..registry import register, register_cost, register_result
+from ..cost import json_size, log2
 
-def generate_activity_selection_steps(start_times: List[int], end_times: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("activity-selection", params={"startTimes": [], "endTimes": []})
+def generate_activity_selection_steps(start_times: List[int], end_times: List[int]) -> Iterator[Step]:
     # Combine and sort by end time
     activities = []
     for i in range(len(start_times)):
@@ -12,55 +14,54 @@ def generate_activity_selection_steps(start_times: List[int], end_times: List[in
     # Sort by end time
     sorted_activities = sorted(activities, key=lambda x: x['end'])
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Sorted activities by end time",
         data={"activities": sorted_activities}
-    ))
+    )
     
     selected_indices = []
     if not sorted_activities:
-        return steps
+        return
         
     # Select first activity
     last_selected = sorted_activities[0]
     selected_indices.append(last_selected['id'])
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id=f"select-{last_selected['id']}",
         description=f"Selected initial activity {last_selected['id']} (Ends at {last_selected['end']})",
         highlightedIndices=[0], # Highlighting in sorted list
-        data={"selected": selected_indices, "last_end": last_selected['end']}
-    ))
+        data={"selected": list(selected_indices), "last_end": last_selected['end']}
+    )
     
     for i in range(1, len(sorted_activities)):
         current = sorted_activities[i]
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{current['id']}",
             description=f"Checking activity {current['id']}: Start {current['start']} >= Last End {last_selected['end']}?",
             comparedIndices=[i],
             data={"current": current}
-        ))
+        )
         
         if current['start'] >= last_selected['end']:
             last_selected = current
             selected_indices.append(current['id'])
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"select-{current['id']}",
                 description=f"Selected activity {current['id']}",
                 highlightedIndices=[i], 
-                data={"selected": selected_indices, "last_end": last_selected['end']}
-            ))
+                data={"selected": list(selected_indices), "last_end": last_selected['end']}
+            )
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Selected {len(selected_indices)} activities",
-        data={"selected": selected_indices, "finished": True}
-    ))
-    return steps
+        data={"selected": list(selected_indices), "finished": True}
+    )
 
-def generate_fractional_knapsack_steps(weights: List[int], values: List[int], capacity: int) -> List[AlgorithmStep]:
-    steps = []
+@register("fractional-knapsack", params={"weights": [], "values": [], "capacity": 0})
+def generate_fractional_knapsack_steps(weights: List[int], values: List[int], capacity: int) -> Iterator[Step]:
     items = []
     for i in range(len(weights)):
         items.append({'id': i, 'weight': weights[i], 'value': values[i], 'ratio': values[i]/weights[i]})
@@ -68,11 +69,11 @@ def generate_fractional_knapsack_steps(weights: List[int], values: List[int], ca
     # Sort by value/weight ratio descending
     sorted_items = sorted(items, key=lambda x: x['ratio'], reverse=True)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Sorted items by Value/Weight ratio",
         data={"items": sorted_items, "capacity": capacity}
-    ))
+    )
     
     current_weight = 0
     total_value = 0.0
@@ -83,43 +84,42 @@ def generate_fractional_knapsack_steps(weights: List[int], values: List[int], ca
             
         remaining_capacity = capacity - current_weight
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{item['id']}",
             description=f"Checking item {item['id']} (Wt: {item['weight']}, Val: {item['value']})",
             comparedIndices=[i],
             data={"current_item": item, "remaining_capacity": remaining_capacity}
-        ))
+        )
         
         if item['weight'] <= remaining_capacity:
             current_weight += item['weight']
             total_value += item['value']
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"take-full-{item['id']}",
                 description=f"Took full item {item['id']}",
                 highlightedIndices=[i],
                 data={"total_value": total_value, "current_weight": current_weight}
-            ))
+            )
         else:
             fraction = remaining_capacity / item['weight']
             total_value += item['value'] * fraction
             current_weight += item['weight'] * fraction # which is capacity
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"take-fraction-{item['id']}",
                 description=f"Took {fraction:.2f} of item {item['id']}",
                 highlightedIndices=[i],
                 data={"total_value": total_value, "current_weight": current_weight}
-            ))
+            )
             break
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Max Value: {total_value:.2f}",
         data={"total_value": total_value, "finished": True}
-    ))
-    return steps
+    )
 
-def generate_job_sequencing_steps(ids: List[str], deadlines: List[int], profits: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("job-sequencing", params={"ids": [], "deadlines": [], "profits": []})
+def generate_job_sequencing_steps(ids: List[str], deadlines: List[int], profits: List[int]) -> Iterator[Step]:
     n = len(ids)
     jobs = []
     for i in range(n):
@@ -131,21 +131,21 @@ def generate_job_sequencing_steps(ids: List[str], deadlines: List[int], profits:
     max_deadline = max(deadlines) if deadlines else 0
     slots = [-1] * max_deadline
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Sorted jobs by profit. Created empty schedule slots.",
-        data={"jobs": jobs, "slots": slots}
-    ))
+        data={"jobs": list(jobs), "slots": list(slots)}
+    )
     
     total_profit = 0
     jobs_done = 0
     
     for i, job in enumerate(jobs):
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{job['id']}",
             description=f"Attempting to schedule Job {job['id']} (Profit: {job['profit']}, Deadline: {job['deadline']})",
             data={"current_job": job}
-        ))
+        )
         
         # Find free slot from deadline-1 down to 0
         scheduled = False
@@ -155,30 +155,29 @@ def generate_job_sequencing_steps(ids: List[str], deadlines: List[int], profits:
                 total_profit += job['profit']
                 jobs_done += 1
                 scheduled = True
-                steps.append(AlgorithmStep(
+                yield Step(
                     id=f"schedule-{job['id']}",
                     description=f"Scheduled Job {job['id']} at slot {j}",
                     highlightedIndices=[j], # Highlighting slot
                     data={"slots": list(slots), "total_profit": total_profit}
-                ))
+                )
                 break
         
         if not scheduled:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"skip-{job['id']}",
                 description=f"Could not schedule Job {job['id']} (No slots)",
                 data={"slots": list(slots)}
-            ))
+            )
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Scheduled {jobs_done} jobs for Profit: {total_profit}",
         data={"slots": list(slots), "total_profit": total_profit, "finished": True}
-    ))
-    return steps
+    )
 
-def generate_huffman_coding_steps(chars: List[str], freqs: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("huffman-coding", params={"chars": [], "frequencies": []})
+def generate_huffman_coding_steps(chars: List[str], freqs: List[int]) -> Iterator[Step]:
     
     class Node:
         def __init__(self, freq, symbol, left=None, right=None):
@@ -194,11 +193,11 @@ def generate_huffman_coding_steps(chars: List[str], freqs: List[int]) -> List[Al
     for i in range(len(chars)):
         heapq.heappush(nodes, Node(freqs[i], chars[i]))
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Created Min-Heap from characters and frequencies",
         data={"nodes": [{'symbol': n.symbol, 'freq': n.freq} for n in nodes]}
-    ))
+    )
     
     while len(nodes) > 1:
         left = heapq.heappop(nodes)
@@ -207,20 +206,20 @@ def generate_huffman_coding_steps(chars: List[str], freqs: List[int]) -> List[Al
         left.huff = 0
         right.huff = 1
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"merge-{left.symbol}-{right.symbol}",
             description=f"Extracted two smallest: ({left.symbol}:{left.freq}) & ({right.symbol}:{right.freq})",
             data={"left": {'symbol': left.symbol, 'freq': left.freq}, "right": {'symbol': right.symbol, 'freq': right.freq}}
-        ))
+        )
         
         new_node = Node(left.freq + right.freq, left.symbol + right.symbol, left, right)
         heapq.heappush(nodes, new_node)
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"push-{new_node.symbol}",
             description=f"Inserted merged node ({new_node.symbol}:{new_node.freq}) back to heap",
             data={"nodes_count": len(nodes)}
-        ))
+        )
         
     codes = {}
     def printNodes(node, val=''):
@@ -234,23 +233,22 @@ def generate_huffman_coding_steps(chars: List[str], freqs: List[int]) -> List[Al
             
     printNodes(nodes[0])
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description="✅ Huffman Codes Generated",
         data={"codes": codes, "finished": True}
-    ))
-    return steps
+    )
 
-def generate_coin_change_greedy_steps(coins: List[int], amount: int) -> List[AlgorithmStep]:
-    steps = []
+@register("coin-change-greedy", params={"coins": [], "amount": 0})
+def generate_coin_change_greedy_steps(coins: List[int], amount: int) -> Iterator[Step]:
     # Greedy only works for standard currency systems, assumes input is compatible or just shows greedy attempt
     sorted_coins = sorted(coins, reverse=True)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Greedy Coin Change for amount {amount}",
         data={"coins": sorted_coins, "target": amount}
-    ))
+    )
     
     result = []
     current_amount = amount
@@ -263,39 +261,38 @@ def generate_coin_change_greedy_steps(coins: List[int], amount: int) -> List[Alg
             current_amount -= count * coin
             result.append({'coin': coin, 'count': count})
             
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"take-{coin}",
                 description=f"Took {count} coin(s) of value {coin}",
                 data={"remaining": current_amount, "result": list(result)}
-            ))
+            )
             
     if current_amount > 0:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="failed",
             description=f"❌ Could not make exact change (Remaining: {current_amount})",
             data={"finished": True, "success": False}
-        ))
+        )
     else:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="complete",
             description="✅ Coin change complete",
             data={"result": list(result), "finished": True, "success": True}
-        ))
-    return steps
+        )
 
-def generate_min_platforms_steps(arrivals: List[int], departures: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("min-platforms", params={"arrivals": [], "departures": []})
+def generate_min_platforms_steps(arrivals: List[int], departures: List[int]) -> Iterator[Step]:
     n = len(arrivals)
-    if n == 0: return steps
+    if n == 0: return
     
     arr = sorted(arrivals)
     dep = sorted(departures)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Sorted arrival and departure times",
         data={"arrivals": arr, "departures": dep}
-    ))
+    )
     
     platforms_needed = 1
     max_platforms = 1
@@ -305,41 +302,40 @@ def generate_min_platforms_steps(arrivals: List[int], departures: List[int]) ->
     while i < n and j < n:
         if arr[i] <= dep[j]:
             platforms_needed += 1
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"arrival-{i}",
                 description=f"Train arrival at {arr[i]}. Platforms needed: {platforms_needed}",
                 data={"time": arr[i], "type": "arrival", "platforms": platforms_needed}
-            ))
+            )
             i += 1
         elif arr[i] > dep[j]:
             platforms_needed -= 1
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"departure-{j}",
                 description=f"Train departure at {dep[j]}. Platforms needed: {platforms_needed}",
                 data={"time": dep[j], "type": "departure", "platforms": platforms_needed}
-            ))
+            )
             j += 1
             
         if platforms_needed > max_platforms:
             max_platforms = platforms_needed
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Minimum Platforms Required: {max_platforms}",
         data={"max_platforms": max_platforms, "finished": True}
-    ))
-    return steps
+    )
 
-def generate_optimal_merge_pattern_steps(files: List[int]) -> List[AlgorithmStep]:
-    steps = []
+@register("optimal-merge-pattern", params={"files": []})
+def generate_optimal_merge_pattern_steps(files: List[int]) -> Iterator[Step]:
     pq = list(files)
     heapq.heapify(pq)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description="Initialized Priority Queue with file sizes",
         data={"files": list(pq)}
-    ))
+    )
     
     total_computation = 0
     
@@ -349,22 +345,197 @@ def generate_optimal_merge_pattern_steps(files: List[int]) -> List[AlgorithmStep
         merged_size = first + second
         total_computation += merged_size
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"merge-{first}-{second}",
             description=f"Merged files of size {first} and {second} (Cost: {merged_size})",
             data={"merged_size": merged_size, "total_cost": total_computation}
-        ))
+        )
         
         heapq.heappush(pq, merged_size)
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"push-{merged_size}",
             description=f"Added merged file {merged_size} back to queue",
             data={"queue": list(pq)}
-        ))
+        )
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="complete",
         description=f"✅ Optimal Merge Cost: {total_computation}",
         data={"total_cost": total_computation, "finished": True}
-    ))
-    return steps
+    )
+
+# Trace-free implementations for mode=result: same algorithms, no steps
+
+@register_result("activity-selection")
+def activity_selection_result(start_times: List[int], end_times: List[int]):
+    order = sorted(range(len(start_times)), key=lambda i: end_times[i])
+    if not order:
+        return {"selected": []}, {"comparisons": 0}
+    selected = [order[0]]
+    last_end = end_times[order[0]]
+    for i in order[1:]:
+        if start_times[i] >= last_end:
+            selected.append(i)
+            last_end = end_times[i]
+    return {"selected": selected}, {"comparisons": len(order) - 1}
+
+@register_result("fractional-knapsack")
+def fractional_knapsack_result(weights: List[int], values: List[int], capacity: int):
+    order = sorted(range(len(weights)), key=lambda i: values[i] / weights[i], reverse=True)
+    current_weight = 0
+    total_value = 0.0
+    considered = 0
+    for i in order:
+        if current_weight == capacity:
+            break
+        considered += 1
+        remaining_capacity = capacity - current_weight
+        if weights[i] <= remaining_capacity:
+            current_weight += weights[i]
+            total_value += values[i]
+        else:
+            fraction = remaining_capacity / weights[i]
+            total_value += values[i] * fraction
+            break
+    return {"total_value": total_value}, {"items_considered": considered}
+
+@register_result("job-sequencing")
+def job_sequencing_result(ids: List[str], deadlines: List[int], profits: List[int]):
+    order = sorted(range(len(ids)), key=lambda i: profits[i], reverse=True)
+    max_deadline = max(deadlines) if deadlines else 0
+    slots = [-1] * max_deadline
+    total_profit = 0
+    slot_checks = 0
+    for i in order:
+        for j in range(min(max_deadline, deadlines[i]) - 1, -1, -1):
+            slot_checks += 1
+            if slots[j] == -1:
+                slots[j] = ids[i]
+                total_profit += profits[i]
+                break
+    return {"slots": slots, "total_profit": total_profit}, {"slot_checks": slot_checks}
+
+@register_result("huffman-coding")
+def huffman_coding_result(chars: List[str], freqs: List[int]):
+
+    class Node:
+        # Ordered by frequency only, exactly like the traced version, so
+        # ties pop in the same order and the codes match
+        __slots__ = ("freq", "tree")
+        def __init__(self, freq, tree):
+            self.freq = freq
+            self.tree = tree
+        def __lt__(self, nxt):
+            return self.freq < nxt.freq
+
+    # A tree is a symbol or a (left, right) pair
+    nodes = []
+    for i in range(len(chars)):
+        heapq.heappush(nodes, Node(freqs[i], chars[i]))
+    merges = 0
+    while len(nodes) > 1:
+        left = heapq.heappop(nodes)
+        right = heapq.heappop(nodes)
+        heapq.heappush(nodes, Node(left.freq + right.freq, (left.tree, right.tree)))
+        merges += 1
+
+    codes = {}
+    pending = [(nodes[0].tree, "")] if nodes else []
+    while pending:
+        tree, code = pending.pop()
+        if isinstance(tree, tuple):
+            pending.append((tree[1], code + "1"))
+            pending.append((tree[0], code + "0"))
+        else:
+            codes[tree] = code
+    return {"codes": codes}, {"merges": merges}
+
+@register_result("coin-change-greedy")
+def coin_change_greedy_result(coins: List[int], amount: int):
+    result = []
+    current_amount = amount
+    considered = 0
+    for coin in sorted(coins, reverse=True):
+        if current_amount == 0: break
+        considered += 1
+        if coin <= current_amount:
+            count = current_amount // coin
+            current_amount -= count * coin
+            result.append({'coin': coin, 'count': count})
+    if current_amount > 0:
+        return {"success": False}, {"coins_considered": considered}
+    return {"result": result, "success": True}, {"coins_considered": considered}
+
+@register_result("min-platforms")
+def min_platforms_result(arrivals: List[int], departures: List[int]):
+    n = len(arrivals)
+    if n == 0:
+        return {"max_platforms": 0}, {"events": 0}
+    arr = sorted(arrivals)
+    dep = sorted(departures)
+    platforms_needed = max_platforms = 1
+    i, j = 1, 0
+    while i < n and j < n:
+        if arr[i] <= dep[j]:
+            platforms_needed += 1
+            i += 1
+        else:
+            platforms_needed -= 1
+            j += 1
+        max_platforms = max(max_platforms, platforms_needed)
+    return {"max_platforms": max_platforms}, {"events": i - 1 + j}
+
+@register_result("optimal-merge-pattern")
+def optimal_merge_pattern_result(files: List[int]):
+    pq = list(files)
+    heapq.heapify(pq)
+    total_computation = 0
+    merges = 0
+    while len(pq) > 1:
+        merged_size = heapq.heappop(pq) + heapq.heappop(pq)
+        total_computation += merged_size
+        heapq.heappush(pq, merged_size)
+        merges += 1
+    return {"total_cost": total_computation}, {"merges": merges}
+
+
+# Cost models for admission control: (steps, bytes per step, operations)
+
+@register_cost("activity-selection")
+def activity_selection_cost(start_times: List[int], end_times: List[int]):
+    # The selection grows through the trace; about a tenth of the input on average
+    n = len(start_times)
+    return 1.5 * n + 3, (json_size(start_times) + json_size(end_times)) / 10, n * log2(n)
+
+@register_cost("fractional-knapsack")
+def fractional_knapsack_cost(weights: List[int], values: List[int], capacity: int):
+    n = len(weights)
+    return n + 3, 100, n * log2(n)
+
+@register_cost("job-sequencing")
+def job_sequencing_cost(ids: List[str], deadlines: List[int], profits: List[int]):
+    # Steps carry the slot list, one slot per unit of the latest deadline
+    n = len(ids)
+    slots = max(deadlines) if deadlines else 0
+    return 2 * n + 2, 3.5 * slots, n * log2(n) + n * slots / 2
+
+@register_cost("huffman-coding")
+def huffman_coding_cost(chars: List[str], freqs: List[int]):
+    n = len(chars)
+    return 2 * n + 1, 150, 3 * n * log2(n)
+
+@register_cost("coin-change-greedy")
+def coin_change_greedy_cost(coins: List[int], amount: int):
+    taken = amount / max(coins) if coins and max(coins) > 0 else 0
+    return len(coins) + 3, 40 + json_size(coins), len(coins) + taken
+
+@register_cost("min-platforms")
+def min_platforms_cost(arrivals: List[int], departures: List[int]):
+    n = len(arrivals)
+    return 2 * n + 2, 60, 2 * n * log2(n)
+
+@register_cost("optimal-merge-pattern")
+def optimal_merge_pattern_cost(files: List[int]):
+    # The queue shrinks by one file per merge
+    n = len(files)
+    return 2 * n, json_size(files) / 4, 3 * n * log2(n)
@@ -0,0 +1,34 @@
+"""Which module under app/algorithms registers each algorithm type.
+
+The registry reads this to import a module the first time one of its
+algorithms is requested, instead of importing every module at startup.
+Keep it in step with the @register decorators: registering a type that is
+missing here, or listing a type its module does not register, fails when
+the module is loaded. The order is the order of GET /algorithms.
+"""
+
+MODULES = {
+    "sorting": (
+        "bubble-sort", "quick-sort", "merge-sort", "selection-sort", "insertion-sort", "heap-sort",
+        "counting-sort", "shell-sort", "radix-sort", "bucket-sort", "comb-sort", "cycle-sort",
+        "odd-even-sort", "tim-sort", "tree-sort",
+    ),
+    "searching": (
+        "binary-search", "exponential-search", "linear-search", "jump-search", "interpolation-search",
+        "ternary-search", "fibonacci-search", "hash-search",
+    ),
+    "greedy": (
+        "activity-selection", "fractional-knapsack", "job-sequencing", "huffman-coding",
+        "coin-change-greedy", "min-platforms", "optimal-merge-pattern",
+    ),
+    "dynamic_programming": (
+        "fibonacci-dp", "knapsack-0-1", "lcs", "unbounded-knapsack", "lis", "edit-distance",
+        "rod-cutting", "subset-sum", "partition-problem", "matrix-chain-multiplication",
+    ),
+    "graph": (
+        "bfs", "dfs", "topological-sort", "dijkstra", "kruskal", "prim", "floyd-warshall", "bellman-ford",
+    ),
+    "advanced": (
+        "n-queens", "sudoku-solver", "kmp", "rabin-karp", "karatsuba", "closest-pair", "fft", "convex-hull",
+    ),
+}
@@ -1,344 +1,363 @@
-from typing import List, Dict
+from typing import List, Iterator
 import math
-from ..models import AlgorithmStep
+from ..steps import Step
+from ..registry import register, register_cost, register_result
+from ..cost import json_size, log2
 
-def generate_binary_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("binary-search", params={"array": [], "target": 0})
+def generate_binary_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     # Binary search requires sorted array, but we visualize what we are given or sort it.
     # Usually the frontend passes a sorted array for binary search.
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Binary Search for {target} (Python)",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     left, right = 0, len(current_arr) - 1
+    comparisons = 0
     
     while left <= right:
         mid = (left + right) // 2
-        steps.append(AlgorithmStep(
+        comparisons += 1
+        yield Step(
             id=f"check-{mid}",
             description=f"Checking mid index {mid}",
             comparedIndices=[mid],
             data={"array": list(current_arr), "left": left, "right": right, "mid": mid}
-        ))
+        )
         
         if current_arr[mid] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {mid} (Python)",
                 highlightedIndices=[mid],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
         
         if current_arr[mid] < target:
             left = mid + 1
         else:
             right = mid - 1
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found (Python)",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
 
-def generate_exponential_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("exponential-search", params={"array": [], "target": 0})
+def generate_exponential_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     n = len(current_arr)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Exponential Search for {target} (Python)",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
 
+    comparisons = 1
     if current_arr[0] == target:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="found-0",
             description=f"✅ Found {target} at index 0 (Python)",
             highlightedIndices=[0],
             data={"array": list(current_arr), "finished": True, "found": True}
-        ))
-        return steps
+        )
+        return {"comparisons": comparisons}
 
     i = 1
-    steps.append(AlgorithmStep(
+    yield Step(
         id=f"check-{i}",
         description=f"Checking index {i}",
         comparedIndices=[i],
         data={"array": list(current_arr), "index": i}
-    ))
+    )
 
     while i < n and current_arr[i] <= target:
+        comparisons += 1
         i = i * 2
         if i < n:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id=f"check-{i}",
                 description=f"Checking index {i} (Exponential Jump)",
                 comparedIndices=[i],
                 data={"array": list(current_arr), "index": i}
-            ))
+            )
 
     # Binary search in expected range
     left = i // 2
     right = min(i, n - 1)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="bs-range",
         description=f"Binary Search in range [{left}, {right}]",
         data={"array": list(current_arr), "left": left, "right": right}
-    ))
+    )
 
     # Perform binary search in range
     while left <= right:
         mid = (left + right) // 2
-        steps.append(AlgorithmStep(
+        comparisons += 1
+        yield Step(
             id=f"bs-check-{mid}",
             description=f"Checking mid index {mid}",
             comparedIndices=[mid],
             data={"array": list(current_arr), "left": left, "right": right, "mid": mid}
-        ))
+        )
 
         if current_arr[mid] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {mid} (Python)",
                 highlightedIndices=[mid],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
         
         if current_arr[mid] < target:
             left = mid + 1
         else:
             right = mid - 1
 
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found (Python)",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
 
-def generate_linear_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("linear-search", params={"array": [], "target": 0})
+def generate_linear_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     n = len(current_arr)
+    comparisons = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Linear Search for {target} (Python)",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     for i in range(n):
-        steps.append(AlgorithmStep(
+        comparisons += 1
+        yield Step(
             id=f"check-{i}",
             description=f"Checking index {i}",
             comparedIndices=[i],
             data={"array": list(current_arr), "index": i}
-        ))
+        )
         
         if current_arr[i] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {i} (Python)",
                 highlightedIndices=[i],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found (Python)",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
 
-def generate_jump_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("jump-search", params={"array": [], "target": 0})
+def generate_jump_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     n = len(current_arr)
-    if n == 0: return steps
+    if n == 0: return
     
     step = int(math.sqrt(n))
     prev = 0
+    comparisons = 1
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Jump Search for {target} (Step size: {step})",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     while current_arr[min(step, n) - 1] < target:
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"jump-{step}",
             description=f"Jumping to index {min(step, n)-1}",
             comparedIndices=[min(step, n)-1],
             data={"array": list(current_arr)}
-        ))
+        )
         
         prev = step
         step += int(math.sqrt(n))
         if prev >= n:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="not-found",
                 description=f"❌ {target} not found (Python)",
                 data={"array": list(current_arr), "finished": True, "found": False}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
+        comparisons += 1
             
-    steps.append(AlgorithmStep(
+    # Counts the first test of the linear scan below
+    comparisons += 1
+    yield Step(
         id="linear-start",
         description=f"Found block between {prev} and {min(step, n)}",
         data={"array": list(current_arr)}
-    ))
+    )
             
     while current_arr[prev] < target:
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{prev}",
             description=f"Checking index {prev}",
             comparedIndices=[prev],
             data={"array": list(current_arr)}
-        ))
+        )
         
         prev += 1
         if prev == min(step, n):
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="not-found",
                 description=f"❌ {target} not found (Python)",
                 data={"array": list(current_arr), "finished": True, "found": False}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
+        comparisons += 1
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id=f"final-check-{prev}",
         description=f"Final check at index {prev}",
         comparedIndices=[prev],
         data={"array": list(current_arr)}
-    ))
+    )
 
     if current_arr[prev] == target:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="found",
             description=f"✅ Found {target} at index {prev} (Python)",
             highlightedIndices=[prev],
             data={"array": list(current_arr), "finished": True, "found": True}
-        ))
+        )
     else:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="not-found",
             description=f"❌ {target} not found (Python)",
             data={"array": list(current_arr), "finished": True, "found": False}
-        ))
-    return steps
+        )
+    return {"comparisons": comparisons}
 
-def generate_interpolation_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("interpolation-search", params={"array": [], "target": 0})
+def generate_interpolation_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     n = len(current_arr)
     lo = 0
     hi = n - 1
+    comparisons = 0
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Interpolation Search for {target} (Python)",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     while lo <= hi and target >= current_arr[lo] and target <= current_arr[hi]:
+        comparisons += 1
         if lo == hi:
             if current_arr[lo] == target:
-                steps.append(AlgorithmStep(
+                yield Step(
                     id="found",
                     description=f"✅ Found {target} at index {lo}",
                     highlightedIndices=[lo],
                     data={"array": list(current_arr), "finished": True, "found": True}
-                ))
-                return steps
-            steps.append(AlgorithmStep(
+                )
+                return {"comparisons": comparisons}
+            yield Step(
                 id="not-found",
                 description=f"❌ {target} not found",
                 data={"array": list(current_arr), "finished": True, "found": False}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
             
         pos = lo + int(((float(hi - lo) / (current_arr[hi] - current_arr[lo])) * (target - current_arr[lo])))
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"probe-{pos}",
             description=f"Probing predicted position {pos}",
             comparedIndices=[pos],
             data={"array": list(current_arr), "pos": pos}
-        ))
+        )
         
         if current_arr[pos] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {pos}",
                 highlightedIndices=[pos],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
             
         if current_arr[pos] < target:
             lo = pos + 1
         else:
             hi = pos - 1
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found (Python)",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
 
-def generate_ternary_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("ternary-search", params={"array": [], "target": 0})
+def generate_ternary_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Ternary Search for {target} (Python)",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     if not current_arr:
-        return steps
+        return
 
     l, r = 0, len(current_arr) - 1
+    comparisons = 0
     
     while l <= r:
         mid1 = l + (r - l) // 3
         mid2 = r - (r - l) // 3
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{mid1}-{mid2}",
             description=f"Checking mid1: {mid1}, mid2: {mid2}",
             comparedIndices=[mid1, mid2],
             data={"array": list(current_arr), "left": l, "right": r}
-        ))
+        )
         
+        comparisons += 1
         if current_arr[mid1] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {mid1}",
                 highlightedIndices=[mid1],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
+        comparisons += 1
         if current_arr[mid2] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {mid2}",
                 highlightedIndices=[mid2],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
             
         if target < current_arr[mid1]:
             r = mid1 - 1
@@ -348,23 +367,23 @@ def generate_ternary_search_steps(arr: List[int], target: int) -> List[Algorithm
             l = mid1 + 1
             r = mid2 - 1
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found (Python)",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
 
-def generate_fibonacci_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("fibonacci-search", params={"array": [], "target": 0})
+def generate_fibonacci_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     n = len(current_arr)
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Fibonacci Search for {target} (Python)",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     fibMMm2 = 0
     fibMMm1 = 1
@@ -376,16 +395,18 @@ def generate_fibonacci_search_steps(arr: List[int], target: int) -> List[Algorit
         fibM = fibMMm2 + fibMMm1
         
     offset = -1
+    comparisons = 0
     
     while fibM > 1:
         i = min(offset + fibMMm2, n - 1)
+        comparisons += 1
         
-        steps.append(AlgorithmStep(
+        yield Step(
             id=f"check-{i}",
             description=f"Checking index {i}",
             comparedIndices=[i],
             data={"array": list(current_arr)}
-        ))
+        )
         
         if current_arr[i] < target:
             fibM = fibMMm1
@@ -397,92 +418,293 @@ def generate_fibonacci_search_steps(arr: List[int], target: int) -> List[Algorit
             fibMMm1 = fibMMm1 - fibMMm2
             fibMMm2 = fibM - fibMMm1
         else:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {i}",
                 highlightedIndices=[i],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
             
+    comparisons += bool(fibMMm1 and offset + 1 < n)
     if fibMMm1 and offset + 1 < n and current_arr[offset + 1] == target:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="found",
             description=f"✅ Found {target} at index {offset + 1}",
             highlightedIndices=[offset + 1],
             data={"array": list(current_arr), "finished": True, "found": True}
-        ))
-        return steps
+        )
+        return {"comparisons": comparisons}
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found (Python)",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
 
-def generate_hash_search_steps(arr: List[int], target: int) -> List[AlgorithmStep]:
-    steps = []
+@register("hash-search", params={"array": [], "target": 0})
+def generate_hash_search_steps(arr: List[int], target: int) -> Iterator[Step]:
     current_arr = list(arr)
     size = len(current_arr)
-    if size == 0: return steps
+    if size == 0: return
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id="init",
         description=f"Starting Hash Search for {target}",
         data={"array": list(current_arr), "target": target}
-    ))
+    )
     
     predicted_idx = target % size
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id=f"hash-calc",
         description=f"Hash({target}) = {target} % {size} = {predicted_idx}",
         data={"array": list(current_arr)}
-    ))
+    )
     
-    steps.append(AlgorithmStep(
+    yield Step(
         id=f"probe-{predicted_idx}",
         description=f"Checking predicted index {predicted_idx}",
         comparedIndices=[predicted_idx],
         data={"array": list(current_arr)}
-    ))
+    )
     
+    comparisons = 1
     if current_arr[predicted_idx] == target:
-        steps.append(AlgorithmStep(
+        yield Step(
             id="found",
             description=f"✅ Found {target} at index {predicted_idx} (Direct Hit)",
             highlightedIndices=[predicted_idx],
             data={"array": list(current_arr), "finished": True, "found": True}
-        ))
-        return steps
+        )
+        return {"comparisons": comparisons}
         
-    steps.append(AlgorithmStep(
+    yield Step(
         id="collision",
         description=f"Value at {predicted_idx} is {current_arr[predicted_idx]} (Collision/Miss)",
         data={"array": list(current_arr)}
-    ))
+    )
     
     for i in range(len(current_arr)):
         if i == predicted_idx: continue
-        steps.append(AlgorithmStep(
+        comparisons += 1
+        yield Step(
             id=f"scan-{i}",
             description=f"Scanning index {i}...",
             comparedIndices=[i],
             data={"array": list(current_arr)}
-        ))
+        )
         if current_arr[i] == target:
-            steps.append(AlgorithmStep(
+            yield Step(
                 id="found",
                 description=f"✅ Found {target} at index {i}",
                 highlightedIndices=[i],
                 data={"array": list(current_arr), "finished": True, "found": True}
-            ))
-            return steps
+            )
+            return {"comparisons": comparisons}
             
-    steps.append(AlgorithmStep(
+    yield Step(
         id="not-found",
         description=f"❌ {target} not found",
         data={"array": list(current_arr), "finished": True, "found": False}
-    ))
-    return steps
+    )
+    return {"comparisons": comparisons}
+
+# Trace-free implementations for mode=result: same algorithms, no steps
+
+def _search_result(arr, index, comparisons):
+    return {"array": list(arr), "found": index is not None, "index": index}, {"comparisons": comparisons}
+
+@register_result("binary-search")
+def binary_search_result(arr: List[int], target: int):
+    left, right = 0, len(arr) - 1
+    comparisons = 0
+    while left <= right:
+        mid = (left + right) // 2
+        comparisons += 1
+        if arr[mid] == target:
+            return _search_result(arr, mid, comparisons)
+        if arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    return _search_result(arr, None, comparisons)
+
+@register_result("exponential-search")
+def exponential_search_result(arr: List[int], target: int):
+    n = len(arr)
+    if n == 0:
+        return _search_result(arr, None, 0)
+    comparisons = 1
+    if arr[0] == target:
+        return _search_result(arr, 0, comparisons)
+    i = 1
+    while i < n and arr[i] <= target:
+        comparisons += 1
+        i = i * 2
+    left = i // 2
+    right = min(i, n - 1)
+    while left <= right:
+        mid = (left + right) // 2
+        comparisons += 1
+        if arr[mid] == target:
+            return _search_result(arr, mid, comparisons)
+        if arr[mid] < target:
+            left = mid + 1
+        else:
+            right = mid - 1
+    return _search_result(arr, None, comparisons)
+
+@register_result("linear-search")
+def linear_search_result(arr: List[int], target: int):
+    for i in range(len(arr)):
+        if arr[i] == target:
+            return _search_result(arr, i, i + 1)
+    return _search_result(arr, None, len(arr))
+
+@register_result("jump-search")
+def jump_search_result(arr: List[int], target: int):
+    n = len(arr)
+    if n == 0:
+        return _search_result(arr, None, 0)
+    jump = int(math.sqrt(n))
+    step = jump
+    prev = 0
+    comparisons = 1
+    while arr[min(step, n) - 1] < target:
+        prev = step
+        step += jump
+        if prev >= n:
+            return _search_result(arr, None, comparisons)
+        comparisons += 1
+    comparisons += 1
+    while arr[prev] < target:
+        prev += 1
+        if prev == min(step, n):
+            return _search_result(arr, None, comparisons)
+        comparisons += 1
+    return _search_result(arr, prev if arr[prev] == target else None, comparisons)
+
+@register_result("interpolation-search")
+def interpolation_search_result(arr: List[int], target: int):
+    lo, hi = 0, len(arr) - 1
+    comparisons = 0
+    while lo <= hi and target >= arr[lo] and target <= arr[hi]:
+        comparisons += 1
+        if lo == hi:
+            return _search_result(arr, lo if arr[lo] == target else None, comparisons)
+        pos = lo + int(((float(hi - lo) / (arr[hi] - arr[lo])) * (target - arr[lo])))
+        if arr[pos] == target:
+            return _search_result(arr, pos, comparisons)
+        if arr[pos] < target:
+            lo = pos + 1
+        else:
+            hi = pos - 1
+    return _search_result(arr, None, comparisons)
+
+@register_result("ternary-search")
+def ternary_search_result(arr: List[int], target: int):
+    l, r = 0, len(arr) - 1
+    comparisons = 0
+    while l <= r:
+        mid1 = l + (r - l) // 3
+        mid2 = r - (r - l) // 3
+        comparisons += 1
+        if arr[mid1] == target:
+            return _search_result(arr, mid1, comparisons)
+        comparisons += 1
+        if arr[mid2] == target:
+            return _search_result(arr, mid2, comparisons)
+        if target < arr[mid1]:
+            r = mid1 - 1
+        elif target > arr[mid2]:
+            l = mid2 + 1
+        else:
+            l = mid1 + 1
+            r = mid2 - 1
+    return _search_result(arr, None, comparisons)
+
+@register_result("fibonacci-search")
+def fibonacci_search_result(arr: List[int], target: int):
+    n = len(arr)
+    fibMMm2, fibMMm1 = 0, 1
+    fibM = fibMMm2 + fibMMm1
+    while fibM < n:
+        fibMMm2 = fibMMm1
+        fibMMm1 = fibM
+        fibM = fibMMm2 + fibMMm1
+    offset = -1
+    comparisons = 0
+    while fibM > 1:
+        i = min(offset + fibMMm2, n - 1)
+        comparisons += 1
+        if arr[i] < target:
+            fibM = fibMMm1
+            fibMMm1 = fibMMm2
+            fibMMm2 = fibM - fibMMm1
+            offset = i
+        elif arr[i] > target:
+            fibM = fibMMm2
+            fibMMm1 = fibMMm1 - fibMMm2
+            fibMMm2 = fibM - fibMMm1
+        else:
+            return _search_result(arr, i, comparisons)
+    if fibMMm1 and offset + 1 < n:
+        comparisons += 1
+        if arr[offset + 1] == target:
+            return _search_result(arr, offset + 1, comparisons)
+    return _search_result(arr, None, comparisons)
+
+@register_result("hash-search")
+def hash_search_result(arr: List[int], target: int):
+    size = len(arr)
+    if size == 0:
+        return _search_result(arr, None, 0)
+    predicted_idx = target % size
+    if arr[predicted_idx] == target:
+        return _search_result(arr, predicted_idx, 1)
+    comparisons = 1
+    for i in range(size):
+        if i == predicted_idx: continue
+        comparisons += 1
+        if arr[i] == target:
+            return _search_result(arr, i, comparisons)
+    return _search_result(arr, None, comparisons)
+
+
+# Cost models for admission control: (steps, bytes per step, operations).
+# Every step carries a copy of the array.
+
+@register_cost("binary-search")
+def binary_search_cost(arr: List[int], target: int):
+    return log2(len(arr)) + 3, json_size(arr), log2(len(arr))
+
+@register_cost("exponential-search")
+def exponential_search_cost(arr: List[int], target: int):
+    return 2 * log2(len(arr)) + 3, json_size(arr), 2 * log2(len(arr))
+
+@register_cost("linear-search")
+def linear_search_cost(arr: List[int], target: int):
+    return len(arr) + 2, json_size(arr), len(arr)
+
+@register_cost("jump-search")
+def jump_search_cost(arr: List[int], target: int):
+    return 2 * math.sqrt(len(arr)) + 3, json_size(arr), 2 * math.sqrt(len(arr))
+
+@register_cost("interpolation-search")
+def interpolation_search_cost(arr: List[int], target: int):
+    # log log n on roughly uniform data
+    return log2(log2(len(arr))) + 4, json_size(arr), log2(log2(len(arr)))
+
+@register_cost("ternary-search")
+def ternary_search_cost(arr: List[int], target: int):
+    return log2(len(arr)) / log2(3) + 3, json_size(arr), 2 * log2(len(arr)) / log2(3)
+
+@register_cost("fibonacci-search")
+def fibonacci_search_cost(arr: List[int], target: int):
+    return 1.5 * log2(len(arr)) + 3, json_size(arr), 1.5 * log2(len(arr))
+
+@register_cost("hash-search")
+def hash_search_cost(arr: List[int], target: int):
+    return len(arr) + 4, json_size(arr), len(arr)
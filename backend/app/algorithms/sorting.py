@@ -1,912 +1,2075 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 import math
-from ..models import AlgorithmStep
+import random
+from array import array
+from ..tracer import ArrayTracer, traced
+from ..registry import register, register_cost, register_result
+from ..cost import disorder, inversions, json_size, log2, presorted
+
+# The generators below are traced: they sort t.array in place through the
+# tracer and record their steps on it (see app/tracer.py)
+
+@register("bubble-sort", params={"array": []})
+@traced
+def generate_bubble_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = swaps = 0
+
+    yield t.step("init", "Starting Bubble Sort (Python)")
 
-def generate_bubble_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    n = len(arr)
-    current_arr = list(arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Bubble Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
     for i in range(n):
         for j in range(0, n - i - 1):
-            steps.append(AlgorithmStep(
-                id=f"compare-{i}-{j}",
-                description=f"Comparing {current_arr[j]} and {current_arr[j+1]}",
-                comparedIndices=[j, j+1],
-                data={"array": list(current_arr)}
-            ))
-            
-            if current_arr[j] > current_arr[j+1]:
-                current_arr[j], current_arr[j+1] = current_arr[j+1], current_arr[j]
-                steps.append(AlgorithmStep(
-                    id=f"swap-{i}-{j}",
-                    description=f"Swapped {current_arr[j+1]} and {current_arr[j]}",
-                    highlightedIndices=[j, j+1],
-                    data={"array": list(current_arr)}
-                ))
-                
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Bubble Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_quick_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Quick Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-
-    def partition(low, high):
-        pivot = current_arr[high]
+            comparisons += 1
+            yield t.compare(j, j+1, f"compare-{i}-{j}", f"Comparing {a[j]} and {a[j+1]}")
+
+            if a[j] > a[j+1]:
+                t.swap(j, j+1)
+                swaps += 1
+                yield t.mark((j, j+1), f"swap-{i}-{j}", f"Swapped {a[j+1]} and {a[j]}")
+
+    yield t.step("complete", "✅ Bubble Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "swaps": swaps}
+
+# Quick sort is an introsort: the pivot strategy and partition scheme are
+# selectable, ranges wait on an explicit stack and are finished left side
+# first, in the order of the recursive version (the depth limit keeps at
+# most 2·log n pending), and a range still unsorted at depth 2·log n is
+# heap sorted, which bounds the worst case at O(n log n).
+PIVOT_STRATEGIES = ("last", "median-of-three", "ninther", "random")
+PARTITION_SCHEMES = ("two-way", "three-way")
+# Below this size the ninther samples too densely to beat median-of-three
+NINTHER_MIN_SIZE = 40
+
+def _quick_sort_rng(pivot: str, partition: str, seed: int) -> random.Random:
+    if pivot not in PIVOT_STRATEGIES:
+        raise ValueError(f"Unknown pivot strategy {pivot!r}, expected one of {', '.join(PIVOT_STRATEGIES)}")
+    if partition not in PARTITION_SCHEMES:
+        raise ValueError(f"Unknown partition scheme {partition!r}, expected one of {', '.join(PARTITION_SCHEMES)}")
+    return random.Random(seed)
+
+def _median_of_three(less, i: int, j: int, k: int) -> int:
+    if less(j, i):
+        i, j = j, i
+    if less(k, j):
+        return i if less(k, i) else k
+    return j
+
+def _choose_pivot(strategy: str, less, rng: random.Random, low: int, high: int) -> int:
+    """Index of the pivot for low..high; ``less(i, j)`` compares two elements."""
+    size = high - low + 1
+    if strategy == "last" or size < 3:
+        return high
+    if strategy == "random":
+        return rng.randint(low, high)
+    mid = low + (high - low) // 2
+    if strategy == "ninther" and size >= NINTHER_MIN_SIZE:
+        step = size // 8
+        return _median_of_three(
+            less,
+            _median_of_three(less, low, low + step, low + 2 * step),
+            _median_of_three(less, mid - step, mid, mid + step),
+            _median_of_three(less, high - 2 * step, high - step, high),
+        )
+    return _median_of_three(less, low, mid, high)
+
+def _depth_limit(n: int) -> int:
+    return 2 * int(math.log2(n)) if n > 1 else 0
+
+@register("quick-sort", params={"array": [], "pivot": "last", "partition": "two-way", "seed": 0},
+          choices={"pivot": PIVOT_STRATEGIES, "partition": PARTITION_SCHEMES})
+@traced
+def generate_quick_sort_steps(t: ArrayTracer, pivot: str, partition: str, seed: int) -> Dict[str, int]:
+    a = t.array
+    rng = _quick_sort_rng(pivot, partition, seed)
+    comparisons = swaps = 0
+
+    yield t.step("init", "Starting Quick Sort (Python)")
+
+    # _choose_pivot calls less() directly, so its steps wait here until it returns
+    pivot_steps = []
+
+    def less(i, j):
+        nonlocal comparisons
+        comparisons += 1
+        pivot_steps.append(t.compare(i, j, f"compare-pivot-{i}-{j}", f"Choosing pivot: comparing {a[i]} and {a[j]}"))
+        return a[i] < a[j]
+
+    def choose_pivot(low, high):
+        p = _choose_pivot(pivot, less, rng, low, high)
+        yield from pivot_steps
+        pivot_steps.clear()
+        return p
+
+    def partition_two_way(low, high):
+        nonlocal comparisons, swaps
+        p = yield from choose_pivot(low, high)
+        if p != high:
+            t.swap(p, high)
+            swaps += 1
+            yield t.mark((p, high), f"pivot-move-{p}", f"Moved pivot {a[high]} to the end")
+        pivot_value = a[high]
         i = low - 1
-        
-        steps.append(AlgorithmStep(
-            id=f"pivot-select-{high}",
-            description=f"Selected pivot: {pivot}",
-            highlightedIndices=[high],
-            data={"array": list(current_arr)}
-        ))
+
+        yield t.mark((high,), f"pivot-select-{high}", f"Selected pivot: {pivot_value}")
 
         for j in range(low, high):
-            steps.append(AlgorithmStep(
-                id=f"compare-{j}",
-                description=f"Comparing {current_arr[j]} with pivot {pivot}",
-                comparedIndices=[j, high],
-                data={"array": list(current_arr)}
-            ))
-            
-            if current_arr[j] < pivot:
+            comparisons += 1
+            yield t.compare(j, high, f"compare-{j}", f"Comparing {a[j]} with pivot {pivot_value}")
+
+            if a[j] < pivot_value:
                 i += 1
-                current_arr[i], current_arr[j] = current_arr[j], current_arr[i]
-                steps.append(AlgorithmStep(
-                    id=f"swap-{i}-{j}",
-                    description=f"Swapped smaller element {current_arr[i]} to left",
-                    highlightedIndices=[i, j],
-                    data={"array": list(current_arr)}
-                ))
+                t.swap(i, j)
+                swaps += 1
+                yield t.mark((i, j), f"swap-{i}-{j}", f"Swapped smaller element {a[i]} to left")
 
-        current_arr[i + 1], current_arr[high] = current_arr[high], current_arr[i + 1]
-        steps.append(AlgorithmStep(
-            id=f"pivot-place-{i+1}",
-            description=f"Placed pivot {pivot} at correct position {i+1}",
-            highlightedIndices=[i+1],
-            data={"array": list(current_arr)}
-        ))
-        return i + 1
-
-    def quick_sort_recursive(low, high):
-        if low < high:
-            pi = partition(low, high)
-            quick_sort_recursive(low, pi - 1)
-            quick_sort_recursive(pi + 1, high)
-
-    quick_sort_recursive(0, len(current_arr) - 1)
-
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Quick Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_merge_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Merge Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
+        t.swap(i + 1, high)
+        swaps += 1
+        yield t.mark((i+1,), f"pivot-place-{i+1}", f"Placed pivot {pivot_value} at correct position {i+1}")
+        return i, i + 2
+
+    def partition_three_way(low, high):
+        # Dijkstra's scheme: every copy of the pivot ends in the middle
+        # block and is never looked at again
+        nonlocal comparisons, swaps
+        p = yield from choose_pivot(low, high)
+        pivot_value = a[p]
+        yield t.mark((p,), f"pivot-select-{p}", f"Selected pivot: {pivot_value}")
+
+        lt, i, gt = low, low, high
+        while i <= gt:
+            comparisons += 1
+            yield t.compare(i, None, f"compare-{i}", f"Comparing {a[i]} with pivot {pivot_value}")
+            if a[i] < pivot_value:
+                if lt != i:
+                    t.swap(lt, i)
+                    swaps += 1
+                    yield t.mark((lt, i), f"swap-{lt}-{i}", f"Swapped smaller element {a[lt]} to left")
+                lt += 1
+                i += 1
+                continue
+            comparisons += 1
+            if pivot_value < a[i]:
+                if i != gt:
+                    t.swap(i, gt)
+                    swaps += 1
+                    yield t.mark((i, gt), f"swap-{i}-{gt}", f"Swapped larger element {a[gt]} to right")
+                gt -= 1
+            else:
+                i += 1
+
+        yield t.mark(range(lt, gt+1), f"pivot-place-{lt}-{gt}", f"Placed pivot {pivot_value} at positions {lt} to {gt}")
+        return lt - 1, gt + 1
+
+    def heap_sort_range(low, high):
+        nonlocal swaps
+        yield t.mark(range(low, high+1), f"depth-limit-{low}-{high}",
+               f"Recursion depth limit reached: heap sorting {low} to {high}")
+
+        def sift_down(root, end):
+            nonlocal comparisons, swaps
+            while True:
+                child = low + 2 * (root - low) + 1
+                if child > end:
+                    return
+                if child + 1 <= end:
+                    comparisons += 1
+                    yield t.compare(child, child+1, f"compare-heap-{child}-{child+1}",
+                              f"Heap: comparing children {a[child]} and {a[child+1]}")
+                    if a[child] < a[child+1]:
+                        child += 1
+                comparisons += 1
+                yield t.compare(root, child, f"compare-heap-{root}-{child}",
+                          f"Heap: comparing {a[root]} with child {a[child]}")
+                if not a[root] < a[child]:
+                    return
+                t.swap(root, child)
+                swaps += 1
+                yield t.mark((root, child), f"heap-swap-{root}-{child}", f"Heap: swapped {a[root]} with {a[child]}")
+                root = child
+
+        for root in range(low + (high - low + 1) // 2 - 1, low - 1, -1):
+            yield from sift_down(root, high)
+        for end in range(high, low, -1):
+            t.swap(low, end)
+            swaps += 1
+            yield t.mark((low, end), f"heap-extract-{end}", f"Heap: moved max {a[end]} to {end}")
+            yield from sift_down(low, end - 1)
+
+    partition_range = partition_three_way if partition == "three-way" else partition_two_way
+    depth_limit = _depth_limit(len(a))
+    ranges = [(0, len(a) - 1, 0)]
+    while ranges:
+        low, high, depth = ranges.pop()
+        if low >= high:
+            continue
+        if depth >= depth_limit:
+            yield from heap_sort_range(low, high)
+            continue
+        left_end, right_start = yield from partition_range(low, high)
+        # The left side is popped (and finished) first
+        ranges.append((right_start, high, depth + 1))
+        ranges.append((low, left_end, depth + 1))
+
+    yield t.step("complete", "✅ Quick Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "swaps": swaps}
+
+# "top-down" is the classic recursive merge sort with fresh halves per
+# merge. "bottom-up" merges runs of 1, 2, 4, ... elements and "natural"
+# merges the ascending runs already in the input; both ping-pong between
+# the array and one preallocated buffer and skip merges whose runs are
+# already in order, so "natural" finishes sorted input in one scan.
+MERGE_SORT_STRATEGIES = ("top-down", "bottom-up", "natural")
+
+def _check_merge_strategy(strategy: str):
+    if strategy not in MERGE_SORT_STRATEGIES:
+        raise ValueError(f"Unknown merge sort strategy {strategy!r}, expected one of {', '.join(MERGE_SORT_STRATEGIES)}")
+
+@register("merge-sort", params={"array": [], "strategy": "top-down"}, choices={"strategy": MERGE_SORT_STRATEGIES})
+@traced
+def generate_merge_sort_steps(t: ArrayTracer, strategy: str) -> Dict[str, int]:
+    _check_merge_strategy(strategy)
+    if strategy != "top-down":
+        return (yield from _bottom_up_merge_sort(t, strategy == "natural"))
+    a = t.array
+    comparisons = writes = 0
+
+    yield t.step("init", "Starting Merge Sort (Python)")
 
     def merge(l, m, r):
+        nonlocal comparisons, writes
         n1 = m - l + 1
         n2 = r - m
-        L = [0] * n1
-        R = [0] * n2
-        for i in range(n1): L[i] = current_arr[l + i]
-        for j in range(n2): R[j] = current_arr[m + 1 + j]
+        L = a[l:m + 1]
+        R = a[m + 1:r + 1]
 
         i = 0
         j = 0
         k = l
-        
+
         while i < n1 and j < n2:
-            steps.append(AlgorithmStep(
-                id=f"compare-{l+i}-{m+1+j}",
-                description=f"Comparing L:{L[i]} and R:{R[j]}",
-                comparedIndices=[l+i, m+1+j],
-                data={"array": list(current_arr)}
-            ))
-            
+            comparisons += 1
+            yield t.compare(l+i, m+1+j, f"compare-{l+i}-{m+1+j}", f"Comparing L:{L[i]} and R:{R[j]}")
+
             if L[i] <= R[j]:
-                current_arr[k] = L[i]
+                t.write(k, L[i])
                 i += 1
             else:
-                current_arr[k] = R[j]
+                t.write(k, R[j])
                 j += 1
-            
-            steps.append(AlgorithmStep(
-                id=f"merge-place-{k}",
-                description=f"Placed {current_arr[k]} into merged array",
-                highlightedIndices=[k],
-                data={"array": list(current_arr)}
-            ))
+
+            yield t.mark((k,), f"merge-place-{k}", f"Placed {a[k]} into merged array")
             k += 1
 
         while i < n1:
-            current_arr[k] = L[i]
+            t.write(k, L[i])
             i += 1
             k += 1
-            
+
         while j < n2:
-            current_arr[k] = R[j]
+            t.write(k, R[j])
             j += 1
             k += 1
-            
-        steps.append(AlgorithmStep(
-            id=f"merged-segment-{l}-{r}",
-            description=f"Merged segment {l} to {r}",
-            highlightedIndices=list(range(l, r+1)),
-            data={"array": list(current_arr)}
-        ))
+        writes += r - l + 1
+
+        yield t.mark(range(l, r+1), f"merged-segment-{l}-{r}", f"Merged segment {l} to {r}")
 
     def merge_sort_recursive(l, r):
         if l < r:
             m = l + (r - l) // 2
-            merge_sort_recursive(l, m)
-            merge_sort_recursive(m + 1, r)
-            merge(l, m, r)
+            yield from merge_sort_recursive(l, m)
+            yield from merge_sort_recursive(m + 1, r)
+            yield from merge(l, m, r)
 
-    merge_sort_recursive(0, len(current_arr) - 1)
+    yield from merge_sort_recursive(0, len(a) - 1)
 
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Merge Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
+    yield t.step("complete", "✅ Merge Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "writes": writes}
+
+def _bottom_up_merge_sort(t: ArrayTracer, natural: bool) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = writes = 0
+
+    yield t.step("init", f"Starting {'Natural' if natural else 'Bottom-up'} Merge Sort (Python)")
+
+    # Run boundaries: run r is bounds[r]..bounds[r+1]-1
+    if natural:
+        bounds = [0]
+        for i in range(1, n):
+            comparisons += 1
+            if a[i - 1] > a[i]:
+                yield t.mark(range(bounds[-1], i), f"run-{bounds[-1]}-{i-1}", f"Found ascending run {bounds[-1]} to {i-1}")
+                bounds.append(i)
+        if n:
+            yield t.mark(range(bounds[-1], n), f"run-{bounds[-1]}-{n-1}", f"Found ascending run {bounds[-1]} to {n-1}")
+        bounds.append(n)
+    else:
+        bounds = list(range(n + 1))
+
+    # Each pass merges pairs of runs from src into dst, then the two swap
+    # roles. The array shows dst up to the merge position and src beyond
+    # it, which is exactly what the logical array holds mid-pass.
+    src, dst = a, list(a)
+    passes = 0
+    while len(bounds) > 2:
+        passes += 1
+        yield t.step(f"pass-{passes}", f"Merge pass {passes}: {len(bounds) - 1} runs")
+        merged = [0]
+        for r in range(0, len(bounds) - 1, 2):
+            lo = bounds[r]
+            if r + 2 >= len(bounds):
+                # An odd run out moves over unchanged
+                hi = bounds[r + 1]
+                dst[lo:hi] = src[lo:hi]
+                writes += hi - lo
+                merged.append(hi)
+                continue
+            mid, hi = bounds[r + 1], bounds[r + 2]
+            merged.append(hi)
+            writes += hi - lo
+
+            comparisons += 1
+            yield t.compare(mid-1, mid, f"compare-{mid-1}-{mid}", f"Checking run boundary: {src[mid-1]} <= {src[mid]}")
+            if src[mid - 1] <= src[mid]:
+                dst[lo:hi] = src[lo:hi]
+                yield t.mark(range(lo, hi), f"merge-skip-{lo}-{hi-1}",
+                       f"Runs {lo} to {mid-1} and {mid} to {hi-1} are already in order")
+                continue
+
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                comparisons += 1
+                yield t.compare(i, j, f"compare-{i}-{j}", f"Comparing {src[i]} and {src[j]}")
+                if src[i] <= src[j]:
+                    t.write(k, src[i], into=dst)
+                    i += 1
+                else:
+                    t.write(k, src[j], into=dst)
+                    j += 1
+                yield t.mark((k,), f"merge-place-{k}", f"Placed {dst[k]} into merged array")
+                k += 1
+            # Leftovers of the right run are already in place; the left's move up
+            while i < mid:
+                t.write(k, src[i], into=dst)
+                i += 1
+                k += 1
+            dst[k:hi] = src[j:hi]
+            yield t.mark(range(lo, hi), f"merged-segment-{lo}-{hi-1}", f"Merged segment {lo} to {hi-1}")
+        bounds = merged
+        src, dst = dst, src
+
+    if src is not a:
+        t.load(src)
+        writes += n
+
+    yield t.step("complete", f"✅ {'Natural' if natural else 'Bottom-up'} Merge Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "writes": writes}
+
+@register("selection-sort", params={"array": []})
+@traced
+def generate_selection_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = swaps = 0
+
+    yield t.step("init", "Starting Selection Sort (Python)")
 
-def generate_selection_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Selection Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
     for i in range(n):
         min_idx = i
-        steps.append(AlgorithmStep(
-            id=f"min-init-{i}",
-            description=f"Current minimum index: {i}",
-            highlightedIndices=[i],
-            data={"array": list(current_arr)}
-        ))
-        
+        yield t.mark((i,), f"min-init-{i}", f"Current minimum index: {i}")
+
         for j in range(i + 1, n):
-            steps.append(AlgorithmStep(
-                id=f"compare-{i}-{j}",
-                description=f"Comparing {current_arr[j]} with current min {current_arr[min_idx]}",
-                comparedIndices=[j, min_idx],
-                data={"array": list(current_arr)}
-            ))
-            
-            if current_arr[j] < current_arr[min_idx]:
+            comparisons += 1
+            yield t.compare(j, min_idx, f"compare-{i}-{j}", f"Comparing {a[j]} with current min {a[min_idx]}")
+
+            if a[j] < a[min_idx]:
                 min_idx = j
-                steps.append(AlgorithmStep(
-                    id=f"new-min-{j}",
-                    description=f"Found new minimum: {current_arr[j]}",
-                    highlightedIndices=[j],
-                    data={"array": list(current_arr)}
-                ))
-        
+                yield t.mark((j,), f"new-min-{j}", f"Found new minimum: {a[j]}")
+
         if min_idx != i:
-            current_arr[i], current_arr[min_idx] = current_arr[min_idx], current_arr[i]
-            steps.append(AlgorithmStep(
-                id=f"swap-{i}-{min_idx}",
-                description=f"Swapped {current_arr[i]} with {current_arr[min_idx]}",
-                highlightedIndices=[i, min_idx],
-                data={"array": list(current_arr)}
-            ))
-            
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Selection Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_insertion_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Insertion Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+            t.swap(i, min_idx)
+            swaps += 1
+            yield t.mark((i, min_idx), f"swap-{i}-{min_idx}", f"Swapped {a[i]} with {a[min_idx]}")
+
+    yield t.step("complete", "✅ Selection Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "swaps": swaps}
+
+@register("insertion-sort", params={"array": []})
+@traced
+def generate_insertion_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = writes = 0
+
+    yield t.step("init", "Starting Insertion Sort (Python)")
+
     for i in range(1, n):
-        key = current_arr[i]
+        key = a[i]
         j = i - 1
-        
-        steps.append(AlgorithmStep(
-            id=f"select-key-{i}",
-            description=f"Selected key: {key}",
-            highlightedIndices=[i],
-            data={"array": list(current_arr)}
-        ))
-        
-        while j >= 0 and current_arr[j] > key:
-            steps.append(AlgorithmStep(
-                id=f"compare-{j}-{i}",
-                description=f"Compare {current_arr[j]} > {key}, shifting {current_arr[j]} right",
-                comparedIndices=[j],
-                data={"array": list(current_arr)}
-            ))
-            
-            current_arr[j + 1] = current_arr[j]
+
+        yield t.mark((i,), f"select-key-{i}", f"Selected key: {key}")
+
+        while j >= 0 and a[j] > key:
+            comparisons += 1
+            yield t.compare(j, None, f"compare-{j}-{i}", f"Compare {a[j]} > {key}, shifting {a[j]} right")
+
+            t.write(j + 1, a[j])
+            writes += 1
             j -= 1
-            steps.append(AlgorithmStep(
-                id=f"shift-{j+1}",
-                description=f"Shifted for insertion",
-                highlightedIndices=[j+1],
-                data={"array": list(current_arr)}
-            ))
-            
-        current_arr[j + 1] = key
-        steps.append(AlgorithmStep(
-            id=f"insert-{j+1}",
-            description=f"Inserted {key} at index {j+1}",
-            highlightedIndices=[j+1],
-            data={"array": list(current_arr)}
-        ))
-        
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Insertion Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_heap_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Heap Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
+            yield t.mark((j+1,), f"shift-{j+1}", "Shifted for insertion")
+
+        # The comparison that stopped the shifting, unless j ran off the front
+        comparisons += j >= 0
+        t.write(j + 1, key)
+        writes += 1
+        yield t.mark((j+1,), f"insert-{j+1}", f"Inserted {key} at index {j+1}")
+
+    yield t.step("complete", "✅ Insertion Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "writes": writes}
+
+@register("heap-sort", params={"array": []})
+@traced
+def generate_heap_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = swaps = 0
+
+    yield t.step("init", "Starting Heap Sort (Python)")
 
     def heapify(n, i):
+        nonlocal comparisons, swaps
         largest = i
         l = 2 * i + 1
         r = 2 * i + 2
-        
+
         if l < n:
-            steps.append(AlgorithmStep(
-                id=f"compare-{largest}-{l}",
-                description=f"Comparing root {current_arr[largest]} with left child {current_arr[l]}",
-                comparedIndices=[largest, l],
-                data={"array": list(current_arr)}
-            ))
-            if current_arr[l] > current_arr[largest]:
+            comparisons += 1
+            yield t.compare(largest, l, f"compare-{largest}-{l}",
+                      f"Comparing root {a[largest]} with left child {a[l]}")
+            if a[l] > a[largest]:
                 largest = l
 
         if r < n:
-            steps.append(AlgorithmStep(
-                id=f"compare-{largest}-{r}",
-                description=f"Comparing largest {current_arr[largest]} with right child {current_arr[r]}",
-                comparedIndices=[largest, r],
-                data={"array": list(current_arr)}
-            ))
-            if current_arr[r] > current_arr[largest]:
+            comparisons += 1
+            yield t.compare(largest, r, f"compare-{largest}-{r}",
+                      f"Comparing largest {a[largest]} with right child {a[r]}")
+            if a[r] > a[largest]:
                 largest = r
 
         if largest != i:
-            current_arr[i], current_arr[largest] = current_arr[largest], current_arr[i]
-            steps.append(AlgorithmStep(
-                id=f"swap-{i}-{largest}",
-                description=f"Heapify: Swapped {current_arr[i]} with {current_arr[largest]}",
-                highlightedIndices=[i, largest],
-                data={"array": list(current_arr)}
-            ))
-            heapify(n, largest)
+            t.swap(i, largest)
+            swaps += 1
+            yield t.mark((i, largest), f"swap-{i}-{largest}", f"Heapify: Swapped {a[i]} with {a[largest]}")
+            yield from heapify(n, largest)
 
     # Build max heap
     for i in range(n // 2 - 1, -1, -1):
-        heapify(n, i)
-        
+        yield from heapify(n, i)
+
     for i in range(n - 1, 0, -1):
-        current_arr[i], current_arr[0] = current_arr[0], current_arr[i]
-        steps.append(AlgorithmStep(
-            id=f"extract-max-{i}",
-            description=f"Extracted max {current_arr[i]} to end",
-            highlightedIndices=[0, i],
-            data={"array": list(current_arr)}
-        ))
-        heapify(i, 0)
-        
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Heap Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_counting_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    if not current_arr: return steps
-    
-    # Handle negative numbers by shifting if necessary
-    min_val = min(current_arr)
-    shift = 0
-    if min_val < 0:
-        shift = abs(min_val)
-        current_arr = [x + shift for x in current_arr]
-        
-    max_val = max(current_arr)
-    count = [0] * (max_val + 1)
-    output = [0] * len(current_arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Counting Sort (Python)",
-        data={"array": list(arr)} # Display original array
-    ))
-    
+        t.swap(i, 0)
+        swaps += 1
+        yield t.mark((0, i), f"extract-max-{i}", f"Extracted max {a[i]} to end")
+        yield from heapify(i, 0)
+
+    yield t.step("complete", "✅ Heap Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "swaps": swaps}
+
+# Counting sort counts into a dense table, one slot per value in the
+# range, while the range is small next to n and within a fixed memory
+# cap; otherwise into a sparse table of the distinct values, sorted once
+# counted, whose size never exceeds n. Steps carry the one count they
+# change rather than a copy of the table.
+COUNTING_DENSE_RANGE_FACTOR = 4
+COUNTING_DENSE_MIN_RANGE = 256
+# 8 MiB of list slots; wider ranges always count sparsely
+COUNTING_DENSE_MAX_RANGE = 1 << 20
+
+def _dense_counting(arr: List[int]) -> bool:
+    """Whether counting sort should count ``arr`` into a dense table."""
+    if not all(type(x) is int for x in arr):
+        return False
+    value_range = max(arr) - min(arr) + 1
+    return value_range <= min(max(COUNTING_DENSE_RANGE_FACTOR * len(arr), COUNTING_DENSE_MIN_RANGE),
+                              COUNTING_DENSE_MAX_RANGE)
+
+@register("counting-sort", params={"array": []})
+@traced
+def generate_counting_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    # t.array shows the original array while counting, then the output
+    current_arr = list(t.array)
+    n = len(current_arr)
+    if not current_arr: return {"counts": 0, "slots": 0, "writes": 0}
+
+    yield t.step("init", "Starting Counting Sort (Python)")
+
+    dense = _dense_counting(current_arr)
+    if dense:
+        low = min(current_arr)
+        count = [0] * (max(current_arr) - low + 1)
+        yield t.step("table-dense", f"Values span {len(count)} slots for {n} elements: counting into a dense table")
+    else:
+        counts = {}
+        yield t.step("table-sparse", f"Values span too wide a range for {n} elements: counting distinct values in a sparse table")
+
     # Count occurrences
-    for i in range(len(current_arr)):
-        count[current_arr[i]] += 1
-        steps.append(AlgorithmStep(
-            id=f"count-{i}",
-            description=f"Counting {current_arr[i] - shift}",
-            highlightedIndices=[i],
-            data={"array": list(arr), "count": list(count)}
-        ))
-        
-    # Accumulate count
-    for i in range(1, len(count)):
-        count[i] += count[i - 1]
-    
-    steps.append(AlgorithmStep(
-        id="accumulate",
-        description="Accumulated counts",
-        data={"array": list(arr), "count": list(count)}
-    ))
-    
-    # Build output array
-    i = len(current_arr) - 1
-    while i >= 0:
+    for i, val in enumerate(current_arr):
+        if dense:
+            count[val - low] += 1
+            occurrences = count[val - low]
+        else:
+            occurrences = counts[val] = counts.get(val, 0) + 1
+        yield t.mark((i,), f"count-{i}", f"Counting {val}", {"count_update": [val, occurrences]})
+
+    # Accumulate count: each value's slot becomes the end of its output range
+    if dense:
+        keys = [low + slot for slot, occurrences in enumerate(count) if occurrences]
+        slots = len(count)
+    else:
+        keys = sorted(counts)
+        slots = len(keys)
+    end = 0
+    for val in keys:
+        if dense:
+            end += count[val - low]
+            count[val - low] = end
+        else:
+            end += counts[val]
+            counts[val] = end
+        yield t.step(f"accumulate-{val}", f"Accumulated counts: {val} ends at position {end}", {"count_update": [val, end]})
+
+    # Build output array; counting sort is not in-place, so the partially
+    # built output replaces the input on display
+    t.load([0] * n)
+    for i in range(n - 1, -1, -1):
         val = current_arr[i]
-        output[count[val] - 1] = val - shift
-        count[val] -= 1
-        
-        # Visualize intermediate state (partially built output)
-        current_output_display = list(output)
-        # Update original array progressively for visualization simulation
-        temp_viz = list(output) 
-        # Note: Counting sort is not in-place usually, but we visualize result forming
-        
-        steps.append(AlgorithmStep(
-            id=f"place-{i}",
-            description=f"Placing {val - shift}",
-            data={"array": list(temp_viz)}
-        ))
-        i -= 1
-        
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Counting Sort Complete (Python)",
-        data={"array": list(output), "finished": True}
-    ))
-    return steps
-
-def generate_shell_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
+        if dense:
+            count[val - low] -= 1
+            position = count[val - low]
+        else:
+            counts[val] -= 1
+            position = counts[val]
+        t.write(position, val)
+        yield t.step(f"place-{i}", f"Placing {val}", {"count_update": [val, position]})
+
+    yield t.step("complete", "✅ Counting Sort Complete (Python)", {"finished": True})
+    return {"counts": n, "slots": slots, "writes": n}
+
+@register("shell-sort", params={"array": []})
+@traced
+def generate_shell_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
     gap = n // 2
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Shell Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+    comparisons = writes = 0
+
+    yield t.step("init", "Starting Shell Sort (Python)")
+
     while gap > 0:
-        steps.append(AlgorithmStep(
-            id=f"gap-{gap}",
-            description=f"Sorting with gap: {gap}",
-            data={"array": list(current_arr)}
-        ))
-        
+        yield t.step(f"gap-{gap}", f"Sorting with gap: {gap}")
+
         for i in range(gap, n):
-            temp = current_arr[i]
+            temp = a[i]
             j = i
-            
-            steps.append(AlgorithmStep(
-                id=f"select-{i}",
-                description=f"Selected {temp} at index {i}",
-                highlightedIndices=[i],
-                data={"array": list(current_arr)}
-            ))
-            
-            while j >= gap and current_arr[j - gap] > temp:
-                steps.append(AlgorithmStep(
-                    id=f"compare-{j}-{j-gap}",
-                    description=f"Comparing {current_arr[j-gap]} > {temp}",
-                    comparedIndices=[j, j-gap],
-                    data={"array": list(current_arr)}
-                ))
-                
-                current_arr[j] = current_arr[j - gap]
+
+            yield t.mark((i,), f"select-{i}", f"Selected {temp} at index {i}")
+
+            while j >= gap and a[j - gap] > temp:
+                comparisons += 1
+                yield t.compare(j, j-gap, f"compare-{j}-{j-gap}", f"Comparing {a[j-gap]} > {temp}")
+
+                t.write(j, a[j - gap])
+                writes += 1
                 j -= gap
-                
-                steps.append(AlgorithmStep(
-                    id=f"shift-{j}",
-                    description=f"Shifted element to {j}",
-                    highlightedIndices=[j],
-                    data={"array": list(current_arr)}
-                ))
-                
-            current_arr[j] = temp
-            steps.append(AlgorithmStep(
-                id=f"insert-{j}",
-                description=f"Inserted {temp} at index {j}",
-                highlightedIndices=[j],
-                data={"array": list(current_arr)}
-            ))
-            
+
+                yield t.mark((j,), f"shift-{j}", f"Shifted element to {j}")
+
+            comparisons += j >= gap
+            t.write(j, temp)
+            writes += 1
+            yield t.mark((j,), f"insert-{j}", f"Inserted {temp} at index {j}")
+
         gap //= 2
 
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Shell Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
+    yield t.step("complete", "✅ Shell Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "writes": writes}
 
-def generate_radix_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    if not current_arr: return steps
-    
-    max_val = max(current_arr)
+@register("radix-sort", params={"array": []})
+@traced
+def generate_radix_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    if not a: return {"passes": 0, "writes": 0}
+
+    max_val = max(a)
     exp = 1
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Radix Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+    passes = 0
+
+    yield t.step("init", "Starting Radix Sort (Python)")
+
     while max_val // exp > 0:
-        steps.append(AlgorithmStep(
-            id=f"exp-{exp}",
-            description=f"Sorting digit at place: {exp}",
-            data={"array": list(current_arr)}
-        ))
-        
-        n = len(current_arr)
+        yield t.step(f"exp-{exp}", f"Sorting digit at place: {exp}")
+
+        n = len(a)
         output = [0] * n
         count = [0] * 10
-        
+
         for i in range(n):
-            index = (current_arr[i] // exp) % 10
+            index = (a[i] // exp) % 10
             count[index] += 1
-            
+
         for i in range(1, 10):
             count[i] += count[i - 1]
-            
+
         i = n - 1
         while i >= 0:
-            index = (current_arr[i] // exp) % 10
-            output[count[index] - 1] = current_arr[i]
+            index = (a[i] // exp) % 10
+            output[count[index] - 1] = a[i]
             count[index] -= 1
             i -= 1
-            
+
         for i in range(n):
-            current_arr[i] = output[i]
-            steps.append(AlgorithmStep(
-                id=f"update-{exp}-{i}",
-                description=f"Updated index {i} with {current_arr[i]}",
-                highlightedIndices=[i],
-                data={"array": list(current_arr)}
-            ))
-            
+            t.write(i, output[i])
+            yield t.mark((i,), f"update-{exp}-{i}", f"Updated index {i} with {a[i]}")
+
+        passes += 1
         exp *= 10
-        
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Radix Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_bucket_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    if not current_arr: return steps
-    
-    n = len(current_arr)
-    max_val = max(current_arr)
-    min_val = min(current_arr)
+
+    yield t.step("complete", "✅ Radix Sort Complete (Python)", {"finished": True})
+    return {"passes": passes, "writes": passes * len(a)}
+
+@register("bucket-sort", params={"array": []})
+@traced
+def generate_bucket_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    if not a: return {"writes": 0}
+
+    n = len(a)
+    max_val = max(a)
+    min_val = min(a)
     range_val = max_val - min_val
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Bucket Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+
+    yield t.step("init", "Starting Bucket Sort (Python)")
+
     bucket_count = n
     if range_val == 0: bucket_count = 1
     buckets = [[] for _ in range(bucket_count)]
-    
+
     for i in range(n):
         if range_val == 0:
             idx = 0
         else:
-            idx = int((current_arr[i] - min_val) / range_val * (bucket_count - 1))
-        buckets[idx].append(current_arr[i])
-        
-        steps.append(AlgorithmStep(
-            id=f"bucket-place-{i}",
-            description=f"Placed {current_arr[i]} into bucket {idx}",
-            highlightedIndices=[i],
-            data={"array": list(current_arr), "buckets": buckets} # Buckets visualization would need frontend support
-        ))
-        
+            idx = int((a[i] - min_val) / range_val * (bucket_count - 1))
+        buckets[idx].append(a[i])
+
+        # Buckets visualization would need frontend support
+        yield t.mark((i,), f"bucket-place-{i}", f"Placed {a[i]} into bucket {idx}",
+                     lambda: {"buckets": [list(bucket) for bucket in buckets]})
+
     k = 0
     for i in range(bucket_count):
         buckets[i].sort() # Using Python's Timsort for individual buckets
         for item in buckets[i]:
-            current_arr[k] = item
-            steps.append(AlgorithmStep(
-                id=f"collect-{k}",
-                description=f"Collected {item} from bucket {i}",
-                highlightedIndices=[k],
-                data={"array": list(current_arr)}
-            ))
+            t.write(k, item)
+            yield t.mark((k,), f"collect-{k}", f"Collected {item} from bucket {i}")
             k += 1
-            
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Bucket Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_comb_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
+
+    yield t.step("complete", "✅ Bucket Sort Complete (Python)", {"finished": True})
+    return {"writes": 2 * n}
+
+@register("comb-sort", params={"array": []})
+@traced
+def generate_comb_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
     gap = n
     shrink = 1.3
     sorted_flag = False
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Comb Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+    comparisons = swaps = 0
+
+    yield t.step("init", "Starting Comb Sort (Python)")
+
     while not sorted_flag:
         gap = int(gap / shrink)
         if gap <= 1:
             gap = 1
             sorted_flag = True
-            
+
         i = 0
-        steps.append(AlgorithmStep(
-            id=f"gap-{gap}",
-            description=f"Current gap: {gap}",
-            data={"array": list(current_arr)}
-        ))
-        
+        yield t.step(f"gap-{gap}", f"Current gap: {gap}")
+
         while i + gap < n:
-            steps.append(AlgorithmStep(
-                id=f"compare-{i}-{i+gap}",
-                description=f"Comparing {current_arr[i]} and {current_arr[i+gap]}",
-                comparedIndices=[i, i+gap],
-                data={"array": list(current_arr)}
-            ))
-            
-            if current_arr[i] > current_arr[i + gap]:
-                current_arr[i], current_arr[i + gap] = current_arr[i + gap], current_arr[i]
+            comparisons += 1
+            yield t.compare(i, i+gap, f"compare-{i}-{i+gap}", f"Comparing {a[i]} and {a[i+gap]}")
+
+            if a[i] > a[i + gap]:
+                t.swap(i, i + gap)
                 sorted_flag = False
-                steps.append(AlgorithmStep(
-                    id=f"swap-{i}-{i+gap}",
-                    description=f"Swapped {current_arr[i]} and {current_arr[i+gap]}",
-                    highlightedIndices=[i, i+gap],
-                    data={"array": list(current_arr)}
-                ))
+                swaps += 1
+                yield t.mark((i, i+gap), f"swap-{i}-{i+gap}", f"Swapped {a[i]} and {a[i+gap]}")
             i += 1
-            
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Comb Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_cycle_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Cycle Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+
+    yield t.step("complete", "✅ Comb Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "swaps": swaps}
+
+@register("cycle-sort", params={"array": []})
+@traced
+def generate_cycle_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = writes = 0
+
+    yield t.step("init", "Starting Cycle Sort (Python)")
+
+    def place(pos, item):
+        # Put item at pos and pick up what was there
+        displaced = a[pos]
+        t.write(pos, item)
+        return displaced
+
     for cycle_start in range(0, n - 1):
-        item = current_arr[cycle_start]
+        item = a[cycle_start]
         pos = cycle_start
-        
-        steps.append(AlgorithmStep(
-            id=f"cycle-start-{cycle_start}",
-            description=f"Starting cycle for item {item} at {cycle_start}",
-            highlightedIndices=[cycle_start],
-            data={"array": list(current_arr)}
-        ))
-        
+
+        yield t.mark((cycle_start,), f"cycle-start-{cycle_start}", f"Starting cycle for item {item} at {cycle_start}")
+
+        comparisons += n - cycle_start - 1
         for i in range(cycle_start + 1, n):
-            if current_arr[i] < item:
+            if a[i] < item:
                 pos += 1
-                
+
         if pos == cycle_start:
             continue
-            
-        while item == current_arr[pos]:
+
+        while item == a[pos]:
             pos += 1
-            
-        current_arr[pos], item = item, current_arr[pos]
-        steps.append(AlgorithmStep(
-            id=f"swap-{pos}",
-            description=f"Placed item at correct position {pos}",
-            highlightedIndices=[pos, cycle_start],
-            data={"array": list(current_arr)}
-        ))
-        
+
+        item = place(pos, item)
+        writes += 1
+        yield t.mark((pos, cycle_start), f"swap-{pos}", f"Placed item at correct position {pos}")
+
         while pos != cycle_start:
             pos = cycle_start
+            comparisons += n - cycle_start - 1
             for i in range(cycle_start + 1, n):
-                if current_arr[i] < item:
+                if a[i] < item:
                     pos += 1
-                    
-            while item == current_arr[pos]:
+
+            while item == a[pos]:
                 pos += 1
-                
-            current_arr[pos], item = item, current_arr[pos]
-            steps.append(AlgorithmStep(
-                id=f"swap-{pos}-cycle",
-                description=f"Placed item at correct position {pos}",
-                highlightedIndices=[pos, cycle_start],
-                data={"array": list(current_arr)}
-            ))
-            
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Cycle Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_odd_even_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
-    current_arr = list(arr)
-    n = len(current_arr)
+
+            item = place(pos, item)
+            writes += 1
+            yield t.mark((pos, cycle_start), f"swap-{pos}-cycle", f"Placed item at correct position {pos}")
+
+    yield t.step("complete", "✅ Cycle Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "writes": writes}
+
+@register("odd-even-sort", params={"array": []})
+@traced
+def generate_odd_even_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
     is_sorted = False
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Odd-Even Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
+    comparisons = swaps = 0
+
+    yield t.step("init", "Starting Odd-Even Sort (Python)")
+
     while not is_sorted:
         is_sorted = True
-        
+
         # Odd phase
         for i in range(1, n - 1, 2):
-            steps.append(AlgorithmStep(
-                id=f"odd-compare-{i}-{i+1}",
-                description=f"Odd Phase: Comparing {current_arr[i]} and {current_arr[i+1]}",
-                comparedIndices=[i, i+1],
-                data={"array": list(current_arr)}
-            ))
-            if current_arr[i] > current_arr[i+1]:
-                current_arr[i], current_arr[i+1] = current_arr[i+1], current_arr[i]
+            comparisons += 1
+            yield t.compare(i, i+1, f"odd-compare-{i}-{i+1}", f"Odd Phase: Comparing {a[i]} and {a[i+1]}")
+            if a[i] > a[i+1]:
+                t.swap(i, i+1)
                 is_sorted = False
-                steps.append(AlgorithmStep(
-                    id=f"odd-swap-{i}-{i+1}",
-                    description=f"Odd Phase: Swapped {current_arr[i]} and {current_arr[i+1]}",
-                    highlightedIndices=[i, i+1],
-                    data={"array": list(current_arr)}
-                ))
-                
+                swaps += 1
+                yield t.mark((i, i+1), f"odd-swap-{i}-{i+1}", f"Odd Phase: Swapped {a[i]} and {a[i+1]}")
+
         # Even phase
         for i in range(0, n - 1, 2):
-            steps.append(AlgorithmStep(
-                id=f"even-compare-{i}-{i+1}",
-                description=f"Even Phase: Comparing {current_arr[i]} and {current_arr[i+1]}",
-                comparedIndices=[i, i+1],
-                data={"array": list(current_arr)}
-            ))
-            if current_arr[i] > current_arr[i+1]:
-                current_arr[i], current_arr[i+1] = current_arr[i+1], current_arr[i]
+            comparisons += 1
+            yield t.compare(i, i+1, f"even-compare-{i}-{i+1}", f"Even Phase: Comparing {a[i]} and {a[i+1]}")
+            if a[i] > a[i+1]:
+                t.swap(i, i+1)
                 is_sorted = False
-                steps.append(AlgorithmStep(
-                    id=f"even-swap-{i}-{i+1}",
-                    description=f"Even Phase: Swapped {current_arr[i]} and {current_arr[i+1]}",
-                    highlightedIndices=[i, i+1],
-                    data={"array": list(current_arr)}
-                ))
-                
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Odd-Even Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_tim_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
+                swaps += 1
+                yield t.mark((i, i+1), f"even-swap-{i}-{i+1}", f"Even Phase: Swapped {a[i]} and {a[i+1]}")
+
+    yield t.step("complete", "✅ Odd-Even Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "swaps": swaps}
+
+# Tim sort as in CPython's listsort: the input is split into natural runs
+# (strictly descending ones reversed in place), runs shorter than minrun
+# are extended by binary insertion sort, and runs wait on a stack whose
+# lengths keep the merge invariants, so merges stay balanced. Merges first
+# trim the elements already in place and switch to galloping (exponential
+# search, then copying whole blocks) while one run keeps winning.
+MIN_GALLOP = 7
+
+def _min_run(n: int) -> int:
+    """A run length in 32..64 that splits ``n`` into a power of two runs, or slightly fewer."""
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _bisect(key, seq, lo: int, hi: int, right: bool):
+    """Binary search: where ``key`` goes in sorted ``seq[lo:hi]`` and the comparisons it took.
+
+    The position is after any equal elements when ``right`` is set and
+    before them otherwise.
+    """
+    comparisons = 0
+    while lo < hi:
+        mid = (lo + hi) // 2
+        comparisons += 1
+        if (seq[mid] <= key) if right else (seq[mid] < key):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo, comparisons
+
+def _gallop(key, seq, lo: int, hi: int, right: bool, from_end: bool):
+    """Like ``_bisect``, but cheap when the position is near one end.
+
+    The search doubles its step from the start, or from the end with
+    ``from_end``, then bisects the bracket it found.
+    """
+    comparisons = 0
+    offset = 1
+    if from_end:
+        end = hi
+        while end - offset >= lo:
+            comparisons += 1
+            value = seq[end - offset]
+            if (value <= key) if right else (value < key):
+                lo = end - offset + 1
+                break
+            hi = end - offset
+            offset *= 2
+    else:
+        start = lo
+        while start + offset - 1 < hi:
+            comparisons += 1
+            value = seq[start + offset - 1]
+            if not ((value <= key) if right else (value < key)):
+                hi = start + offset - 1
+                break
+            lo = start + offset
+            offset *= 2
+    pos, bisected = _bisect(key, seq, lo, hi, right)
+    return pos, comparisons + bisected
+
+def _collapse_index(lengths: List[int], force: bool) -> Optional[int]:
+    """The run to merge with its successor to restore the stack invariants, or None.
+
+    Walking up the stack, each run must be longer than the next two
+    together and the next one longer than the one after it. ``force``
+    merges down to one run regardless, once the input is used up.
+    """
+    if len(lengths) < 2:
+        return None
+    top = len(lengths) - 2
+    if force or (top > 0 and lengths[top - 1] <= lengths[top] + lengths[top + 1]) or \
+            (top > 1 and lengths[top - 2] <= lengths[top - 1] + lengths[top]):
+        if top > 0 and lengths[top - 1] < lengths[top + 1]:
+            top -= 1
+        return top
+    if lengths[top] <= lengths[top + 1]:
+        return top
+    return None
+
+@register("tim-sort", params={"array": []})
+@traced
+def generate_tim_sort_steps(t: ArrayTracer) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+    comparisons = writes = 0
+    min_gallop = MIN_GALLOP
+    # [base, length] of each pending run, bottom first
+    runs: List[List[int]] = []
+
+    yield t.step("init", "Starting Tim Sort (Python)")
+
+    def count_run(lo):
+        """Length of the run starting at lo, reversing it if it descends."""
+        nonlocal comparisons, writes
+        hi = lo + 1
+        if hi == n:
+            return 1
+        comparisons += 1
+        if a[hi] < a[lo]:
+            # Strictly descending, so reversing keeps equal elements in order
+            hi += 1
+            while hi < n:
+                comparisons += 1
+                if not a[hi] < a[hi - 1]:
+                    break
+                hi += 1
+            yield t.mark(range(lo, hi), f"run-{lo}-{hi-1}", f"Found descending run {lo} to {hi-1}")
+            for i in range((hi - lo) // 2):
+                t.swap(lo + i, hi - 1 - i)
+            writes += (hi - lo) // 2 * 2
+            yield t.mark(range(lo, hi), f"reverse-run-{lo}-{hi-1}", f"Reversed run {lo} to {hi-1}")
+        else:
+            hi += 1
+            while hi < n:
+                comparisons += 1
+                if a[hi] < a[hi - 1]:
+                    break
+                hi += 1
+            yield t.mark(range(lo, hi), f"run-{lo}-{hi-1}", f"Found ascending run {lo} to {hi-1}")
+        return hi - lo
+
+    def binary_insertion_sort(lo, hi, start):
+        """Sort a[lo:hi] given that a[lo:start] is sorted already."""
+        nonlocal comparisons, writes
+        for i in range(start, hi):
+            pivot = a[i]
+            pos, c = _bisect(pivot, a, lo, i, right=True)
+            comparisons += c
+            for k in range(i, pos, -1):
+                t.write(k, a[k - 1])
+            t.write(pos, pivot)
+            writes += i - pos + 1
+            yield t.mark(range(lo, i + 1), f"binary-insert-{i}", f"Binary insertion: placed {pivot} at index {pos} of run {lo} to {hi-1}")
+
+    def gallop_marks(k, count, source):
+        if count:
+            yield t.mark(range(k, k + count), f"gallop-copy-{k}-{k+count-1}",
+                   f"Galloping: moved {count} elements of run {source} in one block")
+
+    def merge_lo(base_a, len_a, base_b, len_b):
+        """Merge from the left, with the shorter run A copied out to make room."""
+        nonlocal comparisons, writes, min_gallop
+        tmp = a[base_a:base_a + len_a]
+        i, j, k = 0, base_b, base_a
+        end_b = base_b + len_b
+        while i < len_a and j < end_b:
+            count_a = count_b = 0
+            while i < len_a and j < end_b:
+                comparisons += 1
+                if a[j] < tmp[i]:
+                    t.write(k, a[j])
+                    j += 1
+                    count_b += 1
+                    count_a = 0
+                else:
+                    t.write(k, tmp[i])
+                    i += 1
+                    count_a += 1
+                    count_b = 0
+                k += 1
+                writes += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+            yield t.step(f"gallop-mode-{k}", f"Entering galloping mode after {max(count_a, count_b)} wins in a row (min_gallop {min_gallop})")
+            while i < len_a and j < end_b:
+                pos, c = _gallop(a[j], tmp, i, len_a, right=True, from_end=False)
+                comparisons += c
+                count_a = pos - i
+                for m in range(count_a):
+                    t.write(k + m, tmp[i + m])
+                yield from gallop_marks(k, count_a, "A")
+                i, k = pos, k + count_a
+                writes += count_a
+                if i == len_a:
+                    break
+                t.write(k, a[j])
+                j, k = j + 1, k + 1
+                writes += 1
+                if j == end_b:
+                    break
+                pos, c = _gallop(tmp[i], a, j, end_b, right=False, from_end=False)
+                comparisons += c
+                count_b = pos - j
+                for m in range(count_b):
+                    t.write(k + m, a[j + m])
+                yield from gallop_marks(k, count_b, "B")
+                j, k = pos, k + count_b
+                writes += count_b
+                if j == end_b:
+                    break
+                t.write(k, tmp[i])
+                i, k = i + 1, k + 1
+                writes += 1
+                # Galloping paid off: make it easier to enter next time
+                min_gallop = max(1, min_gallop - 1)
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    break
+            min_gallop += 2
+        # What is left of B is in place already
+        for m in range(len_a - i):
+            t.write(k + m, tmp[i + m])
+        writes += len_a - i
+
+    def merge_hi(base_a, len_a, base_b, len_b):
+        """Merge from the right, with the shorter run B copied out to make room."""
+        nonlocal comparisons, writes, min_gallop
+        tmp = a[base_b:base_b + len_b]
+        i, j, k = base_a + len_a - 1, len_b - 1, base_b + len_b - 1
+        while i >= base_a and j >= 0:
+            count_a = count_b = 0
+            while i >= base_a and j >= 0:
+                comparisons += 1
+                if tmp[j] < a[i]:
+                    t.write(k, a[i])
+                    i -= 1
+                    count_a += 1
+                    count_b = 0
+                else:
+                    t.write(k, tmp[j])
+                    j -= 1
+                    count_b += 1
+                    count_a = 0
+                k -= 1
+                writes += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+            yield t.step(f"gallop-mode-{k}", f"Entering galloping mode after {max(count_a, count_b)} wins in a row (min_gallop {min_gallop})")
+            while i >= base_a and j >= 0:
+                pos, c = _gallop(tmp[j], a, base_a, i + 1, right=True, from_end=True)
+                comparisons += c
+                count_a = i + 1 - pos
+                for m in range(count_a):
+                    t.write(k - m, a[i - m])
+                yield from gallop_marks(k - count_a + 1, count_a, "A")
+                i, k = pos - 1, k - count_a
+                writes += count_a
+                if i < base_a:
+                    break
+                t.write(k, tmp[j])
+                j, k = j - 1, k - 1
+                writes += 1
+                if j < 0:
+                    break
+                pos, c = _gallop(a[i], tmp, 0, j + 1, right=False, from_end=True)
+                comparisons += c
+                count_b = j + 1 - pos
+                for m in range(count_b):
+                    t.write(k - m, tmp[j - m])
+                yield from gallop_marks(k - count_b + 1, count_b, "B")
+                j, k = pos - 1, k - count_b
+                writes += count_b
+                if j < 0:
+                    break
+                t.write(k, a[i])
+                i, k = i - 1, k - 1
+                writes += 1
+                min_gallop = max(1, min_gallop - 1)
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    break
+            min_gallop += 2
+        # What is left of A is in place already
+        for m in range(j + 1):
+            t.write(base_a + m, tmp[m])
+        writes += j + 1
+
+    def merge_at(index, reason):
+        nonlocal comparisons
+        base_a, len_a = runs[index]
+        base_b, len_b = runs[index + 1]
+        end = base_b + len_b
+        yield t.step(f"merge-at-{base_a}-{end-1}", f"Merging runs {base_a} to {base_b-1} and {base_b} to {end-1}: {reason}",
+               {"run_stack": [list(run) for run in runs]})
+        runs[index][1] = len_a + len_b
+        del runs[index + 1]
+        # Elements of A not above B's first and of B not below A's last stay put
+        pos, c = _gallop(a[base_b], a, base_a, base_b, right=True, from_end=False)
+        comparisons += c
+        len_a -= pos - base_a
+        base_a = pos
+        if len_a:
+            pos, c = _gallop(a[base_b - 1], a, base_b, end, right=False, from_end=True)
+            comparisons += c
+            len_b = pos - base_b
+        if not len_a or not len_b:
+            yield t.mark(range(runs[index][0], end), f"merge-skip-{runs[index][0]}-{end-1}", "Runs already in order, nothing to merge")
+            return
+        yield t.mark(range(base_a, base_b + len_b), f"merge-trim-{base_a}-{base_b+len_b-1}",
+               f"Only {base_a} to {base_b+len_b-1} need merging, the rest is in place")
+        if len_a <= len_b:
+            yield from merge_lo(base_a, len_a, base_b, len_b)
+        else:
+            yield from merge_hi(base_a, len_a, base_b, len_b)
+        yield t.mark(range(runs[index][0], end), f"merge-runs-{runs[index][0]}-{end-1}", f"Merged runs from {runs[index][0]} to {end-1}")
+
+    def collapse(force):
+        while True:
+            index = _collapse_index([length for _, length in runs], force)
+            if index is None:
+                return
+            if force:
+                reason = "input used up, merging the stack down"
+            else:
+                reason = f"run lengths {', '.join(str(length) for _, length in runs[-3:])} break the stack invariants"
+            yield from merge_at(index, reason)
+
+    if n:
+        minrun = _min_run(n)
+        yield t.step(f"minrun-{minrun}", f"Computed minrun = {minrun} for {n} elements")
+    lo = 0
+    while lo < n:
+        length = yield from count_run(lo)
+        if length < minrun:
+            forced = min(minrun, n - lo)
+            yield from binary_insertion_sort(lo, lo + forced, lo + length)
+            length = forced
+        runs.append([lo, length])
+        yield t.step(f"push-run-{lo}-{lo+length-1}", f"Pushed run {lo} to {lo+length-1} (length {length}) onto the run stack",
+               {"run_stack": [list(run) for run in runs]})
+        yield from collapse(False)
+        lo += length
+    yield from collapse(True)
+
+    yield t.step("complete", "✅ Tim Sort Complete (Python)", {"finished": True})
+    return {"comparisons": comparisons, "writes": writes}
+
+# Tree sort inserts into a binary search tree and reads it back in order.
+# "none" keeps the plain BST, which degenerates into a list on ordered
+# input; "avl" and "red-black" rebalance with rotations after each insert,
+# keeping the height logarithmic.
+TREE_BALANCING = ("none", "avl", "red-black")
+
+class _TreePool:
+    """A binary search tree held in parallel arrays: node i is the i-th inserted key.
+
+    Children are node numbers, -1 for none. Insertion and traversal are
+    iterative, so neither depends on the tree height. ``event(id,
+    nodes, description)`` is told about every rotation and recoloring.
+    """
+
+    def __init__(self, balance: str, size: int, event=None):
+        if balance not in TREE_BALANCING:
+            raise ValueError(f"Unknown tree balancing {balance!r}, expected one of {', '.join(TREE_BALANCING)}")
+        self.balance = balance
+        self.keys = []
+        self.left = array("q", [-1]) * size
+        self.right = array("q", [-1]) * size
+        # AVL subtree heights, or red-black colors (1 = red)
+        self.height = array("b", [1]) * size if balance == "avl" else None
+        self.red = bytearray(b"\1") * size if balance == "red-black" else None
+        self.root = -1
+        self.comparisons = 0
+        self.rotations = 0
+        self.event = event
+
+    def insert(self, key) -> int:
+        """Add ``key``, rebalance and return its node."""
+        node, path = self.attach(key)
+        self.rebalance(node, path)
+        return node
+
+    def attach(self, key):
+        """Add ``key`` as a leaf; equal keys go to the left. Returns the node and its ancestors."""
+        keys, left, right = self.keys, self.left, self.right
+        node = len(keys)
+        keys.append(key)
+        # Ancestors of the new node, root first
+        path = []
+        cur = self.root
+        while cur != -1:
+            path.append(cur)
+            self.comparisons += 1
+            cur = right[cur] if keys[cur] < key else left[cur]
+        if not path:
+            self.root = node
+        elif keys[path[-1]] < key:
+            right[path[-1]] = node
+        else:
+            left[path[-1]] = node
+        return node, path
+
+    def rebalance(self, node: int, path: List[int]):
+        """Restore the balance after attaching ``node`` below ``path`` (root first)."""
+        if self.balance == "avl":
+            self._avl_fixup(path)
+        elif self.balance == "red-black":
+            self._red_black_fixup(node, path)
+
+    def _replace_child(self, parent: int, old: int, new: int):
+        if parent == -1:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def _rotate(self, node: int, to_left: bool) -> int:
+        """Rotate the subtree at ``node`` and return its new root."""
+        left, right = self.left, self.right
+        if to_left:
+            child = right[node]
+            right[node] = left[child]
+            left[child] = node
+        else:
+            child = left[node]
+            left[node] = right[child]
+            right[child] = node
+        self.rotations += 1
+        if self.event is not None:
+            keys = self.keys
+            direction = "left" if to_left else "right"
+            self.event(f"rotate-{direction}-{node}", (node, child),
+                       f"Rotated {direction} at {keys[node]}: {keys[child]} moves up")
+        return child
+
+    def _avl_height(self, node: int) -> int:
+        return self.height[node] if node != -1 else 0
+
+    def _avl_update(self, node: int):
+        self.height[node] = 1 + max(self._avl_height(self.left[node]), self._avl_height(self.right[node]))
+
+    def _avl_balance(self, node: int) -> int:
+        return self._avl_height(self.left[node]) - self._avl_height(self.right[node])
+
+    def _avl_fixup(self, path: List[int]):
+        # One (single or double) rotation restores the height of the
+        # subtree it fixes, so nothing above it changes after that
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            before = self.height[node]
+            self._avl_update(node)
+            balance = self._avl_balance(node)
+            if balance > 1 or balance < -1:
+                heavy_left = balance > 1
+                child = self.left[node] if heavy_left else self.right[node]
+                if (self._avl_balance(child) < 0) if heavy_left else (self._avl_balance(child) > 0):
+                    inner = self._rotate(child, to_left=heavy_left)
+                    if heavy_left:
+                        self.left[node] = inner
+                    else:
+                        self.right[node] = inner
+                    self._avl_update(child)
+                    self._avl_update(inner)
+                top = self._rotate(node, to_left=not heavy_left)
+                self._avl_update(node)
+                self._avl_update(top)
+                self._replace_child(path[depth - 1] if depth else -1, node, top)
+                return
+            if self.height[node] == before:
+                return
+
+    def _red_black_fixup(self, node: int, path: List[int]):
+        red, left, right = self.red, self.left, self.right
+        while path and red[path[-1]]:
+            # A red parent is never the root, so the grandparent exists
+            parent, grand = path[-1], path[-2]
+            parent_is_left = left[grand] == parent
+            uncle = right[grand] if parent_is_left else left[grand]
+            if uncle != -1 and red[uncle]:
+                red[parent] = red[uncle] = 0
+                red[grand] = 1
+                if self.event is not None:
+                    self.event(f"recolor-{grand}", (parent, uncle, grand),
+                               f"Recolored: {self.keys[parent]} and {self.keys[uncle]} black, {self.keys[grand]} red")
+                node = grand
+                del path[-2:]
+                continue
+            if (right[parent] == node) if parent_is_left else (left[parent] == node):
+                # Inner grandchild: turn it into an outer one first
+                node = self._rotate(parent, to_left=parent_is_left)
+                if parent_is_left:
+                    left[grand] = node
+                else:
+                    right[grand] = node
+                parent = node
+            top = self._rotate(grand, to_left=not parent_is_left)
+            red[parent] = 0
+            red[grand] = 1
+            self._replace_child(path[-3] if len(path) > 2 else -1, grand, top)
+            break
+        red[self.root] = 0
+
+    def inorder(self):
+        """Node numbers in key order."""
+        left, right = self.left, self.right
+        stack = []
+        cur = self.root
+        while stack or cur != -1:
+            while cur != -1:
+                stack.append(cur)
+                cur = left[cur]
+            cur = stack.pop()
+            yield cur
+            cur = right[cur]
+
+    def operations(self) -> Dict[str, int]:
+        if self.balance == "none":
+            return {"comparisons": self.comparisons}
+        return {"comparisons": self.comparisons, "rotations": self.rotations}
+
+@register("tree-sort", params={"array": [], "balance": "none"}, choices={"balance": TREE_BALANCING})
+@traced
+def generate_tree_sort_steps(t: ArrayTracer, balance: str) -> Dict[str, int]:
+    a = t.array
+    n = len(a)
+
+    # The tree reports rotations as it rebalances; they are shown after it returns
+    rotation_steps = []
+
+    def event(id, nodes, description):
+        rotation_steps.append(t.mark(nodes, id, description))
+
+    tree = _TreePool(balance, n, event)
+    yield t.step("init", "Starting Tree Sort (Python)")
+
+    name = {"none": "BST", "avl": "AVL tree", "red-black": "red-black tree"}[balance]
+    for i, item in enumerate(list(a)):
+        node, path = tree.attach(item)
+        yield t.mark((i,), f"insert-node-{item}", f"Inserted {item} into {name}")
+        tree.rebalance(node, path)
+        yield from rotation_steps
+        rotation_steps.clear()
+
+    # The traversal output fills the array from the left
+    keys = tree.keys
+    t.load([0] * n)
+    for position, node in enumerate(tree.inorder()):
+        t.write(position, keys[node])
+        yield t.step("inorder-traversal", f"Inorder Traversal: {keys[node]}")
+
+    yield t.step("complete", "✅ Tree Sort Complete (Python)", {"finished": True})
+    return tree.operations()
+
+# Trace-free implementations for mode=result: same algorithms, no steps
+
+@register_result("bubble-sort")
+def bubble_sort_result(arr: List[int]):
     current_arr = list(arr)
     n = len(current_arr)
-    RUN = 32
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Tim Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
-    def insertion_sort_run(left, right):
-        for i in range(left + 1, right + 1):
-            temp = current_arr[i]
-            j = i - 1
-            while j >= left and current_arr[j] > temp:
-                current_arr[j + 1] = current_arr[j]
-                j -= 1
-            current_arr[j + 1] = temp
-            
-            steps.append(AlgorithmStep(
-                id=f"run-sort-{left}-{right}",
-                description=f"Sorting run from {left} to {right}",
-                highlightedIndices=list(range(left, right+1)),
-                data={"array": list(current_arr)}
-            ))
-
-    def merge_runs(l, m, r):
-        len1, len2 = m - l + 1, r - m
-        left = [0] * len1
-        right = [0] * len2
-        for x in range(len1): left[x] = current_arr[l + x]
-        for x in range(len2): right[x] = current_arr[m + 1 + x]
-        
-        i, j, k = 0, 0, l
-        
-        while i < len1 and j < len2:
-            if left[i] <= right[j]:
-                current_arr[k] = left[i]
+    comparisons = swaps = 0
+    for i in range(n):
+        for j in range(0, n - i - 1):
+            comparisons += 1
+            if current_arr[j] > current_arr[j+1]:
+                current_arr[j], current_arr[j+1] = current_arr[j+1], current_arr[j]
+                swaps += 1
+    return {"array": current_arr}, {"comparisons": comparisons, "swaps": swaps}
+
+@register_result("quick-sort")
+def quick_sort_result(arr: List[int], pivot: str = "last", partition: str = "two-way", seed: int = 0):
+    current_arr = list(arr)
+    rng = _quick_sort_rng(pivot, partition, seed)
+    comparisons = swaps = 0
+
+    def less(i, j):
+        nonlocal comparisons
+        comparisons += 1
+        return current_arr[i] < current_arr[j]
+
+    def partition_two_way(low, high):
+        nonlocal comparisons, swaps
+        p = _choose_pivot(pivot, less, rng, low, high)
+        if p != high:
+            current_arr[p], current_arr[high] = current_arr[high], current_arr[p]
+            swaps += 1
+        pivot_value = current_arr[high]
+        i = low - 1
+        for j in range(low, high):
+            comparisons += 1
+            if current_arr[j] < pivot_value:
+                i += 1
+                current_arr[i], current_arr[j] = current_arr[j], current_arr[i]
+                swaps += 1
+        current_arr[i + 1], current_arr[high] = current_arr[high], current_arr[i + 1]
+        swaps += 1
+        return i, i + 2
+
+    def partition_three_way(low, high):
+        nonlocal comparisons, swaps
+        pivot_value = current_arr[_choose_pivot(pivot, less, rng, low, high)]
+        lt, i, gt = low, low, high
+        while i <= gt:
+            comparisons += 1
+            if current_arr[i] < pivot_value:
+                if lt != i:
+                    current_arr[lt], current_arr[i] = current_arr[i], current_arr[lt]
+                    swaps += 1
+                lt += 1
                 i += 1
+                continue
+            comparisons += 1
+            if pivot_value < current_arr[i]:
+                if i != gt:
+                    current_arr[i], current_arr[gt] = current_arr[gt], current_arr[i]
+                    swaps += 1
+                gt -= 1
             else:
-                current_arr[k] = right[j]
+                i += 1
+        return lt - 1, gt + 1
+
+    def heap_sort_range(low, high):
+        nonlocal swaps
+
+        def sift_down(root, end):
+            nonlocal comparisons, swaps
+            while True:
+                child = low + 2 * (root - low) + 1
+                if child > end:
+                    return
+                if child + 1 <= end:
+                    comparisons += 1
+                    if current_arr[child] < current_arr[child + 1]:
+                        child += 1
+                comparisons += 1
+                if not current_arr[root] < current_arr[child]:
+                    return
+                current_arr[root], current_arr[child] = current_arr[child], current_arr[root]
+                swaps += 1
+                root = child
+
+        for root in range(low + (high - low + 1) // 2 - 1, low - 1, -1):
+            sift_down(root, high)
+        for end in range(high, low, -1):
+            current_arr[low], current_arr[end] = current_arr[end], current_arr[low]
+            swaps += 1
+            sift_down(low, end - 1)
+
+    partition_range = partition_three_way if partition == "three-way" else partition_two_way
+    depth_limit = _depth_limit(len(current_arr))
+    # Same order as the generator: left side first, so random pivots match
+    ranges = [(0, len(current_arr) - 1, 0)]
+    while ranges:
+        low, high, depth = ranges.pop()
+        if low >= high:
+            continue
+        if depth >= depth_limit:
+            heap_sort_range(low, high)
+            continue
+        left_end, right_start = partition_range(low, high)
+        ranges.append((right_start, high, depth + 1))
+        ranges.append((low, left_end, depth + 1))
+    return {"array": current_arr}, {"comparisons": comparisons, "swaps": swaps}
+
+@register_result("merge-sort")
+def merge_sort_result(arr: List[int], strategy: str = "top-down"):
+    _check_merge_strategy(strategy)
+    if strategy != "top-down":
+        return _bottom_up_merge_sort_result(arr, strategy == "natural")
+    current_arr = list(arr)
+    comparisons = writes = 0
+
+    def merge_sort_recursive(l, r):
+        nonlocal comparisons, writes
+        if l >= r:
+            return
+        m = l + (r - l) // 2
+        merge_sort_recursive(l, m)
+        merge_sort_recursive(m + 1, r)
+        L = current_arr[l:m + 1]
+        R = current_arr[m + 1:r + 1]
+        i = j = 0
+        k = l
+        while i < len(L) and j < len(R):
+            comparisons += 1
+            if L[i] <= R[j]:
+                current_arr[k] = L[i]
+                i += 1
+            else:
+                current_arr[k] = R[j]
                 j += 1
             k += 1
-            
-        while i < len1:
-            current_arr[k] = left[i]
-            k += 1
-            i += 1
-        while j < len2:
-            current_arr[k] = right[j]
-            k += 1
-            j += 1
-            
-        steps.append(AlgorithmStep(
-            id=f"merge-runs-{l}-{r}",
-            description=f"Merged runs from {l} to {r}",
-            highlightedIndices=list(range(l, r+1)),
-            data={"array": list(current_arr)}
-        ))
-
-    for i in range(0, n, RUN):
-        insertion_sort_run(i, min((i + 31), (n - 1)))
-        
-    size = RUN
-    while size < n:
-        for left in range(0, n, 2 * size):
-            mid = left + size - 1
-            right = min((left + 2 * size - 1), (n - 1))
-            if mid < right:
-                merge_runs(left, mid, right)
-        size = 2 * size
-        
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Tim Sort Complete (Python)",
-        data={"array": list(current_arr), "finished": True}
-    ))
-    return steps
-
-def generate_tree_sort_steps(arr: List[int]) -> List[AlgorithmStep]:
-    steps = []
+        rest = L[i:] + R[j:]
+        current_arr[k:r + 1] = rest
+        writes += r - l + 1
+
+    merge_sort_recursive(0, len(current_arr) - 1)
+    return {"array": current_arr}, {"comparisons": comparisons, "writes": writes}
+
+def _bottom_up_merge_sort_result(arr: List[int], natural: bool):
+    src = list(arr)
+    n = len(src)
+    comparisons = writes = 0
+    if natural:
+        comparisons = max(n - 1, 0)
+        bounds = [0] + [i for i in range(1, n) if src[i - 1] > src[i]] + [n]
+    else:
+        bounds = list(range(n + 1))
+    dst = list(src)
+    passes = 0
+    while len(bounds) > 2:
+        merged = [0]
+        for r in range(0, len(bounds) - 1, 2):
+            lo = bounds[r]
+            if r + 2 >= len(bounds):
+                hi = bounds[r + 1]
+                dst[lo:hi] = src[lo:hi]
+                writes += hi - lo
+                merged.append(hi)
+                continue
+            mid, hi = bounds[r + 1], bounds[r + 2]
+            merged.append(hi)
+            writes += hi - lo
+            comparisons += 1
+            if src[mid - 1] <= src[mid]:
+                dst[lo:hi] = src[lo:hi]
+                continue
+            i, j, k = lo, mid, lo
+            while i < mid and j < hi:
+                comparisons += 1
+                if src[i] <= src[j]:
+                    dst[k] = src[i]
+                    i += 1
+                else:
+                    dst[k] = src[j]
+                    j += 1
+                k += 1
+            dst[k:k + mid - i] = src[i:mid]
+            k += mid - i
+            dst[k:hi] = src[j:hi]
+        bounds = merged
+        passes += 1
+        src, dst = dst, src
+    # An odd number of passes leaves the result in the buffer, to be copied back
+    if passes % 2:
+        writes += n
+    return {"array": src}, {"comparisons": comparisons, "writes": writes}
+
+@register_result("selection-sort")
+def selection_sort_result(arr: List[int]):
     current_arr = list(arr)
-    
-    steps.append(AlgorithmStep(
-        id="init",
-        description="Starting Tree Sort (Python)",
-        data={"array": list(current_arr)}
-    ))
-    
-    class Node:
-        def __init__(self, key):
-            self.left = None
-            self.right = None
-            self.val = key
-
-    def insert(root, key, idx):
-        if root is None:
-            steps.append(AlgorithmStep(
-                id=f"insert-node-{key}",
-                description=f"Inserted {key} into BST",
-                highlightedIndices=[idx],
-                data={"array": list(current_arr)}
-            ))
-            return Node(key)
-        else:
-            if root.val < key:
-                root.right = insert(root.right, key, idx)
+    n = len(current_arr)
+    comparisons = swaps = 0
+    for i in range(n):
+        min_idx = i
+        for j in range(i + 1, n):
+            comparisons += 1
+            if current_arr[j] < current_arr[min_idx]:
+                min_idx = j
+        if min_idx != i:
+            current_arr[i], current_arr[min_idx] = current_arr[min_idx], current_arr[i]
+            swaps += 1
+    return {"array": current_arr}, {"comparisons": comparisons, "swaps": swaps}
+
+@register_result("insertion-sort")
+def insertion_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    comparisons = writes = 0
+    for i in range(1, len(current_arr)):
+        key = current_arr[i]
+        j = i - 1
+        while j >= 0:
+            comparisons += 1
+            if current_arr[j] <= key:
+                break
+            current_arr[j + 1] = current_arr[j]
+            writes += 1
+            j -= 1
+        current_arr[j + 1] = key
+        writes += 1
+    return {"array": current_arr}, {"comparisons": comparisons, "writes": writes}
+
+@register_result("heap-sort")
+def heap_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    n = len(current_arr)
+    comparisons = swaps = 0
+
+    def heapify(n, i):
+        nonlocal comparisons, swaps
+        while True:
+            largest = i
+            l = 2 * i + 1
+            r = 2 * i + 2
+            if l < n:
+                comparisons += 1
+                if current_arr[l] > current_arr[largest]:
+                    largest = l
+            if r < n:
+                comparisons += 1
+                if current_arr[r] > current_arr[largest]:
+                    largest = r
+            if largest == i:
+                return
+            current_arr[i], current_arr[largest] = current_arr[largest], current_arr[i]
+            swaps += 1
+            i = largest
+
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(n, i)
+    for i in range(n - 1, 0, -1):
+        current_arr[i], current_arr[0] = current_arr[0], current_arr[i]
+        swaps += 1
+        heapify(i, 0)
+    return {"array": current_arr}, {"comparisons": comparisons, "swaps": swaps}
+
+@register_result("counting-sort")
+def counting_sort_result(arr: List[int]):
+    if not arr:
+        return {"array": []}, {"counts": 0, "slots": 0, "writes": 0}
+    output = []
+    if _dense_counting(arr):
+        low = min(arr)
+        count = [0] * (max(arr) - low + 1)
+        for x in arr:
+            count[x - low] += 1
+        for slot, occurrences in enumerate(count):
+            output.extend([low + slot] * occurrences)
+        slots = len(count)
+    else:
+        counts = {}
+        for x in arr:
+            counts[x] = counts.get(x, 0) + 1
+        for value in sorted(counts):
+            output.extend([value] * counts[value])
+        slots = len(counts)
+    return {"array": output}, {"counts": len(arr), "slots": slots, "writes": len(arr)}
+
+@register_result("shell-sort")
+def shell_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    n = len(current_arr)
+    gap = n // 2
+    comparisons = writes = 0
+    while gap > 0:
+        for i in range(gap, n):
+            temp = current_arr[i]
+            j = i
+            while j >= gap:
+                comparisons += 1
+                if current_arr[j - gap] <= temp:
+                    break
+                current_arr[j] = current_arr[j - gap]
+                writes += 1
+                j -= gap
+            current_arr[j] = temp
+            writes += 1
+        gap //= 2
+    return {"array": current_arr}, {"comparisons": comparisons, "writes": writes}
+
+@register_result("radix-sort")
+def radix_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    if not current_arr:
+        return {"array": []}, {"passes": 0, "writes": 0}
+    max_val = max(current_arr)
+    exp = 1
+    passes = 0
+    while max_val // exp > 0:
+        buckets = [[] for _ in range(10)]
+        for x in current_arr:
+            buckets[(x // exp) % 10].append(x)
+        current_arr = [x for bucket in buckets for x in bucket]
+        passes += 1
+        exp *= 10
+    return {"array": current_arr}, {"passes": passes, "writes": passes * len(current_arr)}
+
+@register_result("bucket-sort")
+def bucket_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    if not current_arr:
+        return {"array": []}, {"writes": 0}
+    n = len(current_arr)
+    min_val = min(current_arr)
+    range_val = max(current_arr) - min_val
+    bucket_count = n if range_val else 1
+    buckets = [[] for _ in range(bucket_count)]
+    for x in current_arr:
+        idx = int((x - min_val) / range_val * (bucket_count - 1)) if range_val else 0
+        buckets[idx].append(x)
+    current_arr = [x for bucket in buckets for x in sorted(bucket)]
+    return {"array": current_arr}, {"writes": 2 * n}
+
+@register_result("comb-sort")
+def comb_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    n = len(current_arr)
+    gap = n
+    sorted_flag = False
+    comparisons = swaps = 0
+    while not sorted_flag:
+        gap = int(gap / 1.3)
+        if gap <= 1:
+            gap = 1
+            sorted_flag = True
+        for i in range(n - gap):
+            comparisons += 1
+            if current_arr[i] > current_arr[i + gap]:
+                current_arr[i], current_arr[i + gap] = current_arr[i + gap], current_arr[i]
+                sorted_flag = False
+                swaps += 1
+    return {"array": current_arr}, {"comparisons": comparisons, "swaps": swaps}
+
+@register_result("cycle-sort")
+def cycle_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    n = len(current_arr)
+    comparisons = writes = 0
+    for cycle_start in range(0, n - 1):
+        item = current_arr[cycle_start]
+        first = True
+        pos = None
+        while pos != cycle_start:
+            pos = cycle_start
+            for i in range(cycle_start + 1, n):
+                comparisons += 1
+                if current_arr[i] < item:
+                    pos += 1
+            if first and pos == cycle_start:
+                break
+            first = False
+            while item == current_arr[pos]:
+                pos += 1
+            current_arr[pos], item = item, current_arr[pos]
+            writes += 1
+    return {"array": current_arr}, {"comparisons": comparisons, "writes": writes}
+
+@register_result("odd-even-sort")
+def odd_even_sort_result(arr: List[int]):
+    current_arr = list(arr)
+    n = len(current_arr)
+    is_sorted = False
+    comparisons = swaps = 0
+    while not is_sorted:
+        is_sorted = True
+        for start in (1, 0):
+            for i in range(start, n - 1, 2):
+                comparisons += 1
+                if current_arr[i] > current_arr[i+1]:
+                    current_arr[i], current_arr[i+1] = current_arr[i+1], current_arr[i]
+                    is_sorted = False
+                    swaps += 1
+    return {"array": current_arr}, {"comparisons": comparisons, "swaps": swaps}
+
+@register_result("tim-sort")
+def tim_sort_result(arr: List[int]):
+    a = list(arr)
+    n = len(a)
+    comparisons = writes = 0
+    min_gallop = MIN_GALLOP
+    runs: List[List[int]] = []
+
+    def count_run(lo):
+        nonlocal comparisons, writes
+        hi = lo + 1
+        if hi == n:
+            return 1
+        comparisons += 1
+        descending = a[hi] < a[lo]
+        hi += 1
+        while hi < n:
+            comparisons += 1
+            if (a[hi] < a[hi - 1]) != descending:
+                break
+            hi += 1
+        if descending:
+            a[lo:hi] = a[lo:hi][::-1]
+            writes += (hi - lo) // 2 * 2
+        return hi - lo
+
+    def merge_lo(base_a, len_a, base_b, len_b):
+        nonlocal comparisons, writes, min_gallop
+        tmp = a[base_a:base_a + len_a]
+        i, j, k = 0, base_b, base_a
+        end_b = base_b + len_b
+        while i < len_a and j < end_b:
+            count_a = count_b = 0
+            while i < len_a and j < end_b:
+                comparisons += 1
+                if a[j] < tmp[i]:
+                    a[k] = a[j]
+                    j += 1
+                    count_b += 1
+                    count_a = 0
+                else:
+                    a[k] = tmp[i]
+                    i += 1
+                    count_a += 1
+                    count_b = 0
+                k += 1
+                writes += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
+            else:
+                break
+            while i < len_a and j < end_b:
+                pos, c = _gallop(a[j], tmp, i, len_a, right=True, from_end=False)
+                comparisons += c
+                count_a = pos - i
+                a[k:k + count_a] = tmp[i:pos]
+                i, k = pos, k + count_a
+                writes += count_a
+                if i == len_a:
+                    break
+                a[k] = a[j]
+                j, k = j + 1, k + 1
+                writes += 1
+                if j == end_b:
+                    break
+                pos, c = _gallop(tmp[i], a, j, end_b, right=False, from_end=False)
+                comparisons += c
+                count_b = pos - j
+                a[k:k + count_b] = a[j:pos]
+                j, k = pos, k + count_b
+                writes += count_b
+                if j == end_b:
+                    break
+                a[k] = tmp[i]
+                i, k = i + 1, k + 1
+                writes += 1
+                min_gallop = max(1, min_gallop - 1)
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    break
+            min_gallop += 2
+        a[k:k + len_a - i] = tmp[i:]
+        writes += len_a - i
+
+    def merge_hi(base_a, len_a, base_b, len_b):
+        nonlocal comparisons, writes, min_gallop
+        tmp = a[base_b:base_b + len_b]
+        i, j, k = base_a + len_a - 1, len_b - 1, base_b + len_b - 1
+        while i >= base_a and j >= 0:
+            count_a = count_b = 0
+            while i >= base_a and j >= 0:
+                comparisons += 1
+                if tmp[j] < a[i]:
+                    a[k] = a[i]
+                    i -= 1
+                    count_a += 1
+                    count_b = 0
+                else:
+                    a[k] = tmp[j]
+                    j -= 1
+                    count_b += 1
+                    count_a = 0
+                k -= 1
+                writes += 1
+                if count_a >= min_gallop or count_b >= min_gallop:
+                    break
             else:
-                root.left = insert(root.left, key, idx)
-        return root
-
-    def inorder(root, res):
-        if root:
-            inorder(root.left, res)
-            res.append(root.val)
-            steps.append(AlgorithmStep(
-                id=f"inorder-traversal",
-                description=f"Inorder Traversal: {root.val}",
-                data={"array": list(res) + [0]*(len(current_arr)-len(res))}
-            ))
-            inorder(root.right, res)
-
-    root = None
-    for i, item in enumerate(current_arr):
-        root = insert(root, item, i)
-        
-    sorted_res = []
-    inorder(root, sorted_res)
-    
-    steps.append(AlgorithmStep(
-        id="complete",
-        description="✅ Tree Sort Complete (Python)",
-        data={"array": list(sorted_res), "finished": True}
-    ))
-    return steps
+                break
+            while i >= base_a and j >= 0:
+                pos, c = _gallop(tmp[j], a, base_a, i + 1, right=True, from_end=True)
+                comparisons += c
+                count_a = i + 1 - pos
+                a[k - count_a + 1:k + 1] = a[pos:i + 1]
+                i, k = pos - 1, k - count_a
+                writes += count_a
+                if i < base_a:
+                    break
+                a[k] = tmp[j]
+                j, k = j - 1, k - 1
+                writes += 1
+                if j < 0:
+                    break
+                pos, c = _gallop(a[i], tmp, 0, j + 1, right=False, from_end=True)
+                comparisons += c
+                count_b = j + 1 - pos
+                a[k - count_b + 1:k + 1] = tmp[pos:j + 1]
+                j, k = pos - 1, k - count_b
+                writes += count_b
+                if j < 0:
+                    break
+                a[k] = a[i]
+                i, k = i - 1, k - 1
+                writes += 1
+                min_gallop = max(1, min_gallop - 1)
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    break
+            min_gallop += 2
+        a[base_a:base_a + j + 1] = tmp[:j + 1]
+        writes += j + 1
+
+    def merge_at(index):
+        nonlocal comparisons
+        base_a, len_a = runs[index]
+        base_b, len_b = runs[index + 1]
+        end = base_b + len_b
+        runs[index][1] = len_a + len_b
+        del runs[index + 1]
+        pos, c = _gallop(a[base_b], a, base_a, base_b, right=True, from_end=False)
+        comparisons += c
+        len_a -= pos - base_a
+        base_a = pos
+        if len_a:
+            pos, c = _gallop(a[base_b - 1], a, base_b, end, right=False, from_end=True)
+            comparisons += c
+            len_b = pos - base_b
+        if not len_a or not len_b:
+            return
+        if len_a <= len_b:
+            merge_lo(base_a, len_a, base_b, len_b)
+        else:
+            merge_hi(base_a, len_a, base_b, len_b)
+
+    def collapse(force):
+        index = _collapse_index([length for _, length in runs], force)
+        while index is not None:
+            merge_at(index)
+            index = _collapse_index([length for _, length in runs], force)
+
+    minrun = _min_run(n)
+    lo = 0
+    while lo < n:
+        length = count_run(lo)
+        if length < minrun:
+            hi = lo + min(minrun, n - lo)
+            for i in range(lo + length, hi):
+                pivot = a[i]
+                pos, c = _bisect(pivot, a, lo, i, right=True)
+                comparisons += c
+                a[pos + 1:i + 1] = a[pos:i]
+                a[pos] = pivot
+                writes += i - pos + 1
+            length = hi - lo
+        runs.append([lo, length])
+        collapse(False)
+        lo += length
+    collapse(True)
+    return {"array": a}, {"comparisons": comparisons, "writes": writes}
+
+@register_result("tree-sort")
+def tree_sort_result(arr: List[int], balance: str = "none"):
+    tree = _TreePool(balance, len(arr))
+    for item in arr:
+        tree.insert(item)
+    keys = tree.keys
+    return {"array": [keys[node] for node in tree.inorder()]}, tree.operations()
+
+
+# Cost models for admission control: (steps, bytes per step, operations).
+# Every step carries a copy of the array. Sorts that only ever swap or
+# shift neighbours make one move per inversion, which is counted exactly:
+# how far apart the out-of-order pairs are matters, not just how many
+# neighbours are out of order.
+
+@register_cost("bubble-sort")
+def bubble_sort_cost(arr: List[int]):
+    n = len(arr)
+    steps = n * n / 2 + inversions(arr)
+    return steps + 2, json_size(arr), steps
+
+@register_cost("quick-sort")
+def quick_sort_cost(arr: List[int], pivot: str = "last", partition: str = "two-way", seed: int = 0):
+    # A last-element pivot on ordered input partitions down to the depth
+    # limit and heap sorts the rest
+    n = len(arr)
+    steps = (4.5 if pivot == "last" and presorted(arr) else 2) * n * log2(n)
+    return steps, json_size(arr), steps
+
+@register_cost("merge-sort")
+def merge_sort_cost(arr: List[int], strategy: str = "top-down"):
+    # Natural merge sort makes one pass per doubling of the runs it finds
+    n = len(arr)
+    if strategy == "natural":
+        steps = n + 2 * n * math.log2(1 + disorder(arr) * n)
+    else:
+        steps = 2 * n * log2(n)
+    return steps, json_size(arr), steps
+
+@register_cost("selection-sort")
+def selection_sort_cost(arr: List[int]):
+    n = len(arr)
+    return 0.6 * n * n + 2, json_size(arr), 0.5 * n * n
+
+@register_cost("insertion-sort")
+def insertion_sort_cost(arr: List[int]):
+    moves = inversions(arr)
+    return 2 * len(arr) + 2 * moves, json_size(arr), 2 * len(arr) + 2 * moves
+
+@register_cost("heap-sort")
+def heap_sort_cost(arr: List[int]):
+    n = len(arr)
+    return 2.6 * n * log2(n), json_size(arr), 2.6 * n * log2(n)
+
+@register_cost("counting-sort")
+def counting_sort_cost(arr: List[int]):
+    # A step per element counted and placed and per distinct value; a
+    # sparse table sorts its distinct values instead of scanning the range
+    n = len(arr)
+    distinct = len(set(arr))
+    if not arr:
+        slots_work = 0
+    elif _dense_counting(arr):
+        slots_work = max(arr) - min(arr) + 1
+    else:
+        slots_work = distinct * log2(distinct)
+    return 2 * n + distinct + 3, json_size(arr), 2 * n + slots_work
+
+@register_cost("shell-sort")
+def shell_sort_cost(arr: List[int]):
+    n = len(arr)
+    return 3.5 * n * log2(n), json_size(arr), 3.5 * n * log2(n)
+
+@register_cost("radix-sort")
+def radix_sort_cost(arr: List[int]):
+    n = len(arr)
+    digits = len(str(max(arr))) if arr else 0
+    return digits * n + 3, json_size(arr), digits * n
+
+@register_cost("bucket-sort")
+def bucket_sort_cost(arr: List[int]):
+    n = len(arr)
+    return 2 * n + 2, 1.8 * json_size(arr), n * log2(n)
+
+@register_cost("comb-sort")
+def comb_sort_cost(arr: List[int]):
+    n = len(arr)
+    return 2.7 * n * log2(n), json_size(arr), 2.7 * n * log2(n)
+
+@register_cost("cycle-sort")
+def cycle_sort_cost(arr: List[int]):
+    n = len(arr)
+    return 2 * n + 1, json_size(arr), n * n
+
+@register_cost("odd-even-sort")
+def odd_even_sort_cost(arr: List[int]):
+    # A round (odd and even phase) compares every neighbour pair once and
+    # moves an element up to two places; elements moving left also get
+    # held up behind each other, which the inversions per element reflect
+    n = len(arr)
+    moves = inversions(arr)
+    order = sorted(range(n), key=arr.__getitem__)
+    displacement = max((abs(i - position) for position, i in enumerate(order)), default=0)
+    rounds = min(n / 2, max(displacement / 2, 2 * moves / n if n else 0)) + 1
+    steps = rounds * max(n - 1, 1) + moves
+    return steps + 1, json_size(arr), steps
+
+@register_cost("tim-sort")
+def tim_sort_cost(arr: List[int]):
+    # Runs found in the input (descending ones too) are neither insertion
+    # sorted nor merged element by element; a merge pass per doubling of them
+    n = len(arr)
+    d = min(disorder(arr), 1 - disorder(arr))
+    unordered = min(1.0, 2 * d)
+    steps = unordered * n + n / 8 + 3
+    return steps, json_size(arr), 2 * n * (1 + math.log2(1 + d * n)) + unordered * n * log2(n)
+
+@register_cost("tree-sort")
+def tree_sort_cost(arr: List[int], balance: str = "none"):
+    # An unbalanced BST degenerates into a list on ordered input; a
+    # balanced one stays shallow but shows its rotations and recolorings
+    n = len(arr)
+    if balance != "none":
+        return 4 * n + 2, json_size(arr), 1.5 * n * log2(n)
+    # Ascending and descending input alike, and every monotone run of a
+    # rotated or organ-pipe array, hangs off the tree as a chain
+    pairs = n * (n - 1) / 2
+    skew = abs(1 - 2 * inversions(arr) / pairs) if pairs else 0.0
+    operations = max(1.3 * n * log2(n), skew * n * n / 2, _monotone_chains(arr))
+    return 2 * n + 2, json_size(arr), operations
+
+
+def _monotone_chains(arr: List[int]) -> float:
+    """Comparisons to insert each maximal monotone run of ``arr`` as a chain."""
+    if len(arr) < 2:
+        return 0.0
+    total, run, direction = 0.0, 1, 0
+    for a, b in zip(arr, arr[1:]):
+        step = (b > a) - (b < a)
+        if direction == 0 or step in (0, direction):
+            direction = direction or step
+            run += 1
+        else:
+            total += run * run / 2
+            run, direction = 2, step
+    return total + run * run / 2
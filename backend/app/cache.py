@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def canonical_params(params: Dict[str, Any]) -> Dict[str, str]:
+    """Canonical JSON of each top-level param, so shared inputs are encoded once."""
+    return {name: canonical_json(value) for name, value in params.items()}
+
+
+def request_key(algo_type: str, params: Dict[str, str], options: Dict[str, Any]) -> str:
+    """Hash of a request; ``params`` holds the fragments from canonical_params."""
+    body = ",".join(f"{json.dumps(name, ensure_ascii=False)}:{params[name]}" for name in sorted(params))
+    payload = f"{algo_type}\n{{{body}}}\n{canonical_json(options)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def code_version() -> str:
+    """Hash of every Python source under app/."""
+    digest = hashlib.sha256()
+    for root, dirs, files in sorted(os.walk(_APP_DIR)):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, _APP_DIR).encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def etag(key: str, version: str) -> str:
+    """Strong ETag of the response to a request_key under a code_version.
+
+    Responses are deterministic in the request, so the tag is known before
+    anything is computed.
+    """
+    return f'"{version}-{key[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    """Whether an If-None-Match header names ``tag`` (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == tag:
+            return True
+    return False
+
+
+class ResultCache:
+    """LRU cache of serialized responses bounded by total payload bytes.
+
+    Each body is stored with its metadata dict, which is small and not
+    counted against the budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, body: bytes, meta: Dict[str, Any]):
+        if len(body) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = (body, meta)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
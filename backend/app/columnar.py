@@ -0,0 +1,166 @@
+"""Packed columnar trace layout (MessagePack map, version 1).
+
+    version      int
+    count        number of steps, n
+    id           [str] * n
+    description  [str] * n
+    currentIndex {"present": bin(n), "values": int32 bin(n)}
+    comparedIndices, highlightedIndices, array
+                 {"present": bin(n), "offsets": int32 bin(n + 1), "values": int32 bin}
+    data         [map] * n, each step's data minus a packed "array"
+
+Typed columns are little-endian byte strings. present[i] is 1 when step i
+has the field; a list column's values for step i are
+values[offsets[i]:offsets[i + 1]]. ``array`` holds data["array"] when it is
+a list of int32 values and is otherwise left inside ``data``.
+
+Integers beyond MessagePack's 64-bit range (e.g. big products) are
+encoded as ext type 1 holding their decimal digits in ASCII. Otherwise
+``data`` decodes to what the JSON response has: non-finite floats are
+null and map keys strings.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .serialization import json_compatible
+from .steps import Step
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for Accept: application/x-msgpack
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+COLUMNAR_VERSION = 1
+BIG_INT_EXT = 1
+
+_INT_ONLY = frozenset([int])
+
+
+def _typed(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _as_int32(value: Any) -> Optional[array]:
+    # Type check first: array("i") would silently accept bools
+    if not isinstance(value, list) or not _INT_ONLY.issuperset(map(type, value)):
+        return None
+    try:
+        return array("i", value)
+    except OverflowError:
+        return None
+
+
+class _ListColumn:
+    def __init__(self):
+        self.present = bytearray()
+        self.offsets = array("i", [0])
+        self.values = array("i")
+
+    def append(self, items: Optional[Sequence[int]]):
+        self.present.append(items is not None)
+        if items is not None:
+            self.values.extend(items)
+        self.offsets.append(len(self.values))
+
+    def pack(self) -> Dict[str, bytes]:
+        return {"present": bytes(self.present), "offsets": _typed(self.offsets), "values": _typed(self.values)}
+
+
+def pack_columns(steps: Iterable[Step]) -> Dict[str, Any]:
+    ids = []
+    descriptions = []
+    current_present = bytearray()
+    current_values = array("i")
+    compared = _ListColumn()
+    highlighted = _ListColumn()
+    arrays = _ListColumn()
+    data = []
+    for step in steps:
+        ids.append(step.id)
+        descriptions.append(step.description)
+        current_present.append(step.currentIndex is not None)
+        current_values.append(step.currentIndex if step.currentIndex is not None else 0)
+        compared.append(step.comparedIndices)
+        highlighted.append(step.highlightedIndices)
+        packed_array = _as_int32(step.data.get("array"))
+        arrays.append(packed_array)
+        if packed_array is not None:
+            data.append(json_compatible({key: value for key, value in step.data.items() if key != "array"}))
+        else:
+            data.append(json_compatible(step.data))
+    return {
+        "version": COLUMNAR_VERSION,
+        "count": len(ids),
+        "id": ids,
+        "description": descriptions,
+        "currentIndex": {"present": bytes(current_present), "values": _typed(current_values)},
+        "comparedIndices": compared.pack(),
+        "highlightedIndices": highlighted.pack(),
+        "array": arrays.pack(),
+        "data": data,
+    }
+
+
+def _int32s(raw: bytes) -> array:
+    values = array("i")
+    values.frombytes(raw)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _unpack_list_column(column: Dict[str, bytes], offsets: array, values: array, index: int) -> Optional[List[int]]:
+    if not column["present"][index]:
+        return None
+    return values[offsets[index]:offsets[index + 1]].tolist()
+
+
+def unpack_columns(columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Inverse of pack_columns, yielding plain step dicts."""
+    current = columns["currentIndex"]
+    current_values = _int32s(current["values"])
+    lists = {
+        name: (columns[name], _int32s(columns[name]["offsets"]), _int32s(columns[name]["values"]))
+        for name in ("comparedIndices", "highlightedIndices", "array")
+    }
+    steps = []
+    for i in range(columns["count"]):
+        data = dict(columns["data"][i])
+        packed_array = _unpack_list_column(*lists["array"], i)
+        if packed_array is not None:
+            data["array"] = packed_array
+        steps.append({
+            "id": columns["id"][i],
+            "description": columns["description"][i],
+            "currentIndex": current_values[i] if current["present"][i] else None,
+            "comparedIndices": _unpack_list_column(*lists["comparedIndices"], i),
+            "highlightedIndices": _unpack_list_column(*lists["highlightedIndices"], i),
+            "data": data,
+        })
+    return steps
+
+
+def _pack_big_int(value: Any):
+    # Only called for what msgpack cannot pack itself
+    if isinstance(value, int):
+        return msgpack.ExtType(BIG_INT_EXT, str(value).encode("ascii"))
+    raise TypeError(f"Cannot serialize {type(value).__name__} as MessagePack")
+
+
+def _unpack_big_int(code: int, data: bytes):
+    return int(data) if code == BIG_INT_EXT else msgpack.ExtType(code, data)
+
+
+def dump_msgpack(steps: Iterable[Step]) -> bytes:
+    return msgpack.packb(pack_columns(steps), use_bin_type=True, default=_pack_big_int)
+
+
+def load_msgpack(body: bytes) -> List[Dict[str, Any]]:
+    """Inverse of dump_msgpack, yielding plain step dicts."""
+    return unpack_columns(msgpack.unpackb(body, raw=False, ext_hook=_unpack_big_int, strict_map_key=False))
@@ -0,0 +1,49 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+# In-process cache of serialized /generate-steps responses
+CACHE_MAX_BYTES = _env_int("ALGO_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Optional SQLite file of serialized responses shared by every worker process
+DISK_STORE_PATH = os.environ.get("ALGO_DISK_STORE") or None
+DISK_STORE_MAX_BYTES = _env_int("ALGO_DISK_STORE_MAX_BYTES", 1024 * 1024 * 1024)
+
+# Cache-Control max-age of GET /generate-steps responses; clients and CDNs
+# revalidate with If-None-Match after that
+GET_MAX_AGE_SECONDS = _env_int("ALGO_GET_MAX_AGE", 24 * 60 * 60)
+
+# Server-wide ceiling on steps per trace; requests may only lower it
+MAX_STEPS = _env_int("ALGO_MAX_STEPS", 1_000_000)
+
+# Algorithm modules are imported on first use; these (types, module names
+# such as "sorting", or "all") are imported at startup, in every worker too
+WARMUP_ALGORITHMS = [name.strip() for name in os.environ.get("ALGO_WARMUP", "").split(",") if name.strip()]
+
+# Step generation runs in a process pool; 0 workers keeps it in-process
+WORKER_PROCESSES = _env_int("ALGO_WORKERS", os.cpu_count() or 1)
+JOB_TIMEOUT_SECONDS = float(os.environ.get("ALGO_JOB_TIMEOUT", 30))
+MAX_CONCURRENT_JOBS = max(1, _env_int("ALGO_MAX_JOBS", 2 * max(1, WORKER_PROCESSES)))
+
+# Chunks (of up to 64 KiB) a shared /generate-steps stream buffers ahead of its slowest reader
+STREAM_BUFFER_CHUNKS = max(1, _env_int("ALGO_STREAM_BUFFER_CHUNKS", 16))
+
+# Retained traces for /traces paging: compressed segments of N steps each
+TRACE_CHECKPOINT_INTERVAL = _env_int("ALGO_TRACE_CHECKPOINT_INTERVAL", 1000)
+TRACE_MAX_BYTES = _env_int("ALGO_TRACE_MAX_BYTES", 128 * 1024 * 1024)
+TRACE_MAX_TRACES = _env_int("ALGO_TRACE_MAX_TRACES", 1000)
+
+# Per-process metric snapshots merged by /metrics; set when running several workers
+METRICS_DIR = os.environ.get("ALGO_METRICS_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.environ.get("ALGO_METRICS_FLUSH_SECONDS", 1))
+
+# Admission control on pre-flight cost estimates (app/cost.py); 0 disables a limit.
+# Over a hard budget a request is refused (422 for CPU, 413 for bytes); over the
+# low-priority threshold it waits for one of a few low-priority job slots first.
+BUDGET_CPU_MS = float(os.environ.get("ALGO_BUDGET_CPU_MS", 20_000))
+BUDGET_BYTES = _env_int("ALGO_BUDGET_BYTES", 512 * 1024 * 1024)
+LOW_PRIORITY_CPU_MS = float(os.environ.get("ALGO_LOW_PRIORITY_CPU_MS", 1_000))
+LOW_PRIORITY_JOBS = max(1, _env_int("ALGO_LOW_PRIORITY_JOBS", 1))
@@ -0,0 +1,111 @@
+"""Pre-flight cost estimates for admission control.
+
+Every algorithm module registers a cost model (registry.register_cost)
+giving the expected steps, bytes per step and primitive operations of a
+request from its params alone. ``estimate`` turns those into response
+bytes and CPU time with per-unit costs calibrated from benchmarks/run.py
+and render_steps timings; estimates only need to be right within a small
+factor to tell cheap requests from expensive ones.
+"""
+
+import math
+from bisect import bisect_right
+from itertools import repeat
+from typing import Any, Dict, NamedTuple, Optional
+
+# id, description and index fields of a serialized step
+STEP_OVERHEAD_BYTES = 160
+
+# CPU cost per unit, in nanoseconds (least-squares fit over the benchmark cases)
+_NS_PER_STEP = 2500.0          # building one step in the generator
+_NS_PER_STEP_BYTE = 1.0        # copying the state a step carries
+_NS_PER_DROPPED_STEP = 2000.0  # recording a traced step the sampler does not build
+_NS_PER_OPERATION = 100.0      # one comparison, write, relaxation, ...
+_NS_PER_OUTPUT_BYTE = 5.0      # sampling, encoding and dumping emitted steps
+
+# For models of generators that build steps they never emit
+OPERATIONS_PER_STEP = _NS_PER_STEP / _NS_PER_OPERATION
+
+
+class Estimate(NamedTuple):
+    steps: int
+    bytes: int
+    cpu_ms: float
+
+    def header(self) -> str:
+        return f"steps={self.steps}; bytes={self.bytes}; cpu-ms={self.cpu_ms:g}"
+
+
+def json_size(value: Any) -> int:
+    """Approximate length of ``value`` as JSON; str() is close for numbers, strings and nested lists."""
+    return len(str(value))
+
+
+def log2(n: float) -> float:
+    return math.log2(max(n, 2))
+
+
+def disorder(values) -> float:
+    """Share of adjacent pairs that are out of order: 0 sorted, about 0.5 random, 1 reversed."""
+    if len(values) < 2:
+        return 0.0
+    return sum(1 for a, b in zip(values, values[1:]) if a > b) / (len(values) - 1)
+
+
+def inversions(values) -> int:
+    """Number of pairs i < j with values[i] > values[j]: 0 sorted, n(n-1)/2 reversed.
+
+    A merge sort over the ascending runs of ``values``: each merge counts,
+    for every element of the right run, the elements of the left run above it.
+    """
+    runs = []
+    start = 0
+    for i in range(1, len(values)):
+        if values[i] < values[i - 1]:
+            runs.append(values[start:i])
+            start = i
+    if values:
+        runs.append(values[start:])
+    count = 0
+    while len(runs) > 1:
+        merged = []
+        for k in range(0, len(runs) - 1, 2):
+            left, right = runs[k], runs[k + 1]
+            count += len(left) * len(right) - sum(map(bisect_right, repeat(left), right))
+            # Two ascending runs: sorted() merges them in linear time
+            merged.append(sorted(left + right))
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return count
+
+
+def presorted(values) -> bool:
+    """Whether ``values`` is (almost) entirely ascending or descending."""
+    return not 0.1 < disorder(values) < 0.9
+
+
+def estimate(spec, params: Dict[str, Any], options: Dict[str, Any]) -> Optional[Estimate]:
+    """Cost of serving ``params`` with ``options``, or None when it cannot be estimated.
+
+    Models that trip over malformed params return None too: the request
+    then fails in the generator with its usual error.
+    """
+    try:
+        model = spec.cost(params)
+    except Exception:
+        return None
+    if model is None:
+        return None
+    steps, step_bytes, operations = model
+    step_bytes += STEP_OVERHEAD_BYTES
+    generate_ns = operations * _NS_PER_OPERATION
+    if options.get("mode") == "result":
+        emitted_bytes = step_bytes
+    else:
+        built = min(steps, options["max_steps"]) if spec.traced else steps
+        generate_ns += built * (_NS_PER_STEP + step_bytes * _NS_PER_STEP_BYTE)
+        generate_ns += (steps - built) * _NS_PER_DROPPED_STEP
+        emitted_bytes = min(steps, options["max_steps"]) * step_bytes
+    cpu_ms = (generate_ns + emitted_bytes * _NS_PER_OUTPUT_BYTE) / 1e6
+    return Estimate(int(steps), int(emitted_bytes), round(cpu_ms, 3))
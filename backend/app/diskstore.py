@@ -0,0 +1,133 @@
+"""Serialized responses in an SQLite file shared by every server process.
+
+The in-memory ResultCache is per process; with several uvicorn workers
+each would compute the same popular traces. This store sits behind it:
+whichever worker computes a response first writes it here, and the
+others read it back instead of recomputing.
+
+Concurrency is left to SQLite: WAL mode lets readers run alongside the
+single writer, writers wait on a busy timeout instead of failing, and
+eviction runs inside the inserting transaction so two processes never
+evict at once. Reads go through a memory map of the database file, so
+every worker reads the same page-cache pages without read() calls; the
+sqlite3 module still hands each body back as a bytes object.
+
+Keys are request hashes salted with a fingerprint of the app sources, so
+a deploy that changes an algorithm never serves traces from the old
+code; old entries age out under the size budget.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .cache import code_version
+
+# Reads refresh an entry's LRU position at most this often, to keep
+# popular entries from turning every read into a write
+_TOUCH_INTERVAL_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    meta TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class DiskStore:
+    def __init__(self, path: str, max_bytes: int, version: Optional[str] = None, mmap_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version if version is not None else code_version()
+        self.mmap_bytes = mmap_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # sqlite3 connections must stay on their thread; the threadpool has several
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        with connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            self._local.connection = connection
+        return connection
+
+    def _key(self, key: str) -> str:
+        return f"{self.version}:{key}"
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT body, meta, accessed FROM responses WHERE key = ?", (self._key(key),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        body, meta, accessed = row
+        now = time.time()
+        if now - accessed > _TOUCH_INTERVAL_SECONDS:
+            connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, self._key(key)))
+        self.hits += 1
+        return body, json.loads(meta)
+
+    def put(self, key: str, body: bytes, meta: Dict[str, Any]):
+        if len(body) > self.max_bytes:
+            return
+        connection = self._connection()
+        # IMMEDIATE takes the write lock up front, so the size check and the
+        # evictions below see no concurrent insert from another process
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO responses (key, body, meta, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                (self._key(key), body, json.dumps(meta), len(body), time.time()),
+            ).rowcount
+            if inserted:
+                self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection):
+        size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if size <= self.max_bytes:
+            return
+        for key, entry_size in connection.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall():
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            size -= entry_size
+            if size <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        # Entries and bytes cover every process; hits, misses and evictions are this one's
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,40 @@
+from typing import Iterable, Iterator
+
+from .steps import Step
+
+DEFAULT_KEYFRAME_INTERVAL = 50
+
+
+def delta_encode(steps: Iterable[Step], keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> Iterator[Step]:
+    """Replace repeated ``data["array"]`` copies with (index, value) changes.
+
+    Every ``keyframe_interval``-th array-carrying step (and the first one, or
+    any step whose array changes length) keeps its full ``array`` and is a
+    keyframe. The others drop ``array`` and carry ``delta``: a list of
+    ``[index, value]`` pairs that differ from the previous step's array.
+
+    Client reconstruction, walking the steps in order:
+      * ``array`` present -> it is the current array;
+      * ``delta`` present -> copy the last array and assign each pair;
+      * neither           -> the step has no array (graph, DP, ...).
+    """
+    previous = None
+    since_keyframe = 0
+    for step in steps:
+        array = step.data.get("array")
+        if not isinstance(array, list):
+            yield step
+            continue
+
+        if previous is None or since_keyframe >= keyframe_interval or len(array) != len(previous):
+            previous = array
+            since_keyframe = 1
+            yield step
+            continue
+
+        changes = [[i, value] for i, (old, value) in enumerate(zip(previous, array)) if old != value]
+        data = {key: value for key, value in step.data.items() if key != "array"}
+        data["delta"] = changes
+        previous = array
+        since_keyframe += 1
+        yield step.replace(data=data)
@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from .config import WORKER_PROCESSES, JOB_TIMEOUT_SECONDS, MAX_CONCURRENT_JOBS, LOW_PRIORITY_JOBS, WARMUP_ALGORITHMS
+from .jobs import run_until, warm_worker
+from .steps import DeadlineExceeded
+
+_pool: Optional[ProcessPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+_low_priority_slots: Optional[asyncio.Semaphore] = None
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def _job_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+    return _slots
+
+
+def _low_priority_job_slots() -> asyncio.Semaphore:
+    global _low_priority_slots
+    if _low_priority_slots is None:
+        _low_priority_slots = asyncio.Semaphore(LOW_PRIORITY_JOBS)
+    return _low_priority_slots
+
+
+def start():
+    """Create the worker pool and spawn every worker before traffic arrives."""
+    global _pool
+    if WORKER_PROCESSES <= 0:
+        return
+    _pool = ProcessPoolExecutor(
+        max_workers=WORKER_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_worker,
+        initargs=(WARMUP_ALGORITHMS,),
+    )
+    # Submitting one job per worker waits until all of them have spawned
+    for future in [_pool.submit(warm_worker) for _ in range(WORKER_PROCESSES)]:
+        future.result()
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def _consume_exception(future: asyncio.Future):
+    # A job nobody waits for any more may still fail, e.g. with DeadlineExceeded
+    if not future.cancelled():
+        future.exception()
+
+
+def _start(job: Callable, args, deadline: float) -> asyncio.Future:
+    if _pool is None:
+        return asyncio.ensure_future(run_in_threadpool(run_until, deadline, job, *args))
+    return asyncio.get_running_loop().run_in_executor(_pool, run_until, deadline, job, *args)
+
+
+async def _submit(job: Callable, args, deadline: float, low_priority: bool) -> Any:
+    # Expensive jobs queue among themselves first, so they never hold more
+    # than LOW_PRIORITY_JOBS of the shared slots
+    slots = [_low_priority_job_slots(), _job_slots()] if low_priority else [_job_slots()]
+    taken = []
+    try:
+        for slot in slots:
+            await slot.acquire()
+            taken.append(slot)
+        future = _start(job, args, deadline)
+    except BaseException:
+        for slot in taken:
+            slot.release()
+        raise
+    # The slots stay taken until the job itself ends, even when the caller
+    # has timed out: otherwise abandoned jobs would pile up in the workers
+    def release(done: asyncio.Future):
+        for slot in taken:
+            slot.release()
+        _consume_exception(done)
+
+    future.add_done_callback(release)
+    return await asyncio.shield(future)
+
+
+async def run(job: Callable, algo_type: str, *args, low_priority: bool = False) -> Any:
+    """Run a job from app.jobs off the event loop, waiting for a free job slot first.
+
+    The timeout covers the wait for a slot, low-priority ones included. A
+    job that times out keeps its slot until it ends, which is soon: the
+    worker runs it under the same deadline, and step generation gives up
+    with DeadlineExceeded once that passes. Result-mode jobs generate no
+    steps and run to completion.
+    """
+    deadline = time.time() + JOB_TIMEOUT_SECONDS
+    try:
+        return await asyncio.wait_for(_submit(job, (algo_type, *args), deadline, low_priority), JOB_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        raise JobTimeout(f"{algo_type} did not finish within {JOB_TIMEOUT_SECONDS:g}s")
+
@@ -0,0 +1,101 @@
+import time
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .registry import get_algorithm, preload
+from .serialization import dump_meta_line, dump_result, dump_steps, iter_ndjson, step_to_json
+from .steps import Step, Trace, job_deadline
+from .encoding import delta_encode
+from .sampling import limit_steps
+from .columnar import dump_msgpack
+
+
+def warm_worker(warmup: Iterable[str] = ()):
+    """Process pool initializer; defined here rather than in app.executor so workers never import FastAPI.
+
+    Algorithm modules not in ``warmup`` are imported by the first job that needs them.
+    """
+    preload(warmup)
+
+
+def run_until(deadline: float, job, *args):
+    """Run ``job(*args)``, letting step generation raise DeadlineExceeded once ``deadline`` (time.time()) passes.
+
+    Keeps a job the caller has given up on from running to completion in
+    its worker.
+    """
+    token = job_deadline.set(deadline)
+    try:
+        return job(*args)
+    finally:
+        job_deadline.reset(token)
+
+
+def encoded_steps(trace: Trace, options: Dict[str, Any]) -> Iterator[Step]:
+    steps = limit_steps(trace, options["max_steps"])
+    if options["encoding"] == "delta":
+        steps = delta_encode(steps, options["keyframe_interval"])
+    return steps
+
+
+def trace_meta(operations: Dict[str, int], compute_seconds: float, steps: int,
+               serialize_seconds: Optional[float] = None) -> Dict[str, Any]:
+    meta = {"operations": operations, "compute_ms": round(compute_seconds * 1000, 3), "steps": steps}
+    if serialize_seconds is not None:
+        meta["serialize_ms"] = round(serialize_seconds * 1000, 3)
+    return meta
+
+
+def render_steps(algo_type: str, params: Dict[str, Any], options: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+    """Generate and serialize a trace, or only the result for mode=result; runs inside a worker process.
+
+    Returns the body with its metadata (operation counts, compute and
+    serialization time, number of steps emitted).
+    """
+    spec = get_algorithm(algo_type)
+    start = time.perf_counter()
+    if options.get("mode") == "result":
+        state, operations = spec.compute(params)
+        computed = time.perf_counter()
+        body = dump_result(state, operations)
+        return body, trace_meta(operations, computed - start, 0, time.perf_counter() - computed)
+    trace = Trace(spec.call(params))
+    steps = list(encoded_steps(trace, options))
+    body = dump_msgpack(steps) if options.get("format") == "msgpack" else dump_steps(steps)
+    # Everything but the generator itself: sampling, delta encoding and dumping
+    serialize_seconds = time.perf_counter() - start - trace.compute_seconds
+    return body, trace_meta(trace.operations, trace.compute_seconds, len(steps), serialize_seconds)
+
+
+def stream_steps(spec, params: Dict[str, Any], options: Dict[str, Any]) -> Iterator[bytes]:
+    """NDJSON trace followed by one ``{"meta": ...}`` line."""
+    trace = Trace(spec.call(params))
+    count = yield from iter_ndjson(encoded_steps(trace, options))
+    yield dump_meta_line(trace_meta(trace.operations, trace.compute_seconds, count))
+
+
+def trace_segments(algo_type: str, params: Dict[str, Any], max_steps: int, interval: int,
+                   first: int = 0, last: Optional[int] = None) -> Tuple[int, List[bytes]]:
+    """Serialize a trace into zlib-compressed NDJSON segments of ``interval`` steps.
+
+    Steps before segment ``first`` are generated but never serialized, and
+    generation stops after segment ``last``. Returns the number of steps
+    generated along with the segments from ``first`` onwards.
+    """
+    total = 0
+    segments = []
+    lines = []
+    for index, step in enumerate(limit_steps(get_algorithm(algo_type).call(params), max_steps)):
+        segment = index // interval
+        if last is not None and segment > last:
+            break
+        total = index + 1
+        if segment < first:
+            continue
+        lines.append(step_to_json(step))
+        if len(lines) == interval:
+            segments.append(zlib.compress(b"\n".join(lines)))
+            lines = []
+    if lines:
+        segments.append(zlib.compress(b"\n".join(lines)))
+    return total, segments
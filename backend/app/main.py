@@ -1,53 +1,41 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-
-from .models import AlgorithmRequest, AlgorithmStep
-from .algorithms.sorting import (
-    generate_bubble_sort_steps, generate_quick_sort_steps, generate_merge_sort_steps,
-    generate_selection_sort_steps, generate_insertion_sort_steps, generate_heap_sort_steps,
-    generate_counting_sort_steps, generate_radix_sort_steps, generate_shell_sort_steps,
-    generate_bucket_sort_steps, generate_comb_sort_steps, generate_cycle_sort_steps,
-    generate_odd_even_sort_steps, generate_tim_sort_steps, generate_tree_sort_steps
-)
-
-from .algorithms.searching import (
-    generate_binary_search_steps, generate_exponential_search_steps,
-    generate_linear_search_steps, generate_jump_search_steps,
-    generate_interpolation_search_steps, generate_ternary_search_steps,
-    generate_fibonacci_search_steps, generate_hash_search_steps
-)
-
-from .algorithms.greedy import (
-    generate_activity_selection_steps, generate_fractional_knapsack_steps,
-    generate_job_sequencing_steps, generate_huffman_coding_steps,
-    generate_coin_change_greedy_steps, generate_min_platforms_steps,
-    generate_optimal_merge_pattern_steps
-)
+import asyncio
+import json
+from contextlib import asynccontextmanager
 
-from .algorithms.dynamic_programming import (
-    generate_fibonacci_dp_steps, generate_knapsack_01_steps,
-    generate_lcs_steps, generate_unbounded_knapsack_steps,
-    generate_lis_steps, generate_edit_distance_steps,
-    generate_rod_cutting_steps, generate_subset_sum_steps,
-    generate_partition_problem_steps, generate_matrix_chain_multiplication_steps
-)
+from fastapi import FastAPI, Header, HTTPException, Query, WebSocket
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from typing import Dict, List, Literal, Optional
 
-from .algorithms.graph import (
-    generate_bfs_steps, generate_dfs_steps, generate_topological_sort_steps,
-    generate_dijkstra_steps, generate_kruskal_steps, generate_prim_steps,
-    generate_floyd_warshall_steps, generate_bellman_ford_steps
+from .models import AlgorithmRequest, AlgorithmStep, BatchRequest, PlaybackRequest
+from .registry import get_algorithm, list_algorithms, preload
+from .cache import ResultCache, canonical_params, code_version, etag, etag_matches, request_key
+from .config import (
+    BUDGET_BYTES, BUDGET_CPU_MS, CACHE_MAX_BYTES, DISK_STORE_MAX_BYTES, DISK_STORE_PATH, GET_MAX_AGE_SECONDS,
+    LOW_PRIORITY_CPU_MS, MAX_STEPS, METRICS_DIR, METRICS_FLUSH_SECONDS, STREAM_BUFFER_CHUNKS, TRACE_CHECKPOINT_INTERVAL,
+    TRACE_MAX_BYTES, TRACE_MAX_TRACES, WARMUP_ALGORITHMS,
 )
+from .cost import Estimate, estimate
+from .diskstore import DiskStore
+from .jobs import render_steps, stream_steps, trace_segments
+from .traces import TraceInfo, TraceStore, slice_window
+from .columnar import MSGPACK_MEDIA_TYPE, msgpack
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, MetricsRegistry
+from .playback import PlaybackSession, serve as serve_playback
+from .singleflight import SingleFlight, StreamFlight
+from . import executor
 
-from .algorithms.advanced import (
-    generate_n_queens_steps, generate_sudoku_solver_steps,
-    generate_kmp_steps, generate_rabin_karp_steps,
-    generate_karatsuba_steps, generate_closest_pair_steps,
-    generate_fft_steps, generate_convex_hull_steps
-)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    preload(WARMUP_ALGORITHMS)
+    executor.start()
+    yield
+    executor.shutdown()
+    metrics.flush()
 
-app = FastAPI(title="Algorithms Backend", description="Python logic for Algorithm Visualizations")
+app = FastAPI(title="Algorithms Backend", description="Python logic for Algorithm Visualizations", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -56,144 +44,305 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Cache", "X-Operation-Counts", "X-Compute-Time-Ms", "X-Serialize-Time-Ms", "X-Step-Count", "X-Trace-Meta",
+        "X-Cost-Estimate", "ETag",
+    ],
 )
 
+def _algorithm_label(algo_type) -> str:
+    # Only registered types become label values, so arbitrary input cannot grow the series
+    if algo_type is None:
+        return "invalid"
+    return algo_type if isinstance(algo_type, str) and get_algorithm(algo_type) else "unknown"
+
+metrics = MetricsRegistry(METRICS_DIR, METRICS_FLUSH_SECONDS)
+app.add_middleware(MetricsMiddleware, registry=metrics, path="/generate-steps", label_for=_algorithm_label)
+
+# Salts ETags and disk store keys: a deploy that changes any algorithm invalidates both
+CODE_VERSION = code_version()
+result_cache = ResultCache(CACHE_MAX_BYTES)
+disk_store = DiskStore(DISK_STORE_PATH, DISK_STORE_MAX_BYTES, CODE_VERSION) if DISK_STORE_PATH else None
+# Identical concurrent requests share one computation (responses and /traces) or one stream
+flights = SingleFlight()
+stream_flights = StreamFlight(STREAM_BUFFER_CHUNKS)
+trace_store = TraceStore(TRACE_CHECKPOINT_INTERVAL, TRACE_MAX_BYTES, TRACE_MAX_TRACES)
+
+def _step_limit(request) -> int:
+    return min(request.max_steps or MAX_STEPS, MAX_STEPS)
+
+def _output_options(request):
+    if request.mode == "result":
+        # Encoding and step limits do not apply without a trace
+        return {"mode": "result"}
+    options = {"encoding": request.encoding, "max_steps": _step_limit(request)}
+    if request.encoding == "delta":
+        options["keyframe_interval"] = request.keyframe_interval
+    return options
+
+async def _run_job(job, algo_type, *args, low_priority: bool = False):
+    try:
+        return await executor.run(job, algo_type, *args, low_priority=low_priority)
+    except executor.JobTimeout as exc:
+        raise HTTPException(status_code=504, detail=str(exc))
+
+def _cost_headers(cost: Optional[Estimate]):
+    return {"X-Cost-Estimate": cost.header()} if cost is not None else {}
+
+def _admit(algo_type: str, cost: Optional[Estimate]) -> bool:
+    """Refuse a request over the hard budgets; True when it should run at low priority."""
+    if cost is None:
+        return False
+    if BUDGET_BYTES and cost.bytes > BUDGET_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{algo_type} would produce about {cost.bytes} bytes, over the {BUDGET_BYTES} byte budget.",
+            headers=_cost_headers(cost),
+        )
+    if BUDGET_CPU_MS and cost.cpu_ms > BUDGET_CPU_MS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{algo_type} would take about {cost.cpu_ms:g}ms of CPU, over the {BUDGET_CPU_MS:g}ms budget.",
+            headers=_cost_headers(cost),
+        )
+    return bool(LOW_PRIORITY_CPU_MS) and cost.cpu_ms > LOW_PRIORITY_CPU_MS
+
+async def _cached_render(spec, params, key: str, options, cost: Optional[Estimate] = None):
+    cached = result_cache.get(key)
+    # Already paid for: cached responses bypass admission control
+    if cached is not None:
+        return (*cached, "HIT")
+    (body, meta, cache), shared = await flights.do(key, lambda: _render(spec, params, options, cost, key))
+    return body, meta, "COALESCED" if shared else cache
+
+async def _render(spec, params, options, cost: Optional[Estimate], key: str):
+    if disk_store is not None:
+        stored = await run_in_threadpool(disk_store.get, key)
+        if stored is not None:
+            result_cache.put(key, *stored)
+            return (*stored, "DISK")
+    low_priority = _admit(spec.type, cost)
+    body, meta = await _run_job(render_steps, spec.type, params, options, low_priority=low_priority)
+    result_cache.put(key, body, meta)
+    if disk_store is not None:
+        await run_in_threadpool(disk_store.put, key, body, meta)
+    return body, meta, "MISS"
+
+def _meta_headers(meta, cache: str):
+    operations = ", ".join(f"{name}={count}" for name, count in meta["operations"].items())
+    headers = {
+        "X-Cache": cache,
+        "X-Operation-Counts": operations,
+        "X-Compute-Time-Ms": str(meta["compute_ms"]),
+        "X-Step-Count": str(meta["steps"]),
+    }
+    if "serialize_ms" in meta:
+        headers["X-Serialize-Time-Ms"] = str(meta["serialize_ms"])
+    return headers
+
+def _require_algorithm(algo_type: str):
+    spec = get_algorithm(algo_type)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Algorithm {algo_type} implementation not found in Python backend.")
+    return spec
+
+def _check_params(spec, params):
+    # A bad choice would only fail inside the job, or halfway through a stream
+    try:
+        spec.check(params)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
 @app.get("/")
 async def root():
     return {"message": "Algorithms Backend is running", "status": "healthy"}
 
 @app.post("/generate-steps", response_model=List[AlgorithmStep])
-async def generate_steps(request: AlgorithmRequest):
-    algo_type = request.type
-    params = request.params
-    
-    # Sorting
-    if algo_type == 'bubble-sort':
-        return generate_bubble_sort_steps(params.get('array', []))
-    elif algo_type == 'quick-sort':
-        return generate_quick_sort_steps(params.get('array', []))
-    elif algo_type == 'merge-sort':
-        return generate_merge_sort_steps(params.get('array', []))
-    elif algo_type == 'selection-sort':
-        return generate_selection_sort_steps(params.get('array', []))
-    elif algo_type == 'insertion-sort':
-        return generate_insertion_sort_steps(params.get('array', []))
-    elif algo_type == 'heap-sort':
-        return generate_heap_sort_steps(params.get('array', []))
-    elif algo_type == 'counting-sort':
-        return generate_counting_sort_steps(params.get('array', []))
-    elif algo_type == 'radix-sort':
-        return generate_radix_sort_steps(params.get('array', []))
-    elif algo_type == 'shell-sort':
-        return generate_shell_sort_steps(params.get('array', []))
-    elif algo_type == 'bucket-sort':
-        return generate_bucket_sort_steps(params.get('array', []))
-    elif algo_type == 'comb-sort':
-        return generate_comb_sort_steps(params.get('array', []))
-    elif algo_type == 'cycle-sort':
-        return generate_cycle_sort_steps(params.get('array', []))
-    elif algo_type == 'odd-even-sort':
-        return generate_odd_even_sort_steps(params.get('array', []))
-    elif algo_type == 'tim-sort':
-        return generate_tim_sort_steps(params.get('array', []))
-    elif algo_type == 'tree-sort':
-        return generate_tree_sort_steps(params.get('array', []))
-
-        
-    # Searching
-    elif algo_type == 'binary-search':
-        return generate_binary_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'exponential-search':
-        return generate_exponential_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'linear-search':
-        return generate_linear_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'jump-search':
-        return generate_jump_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'interpolation-search':
-        return generate_interpolation_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'ternary-search':
-        return generate_ternary_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'fibonacci-search':
-        return generate_fibonacci_search_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'hash-search':
-        return generate_hash_search_steps(params.get('array', []), params.get('target', 0))
-
-    # Greedy
-    elif algo_type == 'activity-selection':
-        return generate_activity_selection_steps(params.get('startTimes', []), params.get('endTimes', []))
-    elif algo_type == 'fractional-knapsack':
-        return generate_fractional_knapsack_steps(params.get('weights', []), params.get('values', []), params.get('capacity', 0))
-    elif algo_type == 'job-sequencing':
-        return generate_job_sequencing_steps(params.get('ids', []), params.get('deadlines', []), params.get('profits', []))
-    elif algo_type == 'huffman-coding':
-        return generate_huffman_coding_steps(params.get('chars', []), params.get('frequencies', []))
-    elif algo_type == 'coin-change-greedy':
-        return generate_coin_change_greedy_steps(params.get('coins', []), params.get('amount', 0))
-    elif algo_type == 'min-platforms':
-        return generate_min_platforms_steps(params.get('arrivals', []), params.get('departures', []))
-    elif algo_type == 'optimal-merge-pattern':
-        return generate_optimal_merge_pattern_steps(params.get('files', []))
-
-    # Dynamic Programming
-    elif algo_type == 'fibonacci-dp':
-        return generate_fibonacci_dp_steps(params.get('n', 0))
-    elif algo_type == 'knapsack-0-1':
-        return generate_knapsack_01_steps(params.get('weights', []), params.get('values', []), params.get('capacity', 0))
-    elif algo_type == 'lcs':
-        return generate_lcs_steps(params.get('s1', ""), params.get('s2', ""))
-    elif algo_type == 'unbounded-knapsack':
-        return generate_unbounded_knapsack_steps(params.get('weights', []), params.get('values', []), params.get('capacity', 0))
-    elif algo_type == 'lis':
-        return generate_lis_steps(params.get('array', []))
-    elif algo_type == 'edit-distance':
-        return generate_edit_distance_steps(params.get('s1', ""), params.get('s2', ""))
-    elif algo_type == 'rod-cutting':
-        return generate_rod_cutting_steps(params.get('prices', []), params.get('length', 0))
-    elif algo_type == 'subset-sum':
-        return generate_subset_sum_steps(params.get('array', []), params.get('target', 0))
-    elif algo_type == 'partition-problem':
-        return generate_partition_problem_steps(params.get('array', []))
-    elif algo_type == 'matrix-chain-multiplication':
-        return generate_matrix_chain_multiplication_steps(params.get('dimensions', []))
-
-    # Graph
-    elif algo_type == 'bfs':
-        return generate_bfs_steps(params.get('graph', {}), params.get('startNode', 'A'))
-    elif algo_type == 'dfs':
-        return generate_dfs_steps(params.get('graph', {}), params.get('startNode', 'A'))
-    elif algo_type == 'topological-sort':
-        return generate_topological_sort_steps(params.get('graph', {}))
-    elif algo_type == 'dijkstra':
-        return generate_dijkstra_steps(params.get('edges', []), params.get('startNode', 0), params.get('numNodes', 0))
-    elif algo_type == 'kruskal':
-        return generate_kruskal_steps(params.get('edges', []), params.get('numNodes', 0))
-    elif algo_type == 'prim':
-        return generate_prim_steps(params.get('edges', []), params.get('numNodes', 0))
-    elif algo_type == 'floyd-warshall':
-        return generate_floyd_warshall_steps(params.get('matrix', []))
-    elif algo_type == 'bellman-ford':
-        return generate_bellman_ford_steps(params.get('edges', []), params.get('numNodes', 0), params.get('startNode', 0))
-
-    # Advanced / Backtracking / String
-    elif algo_type == 'n-queens':
-        return generate_n_queens_steps(params.get('n', 4))
-    elif algo_type == 'sudoku-solver':
-        return generate_sudoku_solver_steps(params.get('board', []))
-    elif algo_type == 'kmp':
-        return generate_kmp_steps(params.get('text', ''), params.get('pattern', ''))
-    elif algo_type == 'rabin-karp':
-        return generate_rabin_karp_steps(params.get('text', ''), params.get('pattern', ''))
-    elif algo_type == 'karatsuba':
-        return generate_karatsuba_steps(params.get('x', 0), params.get('y', 0))
-    elif algo_type == 'closest-pair':
-        return generate_closest_pair_steps(params.get('points', []))
-    elif algo_type == 'fft':
-        return generate_fft_steps(params.get('coeffs', []))
-    elif algo_type == 'convex-hull':
-        return generate_convex_hull_steps(params.get('points', []))
-
-    
-    raise HTTPException(status_code=404, detail=f"Algorithm {algo_type} implementation not found in Python backend.")
+async def generate_steps(request: AlgorithmRequest, accept: Optional[str] = Header(None),
+                         if_none_match: Optional[str] = Header(None)):
+    return await _generate(request, accept, if_none_match)
+
+@app.get("/generate-steps", response_model=List[AlgorithmStep])
+async def generate_steps_get(
+    type: str,
+    params: str = Query("{}", description="The algorithm params as a JSON object"),
+    encoding: Literal["full", "delta"] = "full",
+    keyframe_interval: int = Query(50, ge=1),
+    max_steps: Optional[int] = Query(None, ge=2),
+    mode: Literal["trace", "result"] = "trace",
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """POST /generate-steps as a cacheable GET, for browsers and CDNs; no streaming."""
+    try:
+        decoded = json.loads(params)
+    except ValueError:
+        decoded = None
+    if not isinstance(decoded, dict):
+        raise HTTPException(status_code=422, detail="params must be a JSON object.")
+    request = AlgorithmRequest(type=type, params=decoded, encoding=encoding, keyframe_interval=keyframe_interval,
+                               max_steps=max_steps, mode=mode)
+    return await _generate(request, accept, if_none_match, {"Cache-Control": f"public, max-age={GET_MAX_AGE_SECONDS}"})
+
+async def _generate(request: AlgorithmRequest, accept: Optional[str], if_none_match: Optional[str],
+                    cache_headers: Optional[Dict[str, str]] = None):
+    spec = _require_algorithm(request.type)
+    _check_params(spec, request.params)
+    options = _output_options(request)
+    if request.stream:
+        # Streams are generated lazily in the threadpool; a worker process
+        # could not hand steps back one at a time. The last line is
+        # {"meta": ...} instead of a step. Only the hard budgets apply.
+        cost = estimate(spec, request.params, options)
+        _admit(spec.type, cost)
+        key = request_key(spec.type, canonical_params(request.params), {**options, "stream": True})
+        chunks, shared = stream_flights.attach(key, lambda: stream_steps(spec, request.params, options))
+        headers = {**_cost_headers(cost), "X-Cache": "COALESCED" if shared else "MISS"}
+        return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+
+    media_type = "application/json"
+    headers = dict(cache_headers or {})
+    if request.mode != "result":
+        headers["Vary"] = "Accept"
+        if accept and MSGPACK_MEDIA_TYPE in accept:
+            if msgpack is None:
+                raise HTTPException(status_code=406, detail="MessagePack output needs the msgpack package on the server.")
+            options["format"] = "msgpack"
+            media_type = MSGPACK_MEDIA_TYPE
+
+    # The output depends only on the request and the code, so a client
+    # holding the current tag is answered before anything is computed
+    key = request_key(spec.type, canonical_params(request.params), options)
+    headers["ETag"] = etag(key, CODE_VERSION)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    cost = estimate(spec, request.params, options)
+    body, meta, cache = await _cached_render(spec, request.params, key, options, cost)
+    return Response(body, media_type=media_type, headers={**_meta_headers(meta, cache), **_cost_headers(cost), **headers})
+
+@app.post("/generate-steps/batch", response_model=Dict[str, List[AlgorithmStep]])
+async def generate_steps_batch(request: BatchRequest):
+    specs = [_require_algorithm(algo_type) for algo_type in dict.fromkeys(request.types)]
+    options = _output_options(request)
+    # Canonicalize the shared input once; each type only adds its overrides
+    shared = canonical_params(request.params)
+
+    costs = {}
+    for spec in specs:
+        params = {**request.params, **request.overrides.get(spec.type, {})}
+        _check_params(spec, params)
+        costs[spec.type] = estimate(spec, params, options)
+
+    def render(spec):
+        override = request.overrides.get(spec.type, {})
+        params = {**request.params, **override}
+        fragments = {**shared, **canonical_params(override)}
+        return _cached_render(spec, params, request_key(spec.type, fragments, options), options, costs[spec.type])
+
+    if request.stream:
+        # A stream cannot turn into an error halfway: check every type up front
+        for spec in specs:
+            _admit(spec.type, costs[spec.type])
+
+        async def lines():
+            async def labelled(spec):
+                body, meta, _ = await render(spec)
+                return spec.type, body, meta
+            for finished in asyncio.as_completed([labelled(spec) for spec in specs]):
+                algo_type, body, meta = await finished
+                prefix = b'{"type":' + json.dumps(algo_type).encode() + b',"meta":' + json.dumps(meta, separators=(",", ":")).encode()
+                if request.mode == "result":
+                    # The result body is already an object: splice its fields in
+                    yield prefix + b"," + body[1:] + b"\n"
+                else:
+                    yield prefix + b',"steps":' + body + b"}\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*[render(spec) for spec in specs])
+    body = b"{" + b",".join(
+        json.dumps(spec.type).encode() + b":" + steps for spec, (steps, _, _) in zip(specs, results)
+    ) + b"}"
+    meta = {spec.type: meta for spec, (_, meta, _) in zip(specs, results)}
+    return Response(body, media_type="application/json", headers={"X-Trace-Meta": json.dumps(meta, separators=(",", ":"))})
+
+@app.post("/traces")
+async def create_trace(request: AlgorithmRequest):
+    spec = _require_algorithm(request.type)
+    _check_params(spec, request.params)
+    max_steps = _step_limit(request)
+    trace_id = request_key(spec.type, canonical_params(request.params), {"trace": True, "max_steps": max_steps})
+    info = trace_store.info(trace_id)
+    if info is None:
+        info, _ = await flights.do(trace_id, lambda: _create_trace(spec, request.params, max_steps, trace_id))
+    return {"trace_id": trace_id, "total_steps": info.total_steps, "checkpoint_interval": trace_store.interval}
+
+async def _create_trace(spec, params, max_steps: int, trace_id: str) -> TraceInfo:
+    _admit(spec.type, estimate(spec, params, {"max_steps": max_steps}))
+    total, segments = await _run_job(trace_segments, spec.type, params, max_steps, trace_store.interval)
+    info = TraceInfo(spec.type, params, max_steps, total)
+    trace_store.add(trace_id, info, segments)
+    return info
+
+@app.get("/traces/{trace_id}/steps", response_model=List[AlgorithmStep])
+async def trace_steps(trace_id: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=5000)):
+    info = trace_store.info(trace_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found.")
+    if offset >= info.total_steps:
+        return Response(b"[]", media_type="application/json")
+
+    first, last = trace_store.window_bounds(info, offset, limit)
+    segments = [trace_store.segment(trace_id, index) for index in range(first, last + 1)]
+    missing = [first + i for i, segment in enumerate(segments) if segment is None]
+    if missing:
+        # Evicted segments are rebuilt by replaying the generator; steps
+        # before the first missing checkpoint are skipped, not serialized
+        _, rebuilt = await _run_job(
+            trace_segments, info.algo_type, info.params, info.max_steps, trace_store.interval, missing[0], missing[-1]
+        )
+        for index, segment in enumerate(rebuilt, start=missing[0]):
+            trace_store.put_segment(trace_id, index, segment)
+            segments[index - first] = segment
+
+    body = slice_window(segments, first, trace_store.interval, offset, limit)
+    return Response(body, media_type="application/json")
+
+def _open_playback(message):
+    request = PlaybackRequest.model_validate(message)
+    spec = get_algorithm(request.type)
+    if spec is None:
+        raise ValueError(f"Algorithm {request.type} implementation not found in Python backend.")
+    spec.check(request.params)
+    options = {"encoding": request.encoding, "max_steps": _step_limit(request), "keyframe_interval": request.keyframe_interval}
+    # Steps are generated and sent only as far as the session plays, so the
+    # byte budget does not apply; seeking to the end still runs the whole
+    # algorithm, so the CPU budget does
+    cost = estimate(spec, request.params, options)
+    if cost is not None and BUDGET_CPU_MS and cost.cpu_ms > BUDGET_CPU_MS:
+        raise ValueError(f"{request.type} would take about {cost.cpu_ms:g}ms of CPU, over the {BUDGET_CPU_MS:g}ms budget.")
+    ready = {"estimate": cost._asdict()} if cost is not None else {}
+    return PlaybackSession(spec, request.params, options), request.speed, request.paused, ready
+
+@app.websocket("/ws/play")
+async def play(websocket: WebSocket):
+    await serve_playback(websocket, _open_playback)
+
+@app.get("/algorithms")
+async def algorithms():
+    return [spec.describe() for spec in list_algorithms()]
+
+@app.get("/cache/stats")
+async def cache_stats():
+    stats = result_cache.stats()
+    if disk_store is not None:
+        stats["disk"] = await run_in_threadpool(disk_store.stats)
+    stats["coalescing"] = {"responses": flights.stats(), "streams": stream_flights.stats()}
+    return stats
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,277 @@
+"""Request metrics in the Prometheus text exposition format.
+
+Each process keeps its own counters, gauges and histograms. When a
+snapshot directory is configured (several uvicorn workers), every process
+also writes its values to ``<dir>/<pid>.json`` at most once per flush
+interval and whenever it goes idle, and rendering merges the snapshots of
+all processes: counters and histograms are summed over every file, gauges
+only over processes that are still alive. Clear the directory when the
+server restarts, as with any Prometheus multi-process setup.
+"""
+
+import json
+import math
+import os
+import time
+from bisect import bisect_left
+from urllib.parse import parse_qs
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STEP_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BYTE_BUCKETS = tuple(1024 * 4 ** i for i in range(11))  # 1 KiB .. 1 GiB
+
+# name -> (type, help, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "algo_requests_total": ("counter", "Requests by algorithm type and status code.", ()),
+    "algo_requests_in_flight": ("gauge", "Requests currently being handled.", ()),
+    "algo_request_duration_seconds": ("histogram", "Time from request to last response byte.", LATENCY_BUCKETS),
+    "algo_compute_seconds": ("histogram", "Time spent inside the algorithm on cache misses.", LATENCY_BUCKETS),
+    "algo_serialize_seconds": ("histogram", "Time spent sampling, encoding and dumping on cache misses.",
+                               LATENCY_BUCKETS),
+    "algo_trace_steps": ("histogram", "Steps per returned trace.", STEP_BUCKETS),
+    "algo_response_bytes": ("histogram", "Response body size.", BYTE_BUCKETS),
+    "algo_cache_requests_total": ("counter", "Response cache lookups by result (hit, disk, coalesced or miss).", ()),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        # name -> labels -> value; a histogram value is [per-bucket counts (+Inf last), sum]
+        self._values: Dict[str, Dict[Labels, Any]] = {name: {} for name in METRICS}
+        self._in_flight = 0
+        self._flushed_at = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def inc(self, name: str, labels: Labels, amount: float = 1):
+        values = self._values[name]
+        values[labels] = values.get(labels, 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float):
+        buckets = METRICS[name][2]
+        entry = self._values[name].get(labels)
+        if entry is None:
+            entry = self._values[name][labels] = [[0] * (len(buckets) + 1), 0.0]
+        entry[0][bisect_left(buckets, value)] += 1
+        entry[1] += value
+
+    def request_started(self, algo_type: str):
+        self._in_flight += 1
+        self.inc("algo_requests_in_flight", _labels(type=algo_type))
+
+    def request_finished(self, algo_type: str, status: int, seconds: float, size: int, headers: Dict[str, str]):
+        """Record a finished request from its status, timing, body size and metadata headers."""
+        labels = _labels(type=algo_type)
+        self._in_flight -= 1
+        self.inc("algo_requests_in_flight", labels, -1)
+        self.inc("algo_requests_total", _labels(type=algo_type, status=str(status)))
+        self.observe("algo_request_duration_seconds", labels, seconds)
+        self.observe("algo_response_bytes", labels, size)
+        cache = headers.get("x-cache")
+        if cache:
+            self.inc("algo_cache_requests_total", _labels(type=algo_type, result=cache.lower()))
+        if "x-step-count" in headers:
+            self.observe("algo_trace_steps", labels, int(headers["x-step-count"]))
+        # A hit reports the timings of the run that filled the cache
+        if cache == "MISS":
+            if "x-compute-time-ms" in headers:
+                self.observe("algo_compute_seconds", labels, float(headers["x-compute-time-ms"]) / 1000)
+            if "x-serialize-time-ms" in headers:
+                self.observe("algo_serialize_seconds", labels, float(headers["x-serialize-time-ms"]) / 1000)
+        self._maybe_flush()
+
+    def _snapshot(self) -> Dict[str, List[Any]]:
+        return {name: [[list(map(list, labels)), value] for labels, value in values.items()]
+                for name, values in self._values.items()}
+
+    def _maybe_flush(self):
+        now = time.monotonic()
+        # Flushing when idle keeps other workers from reporting a stale in-flight count
+        if self.directory and (self._in_flight == 0 or now - self._flushed_at >= self.flush_interval):
+            self.flush()
+            self._flushed_at = now
+
+    def flush(self):
+        if not self.directory:
+            return
+        pid = os.getpid()
+        path = os.path.join(self.directory, f"{pid}.json")
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump({"pid": pid, "metrics": self._snapshot()}, f)
+        os.replace(temporary, path)
+
+    def _collect(self) -> Dict[str, Dict[Labels, Any]]:
+        if not self.directory:
+            return self._values
+        merged: Dict[str, Dict[Labels, Any]] = {name: {} for name in METRICS}
+        own = os.getpid()
+        snapshots = [(own, self._snapshot())]
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json") or filename == f"{own}.json":
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # replaced or removed while listing
+            snapshots.append((snapshot["pid"], snapshot["metrics"]))
+        for pid, snapshot in snapshots:
+            alive = pid == own or _pid_alive(pid)
+            for name, entries in snapshot.items():
+                if name not in METRICS or (METRICS[name][0] == "gauge" and not alive):
+                    continue
+                target = merged[name]
+                for labels, value in entries:
+                    labels = tuple(map(tuple, labels))
+                    if METRICS[name][0] == "histogram":
+                        current = target.setdefault(labels, [[0] * len(value[0]), 0.0])
+                        current[0] = [a + b for a, b in zip(current[0], value[0])]
+                        current[1] += value[1]
+                    else:
+                        target[labels] = target.get(labels, 0) + value
+        return merged
+
+    def render(self) -> str:
+        values = self._collect()
+        lines: List[str] = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(values[name].items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip((*buckets, math.inf), counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+        lines.extend(_hit_ratios(values["algo_cache_requests_total"]))
+        return "\n".join(lines) + "\n"
+
+
+def _hit_ratios(lookups: Dict[Labels, float]) -> List[str]:
+    totals: Dict[str, List[float]] = {}
+    for labels, count in lookups.items():
+        label_map = dict(labels)
+        hits_and_all = totals.setdefault(label_map["type"], [0, 0])
+        hits_and_all[1] += count
+        if label_map["result"] != "miss":
+            hits_and_all[0] += count
+    lines = [
+        "# HELP algo_cache_hit_ratio Share of response cache lookups served without a new computation.",
+        "# TYPE algo_cache_hit_ratio gauge",
+    ]
+    for algo_type, (hits, total) in sorted(totals.items()):
+        lines.append(f"algo_cache_hit_ratio{_format_labels(_labels(type=algo_type))} {round(hits / total, 6)}")
+    return lines
+
+
+def _request_type(method: str, query_string: bytes, body: bytes) -> Any:
+    """The ``type`` a request names: a query parameter for GET, a field of the JSON body for POST."""
+    if method == "GET":
+        return parse_qs(query_string.decode("latin-1")).get("type", [None])[0]
+    try:
+        return json.loads(body).get("type")
+    except (ValueError, AttributeError):
+        return None
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording metrics for GET and POST requests to one path.
+
+    The request body is read up front so ``label_for`` can turn the
+    algorithm type the request names (None when it names none) into a
+    label before the handler runs (for the in-flight gauge), then replayed
+    to the app unchanged. Everything else comes from the response: status,
+    body size and the X-Cache / X-Step-Count / X-*-Time-Ms headers.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry, path: str, label_for: Callable[[Any], str]):
+        self.app = app
+        self.registry = registry
+        self.path = path
+        self.label_for = label_for
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "POST") or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        received = []
+        body = b""
+        while True:
+            message = await receive()
+            received.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        async def replay():
+            return received.pop(0) if received else await receive()
+
+        status = 500
+        headers: Dict[str, str] = {}
+        size = 0
+
+        async def record(message):
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = {key.decode("latin-1").lower(): value.decode("latin-1")
+                           for key, value in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        algo_type = self.label_for(_request_type(scope["method"], scope.get("query_string", b""), body))
+        self.registry.request_started(algo_type)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, replay, record)
+        finally:
+            self.registry.request_finished(algo_type, status, time.perf_counter() - start, size, headers)
@@ -1,9 +1,41 @@
-from pydantic import BaseModel
-from typing import List, Optional, Any, Dict
+from pydantic import BaseModel, Field
+from typing import List, Optional, Any, Dict, Literal
 
 class AlgorithmRequest(BaseModel):
     type: str
     params: Dict[str, Any]
+    # Send steps as newline-delimited JSON while they are generated
+    stream: bool = False
+    # "delta" sends array keyframes plus per-step changes, see app.encoding
+    encoding: Literal["full", "delta"] = "full"
+    keyframe_interval: int = Field(50, ge=1)
+    # Down-sample compare events to stay within this many steps
+    max_steps: Optional[int] = Field(None, ge=2)
+    # "result" skips the trace: only the final state and operation counts
+    mode: Literal["trace", "result"] = "trace"
+
+class BatchRequest(BaseModel):
+    types: List[str]
+    # Input shared by every algorithm; overrides are merged over it per type
+    params: Dict[str, Any]
+    overrides: Dict[str, Dict[str, Any]] = {}
+    # Send one {"type", "steps"} line per algorithm as soon as it finishes
+    stream: bool = False
+    encoding: Literal["full", "delta"] = "full"
+    keyframe_interval: int = Field(50, ge=1)
+    max_steps: Optional[int] = Field(None, ge=2)
+    mode: Literal["trace", "result"] = "trace"
+
+class PlaybackRequest(BaseModel):
+    """First message of a /ws/play session, see app.playback."""
+    type: str
+    params: Dict[str, Any]
+    encoding: Literal["full", "delta"] = "full"
+    keyframe_interval: int = Field(50, ge=1)
+    max_steps: Optional[int] = Field(None, ge=2)
+    # Steps pushed per second; above 30 several steps share a frame
+    speed: float = Field(4.0, gt=0, le=10_000)
+    paused: bool = False
 
 class AlgorithmStep(BaseModel):
     id: str
@@ -0,0 +1,219 @@
+"""Server-paced trace playback over a WebSocket (/ws/play).
+
+The client opens the socket and sends one start message, the same fields
+as a /generate-steps request plus ``speed`` (steps per second) and
+``paused``:
+
+    {"type": "bubble-sort", "params": {...}, "speed": 4}
+
+The server answers ``{"event": "ready", ...}`` and then pushes
+``{"event": "steps", "offset": i, "steps": [...]}`` frames at the requested
+rate; fast playback batches several steps into each frame rather than
+sending more than MAX_FRAMES_PER_SECOND frames. Control messages:
+
+    {"action": "play"}                     resume
+    {"action": "pause"}                    stop pushing frames
+    {"action": "step"}                     push one frame while paused
+    {"action": "seek", "index": n}         continue from step n
+    {"action": "speed", "value": 20}       change steps per second
+
+Each control message is acknowledged with ``{"event": "state", ...}``.
+At the end of the trace the server sends ``{"event": "end", "meta": ...}``
+and pauses; seeking back and playing again is allowed. Bad control
+messages get ``{"event": "error", "detail": ...}`` and leave the session
+open.
+
+The generator runs in this process and is only advanced when a frame is
+due, so a session that is abandoned halfway only ever computed the steps
+it showed. Seeking forward generates the skipped steps without
+serializing them; seeking backward replays the generator from the start,
+like /traces does for evicted segments. With delta encoding the first
+step after a seek is always a keyframe.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+from .encoding import delta_encode
+from .jobs import trace_meta
+from .sampling import limit_steps
+from .serialization import step_to_json
+from .steps import Step, Trace
+
+MAX_FRAMES_PER_SECOND = 30
+MAX_SPEED = 10_000.0
+
+
+class PlaybackSession:
+    """A lazily advanced trace with a read position."""
+
+    def __init__(self, spec, params: Dict[str, Any], options: Dict[str, Any]):
+        self.spec = spec
+        self.params = params
+        self.options = options
+        self.position = 0
+        self.finished = False
+        self._restart()
+
+    def _restart(self):
+        self._trace = Trace(self.spec.call(self.params))
+        self._raw = limit_steps(self._trace, self.options["max_steps"])
+        self._steps = self._encode()
+        self.position = 0
+        self.finished = False
+
+    def _encode(self):
+        # Re-encoding after a seek makes the next step a keyframe
+        if self.options["encoding"] == "delta":
+            return delta_encode(self._raw, self.options["keyframe_interval"])
+        return self._raw
+
+    def advance(self, count: int) -> List[Step]:
+        """The next ``count`` steps, fewer at the end of the trace."""
+        steps = []
+        for step in self._steps:
+            steps.append(step)
+            if len(steps) == count:
+                break
+        else:
+            self.finished = True
+        self.position += len(steps)
+        return steps
+
+    def seek(self, index: int):
+        if index < self.position:
+            self._restart()
+        for _ in range(index - self.position):
+            if next(self._raw, None) is None:
+                self.finished = True
+                break
+            self.position += 1
+        self._steps = self._encode()
+
+    def meta(self) -> Dict[str, Any]:
+        return trace_meta(self._trace.operations, self._trace.compute_seconds, self.position)
+
+
+def _frame(offset: int, steps: List[Step]) -> str:
+    body = b'{"event":"steps","offset":%d,"steps":[' % offset + b",".join(map(step_to_json, steps)) + b"]}"
+    return body.decode()
+
+
+def _speed(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value <= MAX_SPEED:
+        raise ValueError(f"speed must be a number of steps per second in (0, {MAX_SPEED:g}]")
+    return float(value)
+
+
+class Player:
+    """Paces one session over a WebSocket until the client disconnects."""
+
+    def __init__(self, websocket: WebSocket, session: PlaybackSession, speed: float, paused: bool):
+        self.websocket = websocket
+        self.session = session
+        self.speed = speed
+        self.playing = not paused
+        # Fractional steps owed to the client at the current speed
+        self._credit = 0.0
+
+    def _frame_interval(self) -> float:
+        return max(1 / self.speed, 1 / MAX_FRAMES_PER_SECOND)
+
+    async def _state(self):
+        await self.websocket.send_json({
+            "event": "state", "playing": self.playing, "position": self.session.position, "speed": self.speed,
+        })
+
+    async def _send_frame(self, count: int):
+        offset = self.session.position
+        steps = await run_in_threadpool(self.session.advance, count)
+        if steps:
+            await self.websocket.send_text(_frame(offset, steps))
+        if self.session.finished:
+            self.playing = False
+            await self.websocket.send_json({"event": "end", "meta": self.session.meta()})
+
+    async def _control(self, message: Dict[str, Any]):
+        action = message.get("action")
+        if action == "play":
+            self.playing = not self.session.finished
+        elif action == "pause":
+            self.playing = False
+        elif action == "step":
+            self.playing = False
+            await self._send_frame(max(1, round(self.speed * self._frame_interval())))
+        elif action == "seek":
+            index = message.get("index")
+            if isinstance(index, bool) or not isinstance(index, int) or index < 0:
+                raise ValueError("seek needs a non-negative integer index")
+            await run_in_threadpool(self.session.seek, index)
+        elif action == "speed":
+            self.speed = _speed(message.get("value"))
+        else:
+            raise ValueError(f"unknown action {action!r}")
+        self._credit = 0.0
+        await self._state()
+
+    async def run(self):
+        receiver: Optional[asyncio.Future] = None
+        due = time.monotonic()
+        try:
+            while True:
+                if receiver is None:
+                    receiver = asyncio.ensure_future(self.websocket.receive_json())
+                timeout = max(0.0, due - time.monotonic()) if self.playing else None
+                done, _ = await asyncio.wait({receiver}, timeout=timeout)
+                if done:
+                    finished, receiver = receiver, None
+                    try:
+                        message = finished.result()
+                        if not isinstance(message, dict):
+                            raise ValueError("control messages are JSON objects")
+                        await self._control(message)
+                    except ValueError as exc:  # JSONDecodeError included
+                        await self.websocket.send_json({"event": "error", "detail": str(exc)})
+                    due = time.monotonic()
+                    continue
+                interval = self._frame_interval()
+                self._credit += self.speed * interval
+                count = int(self._credit)
+                self._credit -= count
+                due += interval
+                # Fall behind gracefully after a stall instead of bursting to catch up
+                due = max(due, time.monotonic())
+                if count:
+                    await self._send_frame(count)
+        except WebSocketDisconnect:
+            pass
+        except Exception as exc:  # the algorithm failed on its params
+            await self.websocket.send_json({"event": "error", "detail": f"{type(exc).__name__}: {exc}"})
+            await self.websocket.close(code=1011)
+        finally:
+            if receiver is not None:
+                receiver.cancel()
+
+
+async def serve(websocket: WebSocket, open_session):
+    """Accept the socket, start a session from its first message and play it.
+
+    ``open_session(message)`` validates the start message and returns
+    ``(session, speed, paused, ready)`` where ``ready`` is extra fields for
+    the ready event; it raises ValueError for a bad request, which closes
+    the socket with code 1008 after an error event.
+    """
+    await websocket.accept()
+    try:
+        start = await websocket.receive_json()
+        session, speed, paused, ready = await run_in_threadpool(open_session, start)
+    except WebSocketDisconnect:
+        return
+    except ValueError as exc:
+        await websocket.send_json({"event": "error", "detail": str(exc)})
+        await websocket.close(code=1008)
+        return
+    await websocket.send_json({"event": "ready", "playing": not paused, "position": 0, "speed": speed, **ready})
+    await Player(websocket, session, speed, paused).run()
@@ -0,0 +1,154 @@
+import importlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .algorithms.index import MODULES
+
+_JSON_TYPES = {list: "array", dict: "object", str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+@dataclass(frozen=True)
+class AlgorithmSpec:
+    type: str
+    category: str
+    handler: Callable[..., Any]
+    # Request param name -> default, in the handler's positional order
+    params: Dict[str, Any]
+    # Request param name -> the only values it takes, e.g. a strategy name
+    choices: Dict[str, Tuple[Any, ...]] = field(default_factory=dict)
+
+    def _args(self, params: Dict[str, Any]) -> List[Any]:
+        return [params.get(name, default) for name, default in self.params.items()]
+
+    def check(self, params: Dict[str, Any]):
+        """Raise ValueError for a param outside its choices, before anything runs."""
+        for name, allowed in self.choices.items():
+            value = params.get(name, self.params[name])
+            if value not in allowed:
+                raise ValueError(f"Unknown {name} {value!r} for {self.type}, expected one of {', '.join(map(str, allowed))}")
+
+    def call(self, params: Dict[str, Any]):
+        return self.handler(*self._args(params))
+
+    def compute(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+        """Run the trace-free implementation: (final state, operation counts)."""
+        return _RESULT_HANDLERS[self.type](*self._args(params))
+
+    @property
+    def has_result(self) -> bool:
+        return self.type in _RESULT_HANDLERS
+
+    @property
+    def traced(self) -> bool:
+        """Whether the handler is ``tracer.traced``: under a step limit it only builds the steps it keeps."""
+        return getattr(self.handler, "traced", False)
+
+    def cost(self, params: Dict[str, Any]) -> Optional[Tuple[float, float, float]]:
+        """Run the cost model: (expected steps, bytes per step, operations), or None without one."""
+        model = _COST_MODELS.get(self.type)
+        return model(*self._args(params)) if model is not None else None
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "category": self.category,
+            "params": [
+                {"name": name, "type": _JSON_TYPES.get(type(default), "any"), "default": default,
+                 **({"choices": list(self.choices[name])} if name in self.choices else {})}
+                for name, default in self.params.items()
+            ],
+            "modes": ["trace", "result"] if self.has_result else ["trace"],
+        }
+
+
+_REGISTRY: Dict[str, AlgorithmSpec] = {}
+_RESULT_HANDLERS: Dict[str, Callable[..., Any]] = {}
+_COST_MODELS: Dict[str, Callable[..., Tuple[float, float, float]]] = {}
+_MODULE_OF = {algo_type: module for module, types in MODULES.items() for algo_type in types}
+
+
+def register(algo_type: str, params: Dict[str, Any], choices: Optional[Dict[str, Tuple[Any, ...]]] = None):
+    """Register the step generator of an algorithm.
+
+    ``params`` maps each request param to its default, in the generator's
+    positional order; ``choices`` lists the values a param is limited to,
+    so requests with any other value are refused before they run.
+    """
+    def decorator(handler):
+        if algo_type in _REGISTRY:
+            raise ValueError(f"Algorithm {algo_type} is already registered")
+        category = handler.__module__.rsplit(".", 1)[-1]
+        if _MODULE_OF.get(algo_type) != category:
+            raise ValueError(f"Algorithm {algo_type} is not listed under {category} in app/algorithms/index.py")
+        _REGISTRY[algo_type] = AlgorithmSpec(algo_type, category, handler, dict(params), dict(choices or {}))
+        return handler
+    return decorator
+
+
+def register_result(algo_type: str):
+    """Register the trace-free implementation of an algorithm for mode=result.
+
+    It takes the same positional params as the step generator and returns
+    the final state (the data of the generator's last step, without
+    ``finished``) together with a dict of operation counts.
+    """
+    def decorator(handler):
+        if algo_type in _RESULT_HANDLERS:
+            raise ValueError(f"Result handler for {algo_type} is already registered")
+        _RESULT_HANDLERS[algo_type] = handler
+        return handler
+    return decorator
+
+
+def register_cost(algo_type: str):
+    """Register the cost model of an algorithm for admission control.
+
+    It takes the same positional params as the step generator and returns
+    the expected number of steps, the average serialized size of one step
+    in bytes and the number of primitive operations, all without running
+    the algorithm.
+    """
+    def decorator(model):
+        if algo_type in _COST_MODELS:
+            raise ValueError(f"Cost model for {algo_type} is already registered")
+        _COST_MODELS[algo_type] = model
+        return model
+    return decorator
+
+
+def _load(module: str):
+    importlib.import_module(f"{__package__}.algorithms.{module}")
+    missing = [algo_type for algo_type in MODULES[module] if algo_type not in _REGISTRY]
+    if missing:
+        raise ImportError(f"app.algorithms.{module} does not register {', '.join(missing)}")
+
+
+def get_algorithm(algo_type: str) -> Optional[AlgorithmSpec]:
+    """The spec of ``algo_type``, importing its module on first use."""
+    spec = _REGISTRY.get(algo_type)
+    if spec is None and algo_type in _MODULE_OF:
+        _load(_MODULE_OF[algo_type])
+        spec = _REGISTRY[algo_type]
+    return spec
+
+
+def list_algorithms() -> List[AlgorithmSpec]:
+    """Every algorithm, in index order; this imports every module."""
+    preload(MODULES)
+    return [_REGISTRY[algo_type] for types in MODULES.values() for algo_type in types]
+
+
+def preload(names: Iterable[str]):
+    """Import the modules of the given algorithm types or module names ("all" for every module)."""
+    modules = []
+    for name in names:
+        if name == "all":
+            modules.extend(MODULES)
+        elif name in MODULES:
+            modules.append(name)
+        elif name in _MODULE_OF:
+            modules.append(_MODULE_OF[name])
+        else:
+            raise ValueError(f"Cannot preload {name}: not an algorithm type or module")
+    for module in dict.fromkeys(modules):
+        _load(module)
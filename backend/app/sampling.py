@@ -0,0 +1,142 @@
+from itertools import chain
+from typing import Iterable, Iterator, List
+
+from .steps import Step, check_deadline
+
+# Step id prefixes of read-only events (comparisons, probes, checks). These
+# may be thinned out; every other step changes state and is kept.
+COMPARE_PREFIXES = (
+    "compare-", "odd-compare-", "even-compare-", "check-", "bs-check-",
+    "probe-", "jump-", "scan-", "cut-", "window-",
+)
+
+
+def is_compare(step: Step) -> bool:
+    return step.id.startswith(COMPARE_PREFIXES)
+
+
+class StepSampler:
+    """The keep-or-drop decisions of ``limit_steps``, one step at a time.
+
+    ``keep`` is asked about every step but the last, in order; the last
+    step is always kept. It is only asked about a step it might drop once
+    the trace is known to outgrow ``max_steps`` (see ``look_ahead``).
+    Sources that know their step ids before building the steps (see
+    ``app.tracer``) use it to skip the dropped ones entirely. As every step
+    passes through here, dropped or not, it is also where long runs notice
+    that their job is past its deadline.
+    """
+
+    __slots__ = ("max_steps", "budget", "state_budget", "emitted", "elided", "compares", "changes",
+                 "compare_stride", "change_stride", "threshold")
+
+    def __init__(self, max_steps: int):
+        self.max_steps = max_steps
+        # One slot is always held back for the final step
+        self.budget = max_steps - 1
+        self.state_budget = self.budget * 3 // 4
+        self.emitted = 0
+        self.elided = 0
+        self.compares = 0
+        self.changes = 0
+        self.compare_stride = 1
+        self.change_stride = 1
+        self.threshold = self.budget // 2
+
+    @property
+    def keeps_next(self) -> bool:
+        """Whether ``keep`` keeps the next step whatever it is.
+
+        True until the first half of the budget is used: those steps are
+        emitted by any trace, so they need not wait to see whether it fits.
+        """
+        return self.emitted < self.budget and self.compare_stride == self.change_stride == 1
+
+    def keep(self, compare: bool) -> bool:
+        if not (self.emitted + self.elided) & 0xFF:
+            check_deadline()
+        if self.emitted >= self.budget:
+            keep = False
+        elif not self.emitted:
+            keep = True
+        elif compare:
+            keep = self.compares % self.compare_stride == 0
+            self.compares += 1
+        else:
+            keep = self.changes % self.change_stride == 0
+            self.changes += 1
+
+        if keep:
+            self.emitted += 1
+            if self.emitted >= self.threshold:
+                self.compare_stride *= 4
+                if self.emitted >= self.state_budget:
+                    self.change_stride *= 4
+                self.threshold = self.emitted + max(1, (self.budget - self.emitted) // 2)
+        else:
+            self.elided += 1
+        return keep
+
+
+def limit_steps(steps: Iterable[Step], max_steps: int) -> Iterator[Step]:
+    """Yield at most ``max_steps`` steps while the generator runs.
+
+    A trace of up to ``max_steps`` steps comes back whole: past the first
+    half of the budget, steps are held back until the trace either ends or
+    outgrows the limit, and only then sampled. The first and last steps are
+    always kept. Compare events are sampled
+    with a stride that quadruples each time half of the remaining budget is
+    used, so they thin out deterministically as the trace grows. State
+    changes are all kept until three quarters of the budget is used; past
+    that they are strided the same way, so the tail of a very long run is
+    still represented instead of cut off. The last step reports the number
+    of dropped steps as ``data["elided_steps"]``.
+
+    Sources with a ``limited(max_steps)`` method that returns an iterator
+    sample themselves, with the same result.
+    """
+    limited = getattr(steps, "limited", None)
+    if limited is not None:
+        sampled = limited(max_steps)
+        if sampled is not None:
+            return sampled
+    return _limit_steps(iter(steps), max_steps)
+
+
+def look_ahead(steps: Iterator[Step], sampler: StepSampler, ahead: List[Step]) -> Iterator[Step]:
+    """Yield the steps ``sampler`` keeps anyway and collect the rest in ``ahead``.
+
+    Stops at the end of ``steps``, or after the step that makes the trace
+    longer than ``max_steps`` (then the last one in ``ahead``); a trace that
+    fits is emitted as it is by following the yielded steps with ``ahead``.
+    """
+    for step in steps:
+        if not ahead and sampler.keeps_next:
+            sampler.keep(is_compare(step))
+            yield step
+            continue
+        if not len(ahead) & 0xFF:
+            check_deadline()
+        ahead.append(step)
+        if sampler.emitted + len(ahead) > sampler.max_steps:
+            return
+
+
+def _limit_steps(steps: Iterator[Step], max_steps: int) -> Iterator[Step]:
+    sampler = StepSampler(max_steps)
+    ahead: List[Step] = []
+    yield from look_ahead(steps, sampler, ahead)
+    if sampler.emitted + len(ahead) <= max_steps:  # the trace fits
+        yield from ahead
+        return
+
+    steps = chain(ahead, steps)
+    pending = next(steps)
+    for step in steps:
+        if sampler.keep(is_compare(pending)):
+            yield pending
+        pending = step
+
+    if sampler.elided:
+        pending = pending.replace(data={**pending.data, "elided_steps": sampler.elided})
+    yield pending
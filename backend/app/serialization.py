@@ -0,0 +1,90 @@
+import math
+from typing import Any, Dict, Iterable, Iterator
+from pydantic_core import to_json, to_jsonable_python
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic_core's encoder is used instead
+    orjson = None
+
+from .steps import Step
+
+# Flush streamed output once this many bytes are buffered; the first step is
+# always flushed on its own so the visualizer can start drawing immediately.
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _dumps(value) -> bytes:
+    # Both encoders write non-finite floats as null and stringify int keys;
+    # values orjson does not know (sets, complex) go through pydantic_core,
+    # and integers beyond 64 bits make orjson give up on the whole value.
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=to_jsonable_python, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return to_json(value, inf_nan_mode="null")
+
+
+def _json_key(key) -> str:
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, bool):
+        return {None: "null", True: "true", False: "false"}[key]
+    return str(key)
+
+
+def json_compatible(value):
+    """``value`` as it reads back from ``_dumps``, for encoders without its rules.
+
+    Non-finite floats become None and dict keys strings; tuples become
+    lists and other values pydantic_core knows (sets, complex) their JSON
+    form. Integers are left alone, however wide.
+    """
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {_json_key(key): json_compatible(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_compatible(item) for item in value]
+    return json_compatible(to_jsonable_python(value))
+
+
+def step_to_json(step: Step) -> bytes:
+    return _dumps(step.as_dict())
+
+
+def dump_steps(steps: Iterable[Step]) -> bytes:
+    return _dumps([step.as_dict() for step in steps])
+
+
+def dump_result(state: Dict[str, Any], operations: Dict[str, int]) -> bytes:
+    return _dumps({"result": state, "operations": operations})
+
+
+def dump_meta_line(meta: Dict[str, Any]) -> bytes:
+    return _dumps({"meta": meta}) + b"\n"
+
+
+def iter_ndjson(steps: Iterable[Step]) -> Iterator[bytes]:
+    """Yield NDJSON chunks; returns the number of steps written."""
+    steps = iter(steps)
+    count = 0
+    for step in steps:
+        yield step_to_json(step) + b"\n"
+        count += 1
+        break
+
+    buffer = bytearray()
+    for step in steps:
+        buffer += step_to_json(step)
+        buffer += b"\n"
+        count += 1
+        if len(buffer) >= STREAM_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+    return count
@@ -0,0 +1,208 @@
+"""Coalescing of identical requests that are in flight at the same time.
+
+The first request for a key starts the computation; requests for the same
+key that arrive before it finishes attach to it instead of computing
+again. The computation runs as its own task, so it survives the client
+that started it disconnecting. Streams are shared the same way, through
+a bounded buffer: a request that attaches before the first chunk is
+dropped replays the chunks so far and then receives the rest as they are
+produced.
+"""
+
+import asyncio
+import itertools
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+
+def _consume_exception(task: asyncio.Future):
+    # Keeps asyncio from logging failures nobody was left waiting for
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    def __init__(self):
+        self.leaders = 0
+        self.coalesced = 0
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """The result of ``compute()`` for ``key`` and whether it was shared with an earlier caller."""
+        call = self._calls.get(key)
+        shared = call is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            call = self._calls[key] = asyncio.ensure_future(compute())
+            call.add_done_callback(_consume_exception)
+            call.add_done_callback(lambda done: self._forget(key, done))
+        # A caller that goes away must not cancel the others' computation
+        return await asyncio.shield(call), shared
+
+    def _forget(self, key: str, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+class _Broadcast:
+    """Chunks of one stream, from ``first`` (the index of ``chunks[0]``) to ``end``."""
+
+    def __init__(self):
+        self.chunks: Deque[bytes] = deque()
+        self.first = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+        # Subscriber token -> index of the next chunk it reads
+        self.cursors: Dict[int, int] = {}
+        self.changed = asyncio.Event()
+        self.task: Optional[asyncio.Future] = None
+
+    @property
+    def end(self) -> int:
+        return self.first + len(self.chunks)
+
+    def notify(self):
+        # Waiters hold the old event, so this wakes everyone waiting so far
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self, ready: Callable[[], bool]):
+        while not ready():
+            await self.changed.wait()
+
+    def trim(self):
+        """Drop the chunks every subscriber has read."""
+        low = min(self.cursors.values(), default=self.end)
+        while self.first < low:
+            self.chunks.popleft()
+            self.first += 1
+
+
+class _Subscription:
+    """One subscriber's read position in a broadcast, as an async iterator.
+
+    It lets go of the broadcast when it ends, is closed, is cancelled
+    while waiting or is garbage collected, whichever comes first: a
+    response that is dropped before it starts iterating must not hold up
+    the producer and everyone else.
+    """
+
+    def __init__(self, broadcast: _Broadcast, token: int):
+        self._broadcast = broadcast
+        self._token = token
+        broadcast.cursors[token] = 0
+
+    def __aiter__(self) -> "_Subscription":
+        return self
+
+    async def __anext__(self) -> bytes:
+        broadcast = self._broadcast
+        cursors = broadcast.cursors
+        if self._token not in cursors:
+            raise StopAsyncIteration
+        try:
+            await broadcast.wait(lambda: cursors[self._token] < broadcast.end or broadcast.done)
+        except asyncio.CancelledError:
+            # The response was cancelled, i.e. the client went away
+            self.close()
+            raise
+        index = cursors[self._token]
+        if index < broadcast.end:
+            chunk = broadcast.chunks[index - broadcast.first]
+            cursors[self._token] = index + 1
+            broadcast.trim()
+            broadcast.notify()
+            return chunk
+        self.close()
+        if broadcast.error is not None:
+            raise broadcast.error
+        raise StopAsyncIteration
+
+    async def aclose(self):
+        self.close()
+
+    def close(self):
+        broadcast = self._broadcast
+        if broadcast.cursors.pop(self._token, None) is None or broadcast.done:
+            return
+        if broadcast.cursors:
+            broadcast.trim()
+            broadcast.notify()
+        else:
+            broadcast.task.cancel()
+
+    __del__ = close
+
+
+class StreamFlight:
+    """Single flight for byte streams produced by a synchronous iterator.
+
+    At most ``max_chunks`` chunks are buffered: the producer waits for the
+    slowest subscriber, and a chunk is dropped once every subscriber has
+    read it. A request can only join a stream whose first chunk is still
+    buffered; once it is gone, a new stream is started for the request.
+    """
+
+    def __init__(self, max_chunks: int):
+        self.max_chunks = max_chunks
+        self.leaders = 0
+        self.coalesced = 0
+        self._streams: Dict[str, _Broadcast] = {}
+        self._tokens = itertools.count()
+
+    def attach(self, key: str, produce: Callable[[], Iterator[bytes]]) -> Tuple[AsyncIterator[bytes], bool]:
+        """An iterator over the stream for ``key`` and whether it was shared with an earlier caller.
+
+        ``produce`` is only called by the first caller; its chunks are
+        pulled in the threadpool. The producer stops early once every
+        subscriber has gone.
+        """
+        broadcast = self._streams.get(key)
+        shared = broadcast is not None and broadcast.first == 0
+        if shared:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            broadcast = self._streams[key] = _Broadcast()
+            broadcast.task = asyncio.ensure_future(self._produce(key, broadcast, produce))
+            # Also when the task is cancelled before it starts
+            broadcast.task.add_done_callback(lambda done: self._forget(key, broadcast))
+        # Register the subscriber now, before the response starts iterating,
+        # so a leader that has not started reading yet keeps the producer
+        # alive and the first chunk buffered
+        return _Subscription(broadcast, next(self._tokens)), shared
+
+    async def _produce(self, key: str, broadcast: _Broadcast, produce: Callable[[], Iterator[bytes]]):
+        chunks = produce()
+        try:
+            while True:
+                chunk = await run_in_threadpool(next, chunks, None)
+                if chunk is None:
+                    break
+                await broadcast.wait(lambda: len(broadcast.chunks) < self.max_chunks)
+                broadcast.chunks.append(chunk)
+                broadcast.notify()
+        except Exception as exc:
+            broadcast.error = exc
+        finally:
+            # Late requests start a new stream rather than joining a finished one
+            self._forget(key, broadcast)
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            broadcast.done = True
+            broadcast.notify()
+
+    def _forget(self, key: str, broadcast: _Broadcast):
+        if self._streams.get(key) is broadcast:
+            del self._streams[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._streams), "leaders": self.leaders, "coalesced": self.coalesced}
@@ -0,0 +1,96 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Wall-clock time (comparable across processes) by which the job generating
+# steps in this context has to finish; see jobs.run_until
+job_deadline: ContextVar[Optional[float]] = ContextVar("job_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised from inside step generation once the job's deadline has passed."""
+
+
+def check_deadline():
+    deadline = job_deadline.get()
+    if deadline is not None and time.time() > deadline:
+        raise DeadlineExceeded
+
+
+class Step:
+    """Trace step built by the generators.
+
+    Mirrors the fields of ``models.AlgorithmStep``, which stays the response
+    schema, but skips Pydantic validation: generator output is trusted, so
+    a step costs one small slotted object and is serialized straight to
+    JSON bytes by ``serialization``.
+    """
+
+    __slots__ = ("id", "description", "currentIndex", "comparedIndices", "highlightedIndices", "data")
+
+    def __init__(self, *, id: str, description: str, data: Dict[str, Any], currentIndex: Optional[int] = None,
+                 comparedIndices: Optional[List[int]] = None, highlightedIndices: Optional[List[int]] = None):
+        self.id = id
+        self.description = description
+        self.currentIndex = currentIndex
+        self.comparedIndices = comparedIndices
+        self.highlightedIndices = highlightedIndices
+        self.data = data
+
+    def replace(self, **changes) -> "Step":
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return Step(**fields)
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Key order matches the AlgorithmStep schema
+        return {
+            "id": self.id,
+            "description": self.description,
+            "currentIndex": self.currentIndex,
+            "comparedIndices": self.comparedIndices,
+            "highlightedIndices": self.highlightedIndices,
+            "data": self.data,
+        }
+
+
+class Trace:
+    """Steps of one generator run, timed and counted as they are pulled.
+
+    Generators return their operation counts (``return {"comparisons": n}``);
+    once the steps are exhausted they are in ``operations``. ``compute_seconds``
+    covers only the time spent inside the generator, not in whatever
+    consumes the steps.
+    """
+
+    __slots__ = ("_steps", "operations", "compute_seconds")
+
+    def __init__(self, steps: Iterator[Step]):
+        self._steps = steps
+        self.operations: Dict[str, int] = {}
+        self.compute_seconds = 0.0
+
+    def limited(self, max_steps: int) -> Optional[Iterator[Step]]:
+        """At most ``max_steps`` steps sampled by the generator itself, or None if it cannot.
+
+        See ``sampling.limit_steps``; the timing and counts still land here.
+        """
+        limited = getattr(self._steps, "limited", None)
+        if limited is None:
+            return None
+        self._steps = limited(max_steps)
+        return iter(self)
+
+    def __iter__(self) -> Iterator[Step]:
+        steps = self._steps
+        clock = time.perf_counter
+        while True:
+            start = clock()
+            try:
+                step = next(steps)
+            except StopIteration as stop:
+                self.compute_seconds += clock() - start
+                self.operations = stop.value or {}
+                return
+            self.compute_seconds += clock() - start
+            yield step
@@ -0,0 +1,240 @@
+"""Tracing for algorithms that work on one array.
+
+Instead of building a Step with a copy of the array for every event, a
+traced algorithm works on ``tracer.array`` in place, makes every change
+to it through ``swap``, ``write`` or ``load`` and yields the events it
+wants shown, recorded with ``compare``, ``mark`` or ``step``:
+
+    @register("bubble-sort", params={"array": []})
+    @traced
+    def generate_bubble_sort_steps(t: ArrayTracer):
+        a = t.array
+        ...
+        yield t.compare(j, j + 1, f"compare-{i}-{j}", f"Comparing {a[j]} and {a[j+1]}")
+        t.swap(j, j + 1)
+        ...
+        return {"comparisons": comparisons, "swaps": swaps}
+
+The algorithm is a generator, so it only runs as far as its steps are
+consumed. Under a step limit every step is built until the trace
+outgrows the limit, since a trace that fits comes back whole. From then
+on the tracer holds the sampler of ``limit_steps`` and decides about each
+step as it is recorded: a dropped step is never built (``compare`` and
+friends return None for it), so however long the run, the array is
+copied for at most ``max_steps`` steps beyond the ones emitted.
+"""
+
+import functools
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional
+
+from .sampling import COMPARE_PREFIXES, StepSampler, is_compare, look_ahead
+from .steps import Step
+
+Traced = Generator[Optional[Step], None, Optional[Dict[str, int]]]
+
+# Undo records of the changes made after a dropped step
+_SWAP, _WRITE, _LOAD = range(3)
+
+
+class ArrayTracer:
+    """Applies changes to ``array`` and builds the steps shown between them."""
+
+    def __init__(self, arr: Iterable[Any], sampler: Optional[StepSampler] = None):
+        self.array = list(arr)
+        # What the steps show when it differs from ``array``, see ``write``
+        self._shown: Optional[List[Any]] = None
+        # Decides which steps are built; every one is without it
+        self.sampler = sampler
+        self.recorded = 0
+        # The last step if the sampler dropped it, and undo records of the
+        # changes made since, to show it with the array it was recorded on
+        self._dropped = None
+        self._undo: Optional[List[Any]] = None
+
+    @property
+    def shown(self) -> List[Any]:
+        return self.array if self._shown is None else self._shown
+
+    def swap(self, i: int, j: int):
+        a = self.array
+        a[i], a[j] = a[j], a[i]
+        shown = self._shown
+        if shown is not None:
+            shown[i], shown[j] = shown[j], shown[i]
+        if self._undo is not None:
+            self._undo.append((_SWAP, i, j))
+
+    def write(self, index: int, value: Any, into: Optional[List[Any]] = None):
+        """Set ``array[index]``, or the same index of ``into``.
+
+        ``into`` is a buffer standing in for the array, e.g. the other half
+        of a ping-pong pair; the write is still shown as a change to the
+        array, whose contents the steps then track separately.
+        """
+        if self._undo is not None:
+            self._undo.append((_WRITE, index, self.shown[index]))
+        if into is not None and into is not self.array:
+            if self._shown is None:
+                self._shown = list(self.array)
+            into[index] = value
+        else:
+            self.array[index] = value
+        if self._shown is not None:
+            self._shown[index] = value
+
+    def load(self, values: Iterable[Any]):
+        """Replace the whole array, e.g. to show an output buffer instead of the input."""
+        if self._undo is not None:
+            self._undo.append((_LOAD, list(self.shown), None))
+        self.array[:] = values
+        self._shown = None
+
+    def compare(self, i: int, j: Optional[int], id: str, description: str) -> Optional[Step]:
+        """A step comparing ``i`` with ``j`` (or only showing ``i`` when ``j`` is None)."""
+        return self._step(id, description, [i] if j is None else [i, j], None, None)
+
+    def mark(self, indices, id: str, description: str, data=None) -> Optional[Step]:
+        """A step highlighting ``indices``: a sequence of indices or a ``range``.
+
+        ``data`` is a dict of extra fields, or a function returning one when
+        it is costly to snapshot: it is only called for steps that are kept.
+        """
+        return self._step(id, description, None, indices, data)
+
+    def step(self, id: str, description: str, data=None) -> Optional[Step]:
+        return self._step(id, description, None, None, data)
+
+    def _step(self, id: str, description: str, compared, highlighted, data) -> Optional[Step]:
+        self.recorded += 1
+        sampler = self.sampler
+        if sampler is not None:
+            if not sampler.keep(id.startswith(COMPARE_PREFIXES)):
+                # Kept after all if no step follows it
+                self._dropped = (id, description, compared, highlighted, data)
+                self._undo = []
+                return None
+            self._dropped = self._undo = None
+        return self._build(id, description, compared, highlighted, data, list(self.shown))
+
+    @staticmethod
+    def _build(id, description, compared, highlighted, data, array) -> Step:
+        step_data = {"array": array}
+        if callable(data):
+            data = data()
+        if data:
+            step_data.update(data)
+        if highlighted is not None:
+            highlighted = list(highlighted)
+        return Step(id=id, description=description, comparedIndices=compared, highlightedIndices=highlighted,
+                    data=step_data)
+
+    def dropped_last(self) -> Optional[Step]:
+        """The last step recorded, when the sampler dropped it, with the array it showed."""
+        if self._dropped is None:
+            return None
+        array = list(self.shown)
+        for op, first, second in reversed(self._undo):
+            if op == _SWAP:
+                array[first], array[second] = array[second], array[first]
+            elif op == _WRITE:
+                array[first] = second
+            else:
+                array = first
+        return self._build(*self._dropped, array)
+
+
+class TracedSteps:
+    """The steps of a traced algorithm, generated as they are consumed.
+
+    Iterates like a generator: the algorithm's return value (its operation
+    counts) comes back in the StopIteration that ends the steps, which is
+    where ``steps.Trace`` looks for it.
+    """
+
+    def __init__(self, algorithm: Callable[..., Traced], arr: Iterable[Any], args=()):
+        self._algorithm = algorithm
+        self._arr = arr
+        self._args = args
+        self._steps: Optional[Iterator[Step]] = None
+
+    def _run(self, max_steps: Optional[int]):
+        if max_steps is None:
+            return (yield from self._algorithm(ArrayTracer(self._arr), *self._args))
+        sampler = StepSampler(max_steps)
+        tracer = ArrayTracer(self._arr)
+        result = {}
+
+        def recorded():
+            result["operations"] = yield from self._algorithm(tracer, *self._args)
+
+        steps = recorded()
+        ahead: List[Step] = []
+        yield from look_ahead(steps, sampler, ahead)
+        if sampler.emitted + len(ahead) <= max_steps:
+            yield from ahead
+            return result["operations"]
+
+        def undecided():
+            # Steps built before the sampler takes over, in the order they
+            # were recorded: the ones looked ahead at and those recorded but
+            # not yet yielded, e.g. rotations shown after the tree returns
+            pulled = sampler.emitted + len(ahead)
+            yield from ahead
+            while pulled < tracer.recorded:
+                step = next(steps, None)
+                if step is None:
+                    return
+                pulled += 1
+                yield step
+            tracer.sampler = sampler
+
+        # From then on the tracer skips building the steps the sampler
+        # drops. One kept step is held back, so the last one can report
+        # what was elided
+        held = dropped = None
+        for step in undecided():
+            if sampler.keep(is_compare(step)):
+                if held is not None:
+                    yield held
+                held, dropped = step, None
+            else:
+                dropped = step
+        for step in steps:
+            dropped = None
+            if step is not None:
+                if held is not None:
+                    yield held
+                held = step
+        last = dropped if dropped is not None else tracer.dropped_last()
+        if last is not None:
+            if held is not None:
+                yield held
+            held = last
+            sampler.elided -= 1
+        if held is not None and sampler.elided:
+            held = held.replace(data={**held.data, "elided_steps": sampler.elided})
+        if held is not None:
+            yield held
+        return result["operations"]
+
+    def __iter__(self) -> Iterator[Step]:
+        return self
+
+    def __next__(self) -> Step:
+        if self._steps is None:
+            self._steps = self._run(None)
+        return next(self._steps)
+
+    def limited(self, max_steps: int) -> Iterator[Step]:
+        """Sampled steps for ``sampling.limit_steps``."""
+        return self._run(max_steps)
+
+
+def traced(algorithm: Callable[..., Traced]):
+    """Turn ``algorithm(tracer, *params)`` into a step generator taking the array and params."""
+    @functools.wraps(algorithm)
+    def handler(arr: Iterable[Any], *args) -> TracedSteps:
+        return TracedSteps(algorithm, arr, args)
+    # Lets cost.estimate charge built steps only up to the step limit
+    handler.traced = True
+    return handler
@@ -0,0 +1,91 @@
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass
+class TraceInfo:
+    algo_type: str
+    params: Dict[str, Any]
+    max_steps: int
+    total_steps: int
+
+
+class TraceStore:
+    """Traces kept as compressed segments of ``interval`` steps.
+
+    Each segment boundary is a checkpoint: a window is served by
+    decompressing only the segments it overlaps, so seek cost depends on
+    the window size rather than the trace length. Segment payloads share
+    one LRU byte budget; a trace whose segments were evicted keeps its
+    request so the missing segments can be regenerated on demand.
+
+    Checkpoints are positions in the serialized trace, not snapshots of
+    algorithm state: step generators cannot be suspended into a snapshot
+    and resumed from it. So a retained trace costs O(steps) compressed
+    bytes, bounded by ``max_bytes`` across all traces, and regenerating an
+    evicted segment replays the generator from its first step, skipping
+    only the serialization of the steps before the segment.
+    """
+
+    def __init__(self, interval: int, max_bytes: int, max_traces: int):
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.max_traces = max_traces
+        self.size = 0
+        self._traces: "OrderedDict[str, TraceInfo]" = OrderedDict()
+        self._segments: "OrderedDict[Tuple[str, int], bytes]" = OrderedDict()
+
+    def add(self, trace_id: str, info: TraceInfo, segments: List[bytes]):
+        self._traces[trace_id] = info
+        self._traces.move_to_end(trace_id)
+        while len(self._traces) > self.max_traces:
+            evicted_id, evicted = self._traces.popitem(last=False)
+            for index in range(self.segment_count(evicted)):
+                self._drop_segment((evicted_id, index))
+        for index, segment in enumerate(segments):
+            self.put_segment(trace_id, index, segment)
+
+    def info(self, trace_id: str) -> Optional[TraceInfo]:
+        info = self._traces.get(trace_id)
+        if info is not None:
+            self._traces.move_to_end(trace_id)
+        return info
+
+    def segment_count(self, info: TraceInfo) -> int:
+        return -(-info.total_steps // self.interval)
+
+    def segment(self, trace_id: str, index: int) -> Optional[bytes]:
+        segment = self._segments.get((trace_id, index))
+        if segment is not None:
+            self._segments.move_to_end((trace_id, index))
+        return segment
+
+    def put_segment(self, trace_id: str, index: int, segment: bytes):
+        key = (trace_id, index)
+        if key in self._segments or len(segment) > self.max_bytes:
+            return
+        self._segments[key] = segment
+        self.size += len(segment)
+        while self.size > self.max_bytes:
+            self._drop_segment(next(iter(self._segments)))
+
+    def _drop_segment(self, key: Tuple[str, int]):
+        segment = self._segments.pop(key, None)
+        if segment is not None:
+            self.size -= len(segment)
+
+    def window_bounds(self, info: TraceInfo, offset: int, limit: int) -> Tuple[int, int]:
+        """First and last segment index covering steps [offset, offset + limit)."""
+        end = min(offset + limit, info.total_steps)
+        return offset // self.interval, (end - 1) // self.interval
+
+
+def slice_window(segments: List[bytes], first: int, interval: int, offset: int, limit: int) -> bytes:
+    """JSON array of steps [offset, offset + limit) from consecutive segments starting at ``first``."""
+    lines = []
+    for segment in segments:
+        lines.extend(zlib.decompress(segment).split(b"\n"))
+    start = offset - first * interval
+    return b"[" + b",".join(lines[start:start + limit]) + b"]"
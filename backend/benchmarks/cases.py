@@ -0,0 +1,305 @@
+"""Benchmark inputs for every registered algorithm.
+
+Each case is an (algorithm type, distribution, size) triple whose params
+are built from a random.Random seeded by the triple itself, so a case
+always gets the same input regardless of which other cases run.
+"""
+
+import random
+import zlib
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+Params = Dict[str, Any]
+Builder = Callable[[random.Random, str, int], Params]
+
+ARRAY_DISTRIBUTIONS = ("random", "sorted", "reversed", "duplicates")
+# Partially ordered inputs that adaptive sorts should exploit
+PRESORTED_DISTRIBUTIONS = ("nearly-sorted", "sawtooth")
+GRAPH_DENSITIES = ("sparse", "random", "dense")
+SEARCH_OUTCOMES = ("hit", "miss")
+STRING_KINDS = ("random", "repetitive")
+
+
+class Case(NamedTuple):
+    algo_type: str
+    distribution: str
+    size: int
+    params: Params
+
+    @property
+    def key(self) -> str:
+        return f"{self.distribution}/{self.size}"
+
+
+def _array(rng: random.Random, distribution: str, size: int) -> List[int]:
+    if distribution == "duplicates":
+        values = [rng.randrange(max(2, size // 20)) for _ in range(size)]
+    else:
+        values = [rng.randrange(size * 10) for _ in range(size)]
+    if distribution == "sorted":
+        values.sort()
+    elif distribution == "reversed":
+        values.sort(reverse=True)
+    elif distribution == "nearly-sorted":
+        # Sorted, then one in twenty elements moved by a random swap
+        values.sort()
+        for _ in range(max(1, size // 20)):
+            i, j = rng.randrange(size), rng.randrange(size)
+            values[i], values[j] = values[j], values[i]
+    elif distribution == "sawtooth":
+        # Ascending teeth of about sqrt(size) elements each
+        tooth = max(2, int(size ** 0.5))
+        values = [value % tooth * size + value // tooth for value in range(size)]
+    return values
+
+
+def _text(rng: random.Random, kind: str, size: int) -> str:
+    if kind == "repetitive":
+        # Worst case for naive matching: long runs that almost match
+        return "A" * (size - 1) + "B"
+    return "".join(rng.choice("ACGT") for _ in range(size))
+
+
+def _edge_pairs(rng: random.Random, density: str, nodes: int) -> List[Tuple[int, int]]:
+    """Undirected node pairs: a random spanning tree plus density-dependent extras."""
+    pairs = {(rng.randrange(v), v) for v in range(1, nodes)}
+    if density == "sparse":
+        extra = nodes * 2
+        while len(pairs) < min(nodes - 1 + extra, nodes * (nodes - 1) // 2):
+            u, v = sorted(rng.sample(range(nodes), 2))
+            pairs.add((u, v))
+    else:
+        p = 0.1 if density == "random" else 0.5
+        pairs.update((u, v) for u in range(nodes) for v in range(u + 1, nodes) if rng.random() < p)
+    return sorted(pairs)
+
+
+def sorting_case(rng, distribution, size):
+    return {"array": _array(rng, distribution, size)}
+
+
+def variant_case(param: str) -> Builder:
+    """A sorting builder for distributions like "natural/sorted".
+
+    That one sets ``param`` to "natural" on sorted input; plain
+    distributions leave ``param`` at its default.
+    """
+    def build(rng, distribution, size):
+        variant, _, distribution = distribution.rpartition("/")
+        params = sorting_case(rng, distribution, size)
+        if variant:
+            params[param] = variant
+        return params
+    return build
+
+
+def variant_distributions(variants: Sequence[str]) -> Tuple[str, ...]:
+    return ARRAY_DISTRIBUTIONS + tuple(
+        f"{variant}/{distribution}" for variant in variants for distribution in ARRAY_DISTRIBUTIONS
+    )
+
+
+def search_case(rng, outcome, size):
+    # Even values only, so any odd target is a guaranteed miss
+    array = sorted(rng.sample(range(0, size * 8, 2), size))
+    target = rng.choice(array) if outcome == "hit" else rng.randrange(size * 4) * 2 + 1
+    return {"array": array, "target": target}
+
+
+def activity_case(rng, distribution, size):
+    starts = [rng.randrange(size * 10) for _ in range(size)]
+    return {"startTimes": starts, "endTimes": [start + rng.randint(1, 20) for start in starts]}
+
+
+def knapsack_items(rng, size):
+    weights = [rng.randint(1, 20) for _ in range(size)]
+    return {"weights": weights, "values": [rng.randint(1, 100) for _ in range(size)], "capacity": sum(weights) // 3}
+
+
+def fractional_knapsack_case(rng, distribution, size):
+    return knapsack_items(rng, size)
+
+
+def job_sequencing_case(rng, distribution, size):
+    return {
+        "ids": [f"J{i}" for i in range(size)],
+        "deadlines": [rng.randint(1, size // 2 + 1) for _ in range(size)],
+        "profits": [rng.randint(1, 1000) for _ in range(size)],
+    }
+
+
+def huffman_case(rng, distribution, size):
+    return {"chars": [f"c{i}" for i in range(size)], "frequencies": [rng.randint(1, 1000) for _ in range(size)]}
+
+
+def coin_change_case(rng, distribution, size):
+    return {"coins": [1, 2, 5, 10, 20, 50, 100, 200], "amount": size}
+
+
+def platforms_case(rng, distribution, size):
+    arrivals = sorted(rng.randrange(size * 10) for _ in range(size))
+    return {"arrivals": arrivals, "departures": [arrival + rng.randint(1, 30) for arrival in arrivals]}
+
+
+def merge_pattern_case(rng, distribution, size):
+    return {"files": [rng.randint(1, 1000) for _ in range(size)]}
+
+
+def fibonacci_case(rng, distribution, size):
+    return {"n": size}
+
+
+def knapsack_case(rng, distribution, size):
+    return knapsack_items(rng, size)
+
+
+def unbounded_knapsack_case(rng, distribution, size):
+    items = knapsack_items(rng, 10)
+    items["capacity"] = size
+    return items
+
+
+def two_strings_case(rng, kind, size):
+    return {"s1": _text(rng, kind, size), "s2": _text(rng, kind, size)}
+
+
+def rod_cutting_case(rng, distribution, size):
+    prices, price = [], 0
+    for _ in range(size):
+        price += rng.randint(1, 10)
+        prices.append(price)
+    return {"prices": prices, "length": size}
+
+
+def subset_sum_case(rng, distribution, size):
+    array = [rng.randint(1, 50) for _ in range(size)]
+    return {"array": array, "target": sum(array) // 2}
+
+
+def partition_case(rng, distribution, size):
+    return {"array": [rng.randint(1, 50) for _ in range(size)]}
+
+
+def matrix_chain_case(rng, distribution, size):
+    return {"dimensions": [rng.randint(5, 50) for _ in range(size + 1)]}
+
+
+def adjacency_case(rng, density, size):
+    # Directed edges u -> v with u < v: a DAG, so topological sort applies too
+    graph = {f"N{i}": [] for i in range(size)}
+    for u, v in _edge_pairs(rng, density, size):
+        graph[f"N{u}"].append(f"N{v}")
+    return {"graph": graph, "startNode": "N0"}
+
+
+def edge_list_case(rng, density, size):
+    edges = [{"u": u, "v": v, "w": rng.randint(1, 100)} for u, v in _edge_pairs(rng, density, size)]
+    return {"edges": edges, "numNodes": size, "startNode": 0}
+
+
+def matrix_case(rng, density, size):
+    matrix = [[0 if i == j else -1 for j in range(size)] for i in range(size)]
+    for u, v in _edge_pairs(rng, density, size):
+        matrix[u][v] = matrix[v][u] = rng.randint(1, 100)
+    return {"matrix": matrix}
+
+
+def n_queens_case(rng, distribution, size):
+    return {"n": size}
+
+
+_SOLVED_SUDOKU = [[(3 * (row % 3) + row // 3 + col) % 9 + 1 for col in range(9)] for row in range(9)]
+
+
+def sudoku_case(rng, distribution, size):
+    board = [row[:] for row in _SOLVED_SUDOKU]
+    for cell in rng.sample(range(81), size):
+        board[cell // 9][cell % 9] = 0
+    return {"board": board}
+
+
+def pattern_case(rng, kind, size):
+    text = _text(rng, kind, size)
+    pattern = text[-8:] if kind == "repetitive" else text[size // 2:size // 2 + 8]
+    return {"text": text, "pattern": pattern}
+
+
+def karatsuba_case(rng, distribution, size):
+    return {"x": rng.randrange(10 ** (size - 1), 10 ** size), "y": rng.randrange(10 ** (size - 1), 10 ** size)}
+
+
+def points_case(rng, distribution, size):
+    return {"points": [[rng.randrange(size * 10), rng.randrange(size * 10)] for _ in range(size)]}
+
+
+def fft_case(rng, distribution, size):
+    return {"coeffs": [rng.randint(-10, 10) for _ in range(size)]}
+
+
+_N_LOG_N_SIZES = (100, 400, 1600)
+_QUADRATIC_SIZES = (50, 100, 200)
+_SEARCH_SIZES = (500, 2_000, 8_000)
+_GRAPH_SIZES = (16, 64, 256)
+
+# Algorithm type -> (builder, distributions, sizes)
+SUITE: Dict[str, Tuple[Builder, Sequence[str], Sequence[int]]] = {
+    **{algo: (sorting_case, ARRAY_DISTRIBUTIONS, _N_LOG_N_SIZES) for algo in (
+        "heap-sort", "counting-sort", "shell-sort", "radix-sort",
+        "bucket-sort", "comb-sort",
+        # Quick sort falls back to heap sort before ordered input turns quadratic
+        "quick-sort",
+    )},
+    "tim-sort": (sorting_case, ARRAY_DISTRIBUTIONS + PRESORTED_DISTRIBUTIONS, _N_LOG_N_SIZES),
+    "merge-sort": (variant_case("strategy"), variant_distributions(("bottom-up", "natural")), _N_LOG_N_SIZES),
+    "tree-sort": (variant_case("balance"), variant_distributions(("avl", "red-black")), _N_LOG_N_SIZES),
+    **{algo: (sorting_case, ARRAY_DISTRIBUTIONS, _QUADRATIC_SIZES) for algo in (
+        "bubble-sort", "selection-sort", "insertion-sort", "cycle-sort", "odd-even-sort",
+    )},
+    **{algo: (search_case, SEARCH_OUTCOMES, _SEARCH_SIZES) for algo in (
+        "binary-search", "exponential-search", "linear-search", "jump-search",
+        "interpolation-search", "ternary-search", "fibonacci-search", "hash-search",
+    )},
+    "activity-selection": (activity_case, ("random",), (100, 1_000, 10_000)),
+    "fractional-knapsack": (fractional_knapsack_case, ("random",), (100, 1_000, 10_000)),
+    "job-sequencing": (job_sequencing_case, ("random",), (50, 200, 800)),
+    "huffman-coding": (huffman_case, ("random",), (100, 1_000, 10_000)),
+    "coin-change-greedy": (coin_change_case, ("random",), (1_000, 10_000, 100_000)),
+    "min-platforms": (platforms_case, ("random",), (100, 1_000, 10_000)),
+    "optimal-merge-pattern": (merge_pattern_case, ("random",), (100, 1_000, 10_000)),
+    "fibonacci-dp": (fibonacci_case, ("random",), (100, 1_000, 5_000)),
+    "knapsack-0-1": (knapsack_case, ("random",), (10, 20, 40)),
+    "lcs": (two_strings_case, STRING_KINDS, (10, 20, 40)),
+    "unbounded-knapsack": (unbounded_knapsack_case, ("random",), (50, 200, 800)),
+    "lis": (sorting_case, ARRAY_DISTRIBUTIONS, (50, 100, 200)),
+    "edit-distance": (two_strings_case, STRING_KINDS, (10, 20, 40)),
+    "rod-cutting": (rod_cutting_case, ("random",), (20, 80, 320)),
+    "subset-sum": (subset_sum_case, ("random",), (10, 30, 90)),
+    "partition-problem": (partition_case, ("random",), (10, 30, 90)),
+    "matrix-chain-multiplication": (matrix_chain_case, ("random",), (10, 20, 40)),
+    **{algo: (adjacency_case, GRAPH_DENSITIES, _GRAPH_SIZES) for algo in ("bfs", "dfs", "topological-sort")},
+    **{algo: (edge_list_case, GRAPH_DENSITIES, _GRAPH_SIZES) for algo in ("dijkstra", "kruskal", "prim")},
+    "bellman-ford": (edge_list_case, GRAPH_DENSITIES, (16, 32, 64)),
+    "floyd-warshall": (matrix_case, GRAPH_DENSITIES, (8, 16, 32)),
+    "n-queens": (n_queens_case, ("random",), (5, 6, 7, 8)),
+    "sudoku-solver": (sudoku_case, ("random",), (20, 35, 50)),
+    "kmp": (pattern_case, STRING_KINDS, (1_000, 5_000, 25_000)),
+    "rabin-karp": (pattern_case, STRING_KINDS, (1_000, 5_000, 25_000)),
+    "karatsuba": (karatsuba_case, ("random",), (8, 32, 128)),
+    "closest-pair": (points_case, ("random",), (50, 200, 400)),
+    "fft": (fft_case, ("random",), (64, 256, 1_024)),
+    "convex-hull": (points_case, ("random",), (100, 1_000, 5_000)),
+}
+
+
+def build_cases(algo_types: Sequence[str], max_sizes: int = 0) -> List[Case]:
+    """Cases for the given algorithm types; ``max_sizes`` keeps only the smallest N sizes."""
+    cases = []
+    for algo_type in algo_types:
+        builder, distributions, sizes = SUITE[algo_type]
+        if max_sizes:
+            sizes = sizes[:max_sizes]
+        for distribution in distributions:
+            for size in sizes:
+                rng = random.Random(zlib.crc32(f"{algo_type}/{distribution}/{size}".encode()))
+                cases.append(Case(algo_type, distribution, size, builder(rng, distribution, size)))
+    return cases
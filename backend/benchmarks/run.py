@@ -0,0 +1,220 @@
+"""Benchmark every registered step generator and compare against a baseline.
+
+Run from backend/:
+
+    python -m benchmarks.run                 # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save          # (re)write the baseline
+    python -m benchmarks.run --only sorting --quick
+
+Each case records the best wall time of ``--repeat`` full runs of the
+generator, the tracemalloc peak of one more run with steps consumed one at
+a time (the streaming path; a materialized trace grows with the step
+count, which is recorded too) and the operation counts the generator
+returns. Comparison exits 1 when a case is slower or needs more memory
+than the baseline by more than the tolerance, produces more steps, or
+fails where it used to succeed; cases that look slower are re-timed
+before they count. Timings are only comparable on the machine the
+baseline was saved on, so save it there rather than sharing one.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.registry import get_algorithm, list_algorithms
+from app.steps import Trace
+
+from .cases import SUITE, Case, build_cases
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+Results = Dict[str, Dict[str, Dict[str, Any]]]
+
+
+def _drain(case: Case) -> Trace:
+    trace = Trace(get_algorithm(case.algo_type).call(case.params))
+    for _ in trace:
+        pass
+    return trace
+
+
+def best_time_ms(case: Case, repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _drain(case)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    try:
+        time_ms = best_time_ms(case, repeat)
+        tracemalloc.start()
+        try:
+            trace = Trace(get_algorithm(case.algo_type).call(case.params))
+            steps = sum(1 for _ in trace)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    except Exception as exc:  # a failing case is a result, not a crash
+        return {"error": f"{type(exc).__name__}: {exc}"[:200]}
+    return {
+        "time_ms": time_ms,
+        "peak_kib": round(peak / 1024, 1),
+        "steps": steps,
+        "operations": trace.operations,
+    }
+
+
+def scaling_exponent(points: List[tuple]) -> Optional[float]:
+    """Least-squares slope of log(time) against log(size): ~1 linear, ~2 quadratic."""
+    points = [(math.log(size), math.log(ms)) for size, ms in points if ms > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in points) / spread, 2)
+
+
+def scaling(results: Results) -> Dict[str, Dict[str, float]]:
+    exponents: Dict[str, Dict[str, float]] = {}
+    for algo_type, entries in results.items():
+        curves: Dict[str, List[tuple]] = {}
+        for key, entry in entries.items():
+            distribution, size = key.rsplit("/", 1)
+            if "time_ms" in entry:
+                curves.setdefault(distribution, []).append((int(size), entry["time_ms"]))
+        for distribution, points in curves.items():
+            exponent = scaling_exponent(points)
+            if exponent is not None:
+                exponents.setdefault(algo_type, {})[distribution] = exponent
+    return exponents
+
+
+def compare(baseline: Results, results: Results, tolerance: float, memory_tolerance: float,
+            min_ms: float, min_kib: float) -> List[Tuple[str, str, str, str]]:
+    """Regressions as (algorithm type, case key, kind, message)."""
+    regressions = []
+    for algo_type, entries in results.items():
+        for key, now in entries.items():
+            before = baseline.get(algo_type, {}).get(key)
+            if before is None:
+                continue
+            if "error" in now:
+                if "error" not in before:
+                    regressions.append((algo_type, key, "error", f"now fails ({now['error']})"))
+                continue
+            if "error" in before:
+                continue
+            if now["steps"] > before["steps"]:
+                regressions.append((algo_type, key, "steps", f"steps {before['steps']} -> {now['steps']}"))
+            if now["time_ms"] > before["time_ms"] * (1 + tolerance) and now["time_ms"] - before["time_ms"] > min_ms:
+                regressions.append((algo_type, key, "time", f"time {before['time_ms']}ms -> {now['time_ms']}ms"))
+            if (now["peak_kib"] > before["peak_kib"] * (1 + memory_tolerance)
+                    and now["peak_kib"] - before["peak_kib"] > min_kib):
+                regressions.append((algo_type, key, "memory",
+                                    f"peak memory {before['peak_kib']}KiB -> {now['peak_kib']}KiB"))
+    return regressions
+
+
+def _selected(only: List[str]) -> List[str]:
+    specs = list_algorithms()
+    missing = [spec.type for spec in specs if spec.type not in SUITE]
+    if missing:
+        print(f"warning: no benchmark cases for {', '.join(missing)}", file=sys.stderr)
+    return [
+        spec.type for spec in specs
+        if spec.type in SUITE and (not only or spec.type in only or spec.category in only)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON path")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON path")
+    parser.add_argument("--only", nargs="+", default=[], help="algorithm types or categories to run")
+    parser.add_argument("--quick", action="store_true", help="only the two smallest sizes per case")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the best one counts")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="allowed relative peak memory growth")
+    parser.add_argument("--min-ms", type=float, default=5.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--min-kib", type=float, default=16.0, help="ignore memory growth smaller than this")
+    args = parser.parse_args(argv)
+
+    cases = build_cases(_selected(args.only), max_sizes=2 if args.quick else 0)
+    results: Results = {}
+    for case in cases:
+        entry = measure(case, args.repeat)
+        results.setdefault(case.algo_type, {})[case.key] = entry
+        if "error" in entry:
+            print(f"{case.algo_type:30} {case.key:26} ERROR {entry['error']}")
+        else:
+            print(f"{case.algo_type:30} {case.key:26} {entry['time_ms']:>10.3f} ms"
+                  f" {entry['peak_kib']:>10.1f} KiB {entry['steps']:>9} steps")
+
+    exponents = scaling(results)
+    print("\nscaling exponents (log time / log size):")
+    for algo_type, by_distribution in exponents.items():
+        print(f"  {algo_type:30} " + "  ".join(f"{dist}={value}" for dist, value in by_distribution.items()))
+
+    report = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()},
+        "repeat": args.repeat,
+        "results": results,
+        "scaling": exponents,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1, sort_keys=True)
+    if args.save:
+        baseline: Dict[str, Any] = {"results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Merge so a partial (--only) run only replaces the cases it ran
+        for algo_type, entries in results.items():
+            baseline["results"].setdefault(algo_type, {}).update(entries)
+        baseline.update(machine=report["machine"], repeat=args.repeat, scaling=scaling(baseline["results"]))
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline}; run with --save to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != report["machine"]:
+        print("\nnote: baseline was recorded on a different machine; timings may not be comparable")
+    thresholds = (args.tolerance, args.memory_tolerance, args.min_ms, args.min_kib)
+    regressions = compare(baseline["results"], results, *thresholds)
+    # Shared machines stall now and then: re-time suspects before failing on them
+    slow = {(algo_type, key) for algo_type, key, kind, _ in regressions if kind == "time"}
+    if slow:
+        print(f"\nre-timing {len(slow)} slower case(s)")
+        for case in cases:
+            if (case.algo_type, case.key) in slow:
+                entry = results[case.algo_type][case.key]
+                entry["time_ms"] = min(entry["time_ms"], best_time_ms(case, args.repeat * 3))
+        regressions = compare(baseline["results"], results, *thresholds)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for algo_type, key, _, message in regressions:
+            print(f"  {algo_type} {key}: {message}")
+        return 1
+    print(f"\nno regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
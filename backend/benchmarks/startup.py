@@ -0,0 +1,112 @@
+"""Measure time-to-first-response of a freshly started server.
+
+Run from backend/:
+
+    python -m benchmarks.startup                            # bubble-sort, 5 runs
+    python -m benchmarks.startup --algorithm dijkstra --workers 2
+    python -m benchmarks.startup --warmup sorting --runs 10
+
+Each run starts uvicorn in a new process and polls until it answers,
+then times three points from the moment the process was spawned: the
+first answer to GET / (the server is up), the first /generate-steps
+response for the algorithm (which imports its module unless warmed up)
+and a second, identical request with the response cache bypassed by a
+different max_steps (the warm cost). Medians over the runs are printed.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+from .cases import SUITE, build_cases
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(url: str, body: Optional[Dict] = None) -> bool:
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status == 200
+    except (urllib.error.URLError, ConnectionError):
+        return False
+
+
+def run_once(algo_type: str, params: Dict, workers: int, warmup: str, timeout: float) -> Dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "ALGO_WORKERS": str(workers), "ALGO_WARMUP": warmup}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        while not _request(base + "/"):
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode}")
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"server did not answer within {timeout:g}s")
+            time.sleep(0.005)
+        ready = time.perf_counter()
+        body = {"type": algo_type, "params": params}
+        if not _request(base + "/generate-steps", body):
+            raise RuntimeError(f"/generate-steps failed for {algo_type}")
+        first = time.perf_counter()
+        _request(base + "/generate-steps", {**body, "max_steps": 1_000_000 - 1})
+        second = time.perf_counter()
+    finally:
+        process.terminate()
+        process.wait()
+    return {
+        "ready_ms": (ready - start) * 1000,
+        "first_response_ms": (first - start) * 1000,
+        "first_request_ms": (first - ready) * 1000,
+        "warm_request_ms": (second - first) * 1000,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--algorithm", default="bubble-sort", help="algorithm type of the first request")
+    parser.add_argument("--workers", type=int, default=0, help="ALGO_WORKERS for the server (0: in-process)")
+    parser.add_argument("--warmup", default="", help="ALGO_WARMUP for the server, e.g. sorting,dijkstra or all")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for the server to answer")
+    parser.add_argument("--output", help="also write every run to this JSON path")
+    args = parser.parse_args(argv)
+
+    if args.algorithm not in SUITE:
+        parser.error(f"no benchmark cases for {args.algorithm}")
+    cases = build_cases([args.algorithm], max_sizes=1)
+    runs = [run_once(args.algorithm, cases[0].params, args.workers, args.warmup, args.timeout)
+            for _ in range(args.runs)]
+    print(f"{args.algorithm} ({cases[0].key}), workers={args.workers}, warmup={args.warmup or '-'}, "
+          f"median of {args.runs} runs:")
+    for name in runs[0]:
+        print(f"  {name:20} {statistics.median(run[name] for run in runs):>10.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"algorithm": args.algorithm, "workers": args.workers, "warmup": args.warmup, "runs": runs},
+                      f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+import os
+import sys
+
+# Jobs run in-process: the tests never spawn a worker pool
+os.environ.setdefault("ALGO_WORKERS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
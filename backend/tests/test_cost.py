@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from app.config import BUDGET_CPU_MS
+from app.cost import estimate, inversions
+from app.registry import get_algorithm
+from app.sampling import limit_steps
+from app.steps import Trace
+
+
+def test_inversions_match_brute_force():
+    rng = random.Random(15)
+    for _ in range(200):
+        values = [rng.randint(0, 12) for _ in range(rng.randint(0, 40))]
+        expected = sum(1 for i in range(len(values)) for j in range(i + 1, len(values)) if values[i] > values[j])
+        assert inversions(values) == expected
+
+
+@pytest.mark.parametrize("algo_type", ["bubble-sort", "insertion-sort", "odd-even-sort"])
+def test_rotated_input_is_not_underestimated(algo_type):
+    # Only one neighbour pair is out of order, but a quarter of all pairs are
+    arr = list(range(200, 400)) + list(range(200))
+    spec = get_algorithm(algo_type)
+    estimated, _, _ = spec.cost({"array": arr})
+    *_, last = limit_steps(Trace(spec.call({"array": arr})), 2)
+    actual = 2 + last.data["elided_steps"]
+    assert 0.8 < estimated / actual < 1.25
+
+
+@pytest.mark.parametrize("arr", [
+    list(range(400)),
+    list(range(400, 0, -1)),
+    list(range(200, 400)) + list(range(200)),
+    list(range(0, 400, 2)) + list(range(399, 0, -2)),
+], ids=["sorted", "reversed", "rotated", "organ-pipe"])
+def test_unbalanced_tree_sort_chains_are_not_underestimated(arr):
+    spec = get_algorithm("tree-sort")
+    _, _, operations = spec.cost({"array": arr})
+    _, counts = spec.compute({"array": arr})
+    assert 0.8 < operations / counts["comparisons"] < 1.25
+
+
+def test_traced_sources_are_charged_for_the_steps_they_build():
+    # Reversed bubble sort records about 4M steps; only the sampled ones copy the array
+    spec = get_algorithm("bubble-sort")
+    params = {"array": list(range(2000, 0, -1))}
+    limited = estimate(spec, params, {"max_steps": 1000})
+    full = estimate(spec, params, {"max_steps": 10**7})
+    assert limited.cpu_ms < BUDGET_CPU_MS < full.cpu_ms
+    assert 5_000 < limited.cpu_ms < 15_000
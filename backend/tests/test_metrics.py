@@ -0,0 +1,111 @@
+"""GET /metrics, read back the way a Prometheus scraper would."""
+
+import json
+import math
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from app.metrics import METRICS, MetricsRegistry
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse(text):
+    """Samples keyed by (name, frozenset of labels), checking every series was declared first."""
+    declared = {}
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            declared[name] = kind
+            continue
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        name, labels, value = match.groups()
+        assert name in declared or re.sub(r"_(bucket|sum|count)$", "", name) in declared, line
+        samples[name, frozenset(LABEL.findall(labels or ""))] = float(value)
+    return samples
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return parse(response.text)
+
+
+def value(samples, name, **labels):
+    return samples.get((name, frozenset(labels.items())), 0)
+
+
+def test_requests_are_counted_by_type_and_status(client):
+    before = scrape(client)
+    client.post("/generate-steps", json={"type": "bubble-sort", "params": {"array": [5, 1, 4]}})
+    client.get("/generate-steps", params={"type": "bubble-sort", "params": json.dumps({"array": [9, 8, 7]})})
+    client.post("/generate-steps", json={"type": "no-such-sort", "params": {}})
+    after = scrape(client)
+
+    assert value(after, "algo_requests_total", type="bubble-sort", status="200") \
+        - value(before, "algo_requests_total", type="bubble-sort", status="200") == 2
+    assert value(after, "algo_requests_total", type="unknown", status="404") \
+        - value(before, "algo_requests_total", type="unknown", status="404") == 1
+    assert value(after, "algo_requests_in_flight", type="bubble-sort") == 0
+
+
+def test_histograms_have_cumulative_buckets(client):
+    client.post("/generate-steps", json={"type": "insertion-sort", "params": {"array": [3, 2, 1, 0]}})
+    samples = scrape(client)
+    histograms = [name for name, (kind, _, _) in METRICS.items() if kind == "histogram"]
+    series = defaultdict(list)
+    for (name, labels), count in samples.items():
+        for histogram in histograms:
+            if name == f"{histogram}_bucket":
+                le = dict(labels)["le"]
+                rest = frozenset(label for label in labels if label[0] != "le")
+                series[histogram, rest].append((math.inf if le == "+Inf" else float(le), count))
+    assert ("algo_trace_steps", frozenset({("type", "insertion-sort")})) in series
+    for (histogram, labels), buckets in series.items():
+        counts = [count for _, count in sorted(buckets)]
+        assert counts == sorted(counts), histogram
+        assert counts[-1] == samples[f"{histogram}_count", labels]
+        assert len(buckets) == len(METRICS[histogram][2]) + 1
+
+
+def test_cache_lookups_are_labelled_by_result(client):
+    request = {"type": "selection-sort", "params": {"array": [4, 2, 3, 1, 17]}}
+    before = scrape(client)
+    assert client.post("/generate-steps", json=request).headers["x-cache"] == "MISS"
+    assert client.post("/generate-steps", json=request).headers["x-cache"] == "HIT"
+    after = scrape(client)
+
+    for result in ("miss", "hit"):
+        assert value(after, "algo_cache_requests_total", type="selection-sort", result=result) \
+            - value(before, "algo_cache_requests_total", type="selection-sort", result=result) == 1
+    assert 0 < value(after, "algo_cache_hit_ratio", type="selection-sort") < 1
+
+
+def test_snapshots_of_other_processes_are_merged(tmp_path):
+    # A process that has exited: its counters still count, its gauges do not
+    exited = subprocess.Popen([sys.executable, "-c", ""])
+    exited.wait()
+    other = MetricsRegistry()
+    other.request_started("heap-sort")
+    other.request_finished("heap-sort", 200, 0.02, 512, {"x-cache": "MISS", "x-step-count": "40"})
+    other.request_started("heap-sort")
+    (tmp_path / f"{exited.pid}.json").write_text(json.dumps({"pid": exited.pid, "metrics": other._snapshot()}))
+
+    registry = MetricsRegistry(str(tmp_path))
+    registry.request_started("heap-sort")
+    registry.request_finished("heap-sort", 200, 0.5, 2048, {"x-cache": "HIT", "x-step-count": "40"})
+    registry.request_started("heap-sort")
+    samples = parse(registry.render())
+
+    assert value(samples, "algo_requests_total", type="heap-sort", status="200") == 2
+    assert value(samples, "algo_trace_steps_count", type="heap-sort") == 2
+    assert value(samples, "algo_requests_in_flight", type="heap-sort") == 1
+    assert value(samples, "algo_cache_hit_ratio", type="heap-sort") == 0.5
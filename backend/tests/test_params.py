@@ -0,0 +1,44 @@
+"""Params limited to a few choices are refused with 422 before anything runs."""
+
+import pytest
+
+BAD_CHOICES = [
+    ("quick-sort", {"pivot": "first"}),
+    ("quick-sort", {"partition": "four-way"}),
+    ("merge-sort", {"strategy": "bogus"}),
+    ("tree-sort", {"balance": "bogus"}),
+]
+
+
+def _body(algo_type, params):
+    return {"type": algo_type, "params": {"array": [3, 1, 2], **params}}
+
+
+@pytest.mark.parametrize("algo_type,params", BAD_CHOICES, ids=[f"{t}{p}" for t, p in BAD_CHOICES])
+def test_unknown_choice_is_refused(client, algo_type, params):
+    body = _body(algo_type, params)
+    for response in (
+        client.post("/generate-steps", json=body),
+        client.post("/generate-steps", json={**body, "stream": True}),
+        client.post("/generate-steps", json={**body, "mode": "result"}),
+        client.post("/traces", json=body),
+        client.post("/generate-steps/batch", json={"types": [algo_type], "params": body["params"]}),
+    ):
+        assert response.status_code == 422, response.text
+        assert "expected one of" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("algo_type,params", BAD_CHOICES, ids=[f"{t}{p}" for t, p in BAD_CHOICES])
+def test_unknown_choice_closes_playback(client, algo_type, params):
+    with client.websocket_connect("/ws/play") as websocket:
+        websocket.send_json(_body(algo_type, params))
+        event = websocket.receive_json()
+        assert event["event"] == "error"
+        assert "expected one of" in event["detail"]
+
+
+def test_known_choices_are_listed(client):
+    quick_sort, = [algo for algo in client.get("/algorithms").json() if algo["type"] == "quick-sort"]
+    params = {param["name"]: param for param in quick_sort["params"]}
+    assert params["pivot"]["choices"] == ["last", "median-of-three", "ninther", "random"]
+    assert "choices" not in params["array"]
@@ -0,0 +1,42 @@
+"""A trace that fits in max_steps comes back whole; longer ones are sampled."""
+
+import pytest
+
+from app.algorithms.index import MODULES
+from app.registry import get_algorithm
+from app.sampling import _limit_steps, limit_steps
+from app.serialization import dump_steps
+from app.steps import Trace
+from benchmarks.cases import build_cases
+
+CASES = [
+    ("tim-sort", {"array": list(range(100))}),
+    ("bubble-sort", {"array": list(range(30, 0, -1))}),
+    ("tree-sort", {"array": list(range(40, 0, -1)), "balance": "red-black"}),
+    *[(case.algo_type, case.params) for case in build_cases(["jump-search", "dfs"], max_sizes=2)],
+    *[(case.algo_type, case.params) for case in build_cases(["matrix-chain-multiplication"], max_sizes=1)],
+    *[(case.algo_type, case.params) for case in build_cases(MODULES["greedy"], max_sizes=1)],
+]
+
+
+def _steps(algo_type, params):
+    return Trace(get_algorithm(algo_type).call(params))
+
+
+@pytest.mark.parametrize("algo_type,params", CASES, ids=[algo_type for algo_type, _ in CASES])
+def test_trace_that_fits_comes_back_whole(algo_type, params):
+    full = dump_steps(list(_steps(algo_type, params)))
+    length = len(list(_steps(algo_type, params)))
+    for max_steps in (length, length + 1, 4 * length):
+        assert dump_steps(list(limit_steps(_steps(algo_type, params), max_steps))) == full
+        assert dump_steps(list(_limit_steps(iter(_steps(algo_type, params)), max_steps))) == full
+
+
+@pytest.mark.parametrize("algo_type,params", CASES, ids=[algo_type for algo_type, _ in CASES])
+def test_trace_one_step_too_long_is_sampled(algo_type, params):
+    length = len(list(_steps(algo_type, params)))
+    if length < 3:
+        pytest.skip("nothing to drop")
+    sampled = list(limit_steps(_steps(algo_type, params), length - 1))
+    assert len(sampled) < length
+    assert sampled[-1].data["elided_steps"] == length - len(sampled)
@@ -0,0 +1,117 @@
+"""Streamed, buffered and packed responses carry the same trace."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.algorithms.index import MODULES
+from app.singleflight import StreamFlight
+from benchmarks.cases import build_cases
+
+REQUESTS = [
+    {"type": "quick-sort", "params": {"array": [9, 3, 7, 1, 8, 2, 6, 4, 5, 0] * 20}},
+    {"type": "bubble-sort", "params": {"array": list(range(60, 0, -1))}, "max_steps": 500},
+    {"type": "merge-sort", "params": {"array": [5, 1, 4, 2, 3]}, "encoding": "delta", "keyframe_interval": 4},
+    {"type": "karatsuba", "params": {"x": 1234, "y": 5678}},
+    {"type": "karatsuba", "params": {"x": 10 ** 30, "y": 10 ** 30}},
+]
+
+# Steps built from state the algorithm keeps changing: the smallest
+# benchmark case of every dynamic programming, greedy and graph algorithm
+STATEFUL = [
+    {"type": case.algo_type, "params": case.params}
+    for case in build_cases(MODULES["dynamic_programming"] + MODULES["greedy"] + MODULES["graph"], max_sizes=1)
+]
+
+
+def _operations(header):
+    return {name: int(count) for name, count in (part.split("=") for part in header.split(", ") if part)}
+
+
+@pytest.mark.parametrize("request_body", REQUESTS + STATEFUL, ids=[request["type"] for request in REQUESTS + STATEFUL])
+def test_stream_equals_buffered(client, request_body):
+    buffered = client.post("/generate-steps", json=request_body)
+    streamed = client.post("/generate-steps", json={**request_body, "stream": True})
+    assert buffered.status_code == streamed.status_code == 200
+
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    meta = lines.pop()["meta"]
+    assert lines == buffered.json()
+    assert meta["steps"] == len(lines) == int(buffered.headers["x-step-count"])
+    assert meta["operations"] == _operations(buffered.headers["x-operation-counts"])
+
+
+@pytest.mark.parametrize("request_body", STATEFUL, ids=[request["type"] for request in STATEFUL])
+def test_trace_window_equals_buffered(client, request_body):
+    buffered = client.post("/generate-steps", json=request_body).json()
+    trace = client.post("/traces", json=request_body).json()
+    assert trace["total_steps"] == len(buffered)
+    window = client.get(f"/traces/{trace['trace_id']}/steps", params={"offset": 1, "limit": len(buffered)})
+    assert window.json() == buffered[1:]
+
+
+@pytest.mark.parametrize("request_body", REQUESTS + STATEFUL, ids=[request["type"] for request in REQUESTS + STATEFUL])
+def test_msgpack_equals_json(client, request_body):
+    pytest.importorskip("msgpack")
+    from app.columnar import MSGPACK_MEDIA_TYPE, load_msgpack
+
+    packed = client.post("/generate-steps", json=request_body, headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert packed.status_code == 200
+    assert packed.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    assert load_msgpack(packed.content) == client.post("/generate-steps", json=request_body).json()
+
+
+def _chunks(count, produced):
+    for i in range(count):
+        produced.append(i)
+        yield str(i).encode()
+
+
+def test_shared_stream_buffer_is_bounded():
+    async def run():
+        flight = StreamFlight(max_chunks=4)
+        produced = []
+        fast, shared_fast = flight.attach("key", lambda: _chunks(100, produced))
+        slow, shared_slow = flight.attach("key", lambda: _chunks(100, produced))
+        assert (shared_fast, shared_slow) == (False, True)
+
+        async def read_slowly():
+            chunks = []
+            async for chunk in slow:
+                chunks.append(chunk)
+                await asyncio.sleep(0)
+            return chunks
+
+        slow_reader = asyncio.ensure_future(read_slowly())
+        fast_chunks = []
+        buffered = 0
+        async for chunk in fast:
+            fast_chunks.append(chunk)
+            buffered = max(buffered, produced[-1] + 1 - len(fast_chunks))
+            if len(fast_chunks) == 10:
+                # The first chunk is gone, so a late request starts over
+                late, shared_late = flight.attach("key", lambda: _chunks(3, []))
+                assert not shared_late
+                assert [chunk async for chunk in late] == [b"0", b"1", b"2"]
+        assert await slow_reader == fast_chunks == [str(i).encode() for i in range(100)]
+        assert buffered <= 5
+        assert len(produced) == 100
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_shared_stream_stops_when_every_subscriber_leaves():
+    async def run():
+        flight = StreamFlight(max_chunks=4)
+        produced = []
+        chunks, _ = flight.attach("key", lambda: _chunks(1000, produced))
+        async for _ in chunks:
+            break
+        await chunks.aclose()
+        await asyncio.sleep(0.05)
+        assert len(produced) < 10
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(run())
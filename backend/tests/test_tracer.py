@@ -0,0 +1,76 @@
+"""Traced sorts: sampling while tracing gives exactly what sampling afterwards gives."""
+
+import random
+
+import pytest
+
+from app.registry import get_algorithm
+from app.sampling import _limit_steps, limit_steps
+from app.serialization import dump_steps
+from app.steps import Trace
+
+SORTS = [
+    ("bubble-sort", {}), ("selection-sort", {}), ("insertion-sort", {}), ("heap-sort", {}),
+    ("counting-sort", {}), ("radix-sort", {}), ("bucket-sort", {}), ("shell-sort", {}),
+    ("comb-sort", {}), ("cycle-sort", {}), ("odd-even-sort", {}), ("tim-sort", {}),
+    ("quick-sort", {"pivot": "last"}), ("quick-sort", {"pivot": "median-of-three", "partition": "three-way"}),
+    ("quick-sort", {"pivot": "random", "seed": 7}),
+    ("merge-sort", {"strategy": "top-down"}), ("merge-sort", {"strategy": "bottom-up"}),
+    ("merge-sort", {"strategy": "natural"}),
+    ("tree-sort", {"balance": "none"}), ("tree-sort", {"balance": "avl"}), ("tree-sort", {"balance": "red-black"}),
+]
+
+_rng = random.Random(14)
+INPUTS = {
+    "empty": [],
+    "single": [7],
+    "sorted": list(range(40)),
+    "reversed": list(range(40, 0, -1)),
+    "duplicates": [_rng.randint(0, 9) for _ in range(60)],
+    "random": [_rng.randint(0, 999) for _ in range(150)],
+    "rotated": list(range(50, 100)) + list(range(50)),
+}
+
+
+def _trace(algo_type, params, arr):
+    return Trace(get_algorithm(algo_type).call({**params, "array": list(arr)}))
+
+
+@pytest.mark.parametrize("algo_type,params", SORTS, ids=[f"{t}{p}" for t, p in SORTS])
+@pytest.mark.parametrize("max_steps", [2, 17, 400])
+def test_sampled_trace_is_byte_identical(algo_type, params, max_steps):
+    for name, arr in INPUTS.items():
+        reference = _trace(algo_type, params, arr)
+        expected = dump_steps(list(_limit_steps(iter(reference), max_steps)))
+        traced = _trace(algo_type, params, arr)
+        assert dump_steps(list(limit_steps(traced, max_steps))) == expected, name
+        assert traced.operations == reference.operations, name
+
+
+@pytest.mark.parametrize("algo_type,params", SORTS, ids=[f"{t}{p}" for t, p in SORTS])
+def test_trace_agrees_with_result_mode(algo_type, params):
+    spec = get_algorithm(algo_type)
+    for name, arr in INPUTS.items():
+        trace = _trace(algo_type, params, arr)
+        steps = list(trace)
+        state, operations = spec.compute({**params, "array": list(arr)})
+        assert trace.operations == operations, name
+        if arr:
+            assert steps[-1].data["array"] == state["array"] == sorted(arr), name
+
+
+def test_sampled_trace_is_generated_lazily():
+    trace = _trace("bubble-sort", {}, range(2000, 0, -1))
+    steps = limit_steps(trace, 100)
+    first = next(steps)
+    assert first.id == "init"
+    # The sort has not run to the end, so no counts yet
+    assert trace.operations == {}
+    assert len(list(steps)) == 99
+    assert trace.operations["swaps"] == 2000 * 1999 // 2
+
+
+def test_steps_snapshot_the_buckets():
+    steps = list(_trace("bucket-sort", {}, INPUTS["random"]))
+    filled = [sum(map(len, step.data["buckets"])) for step in steps if step.id.startswith("bucket-place-")]
+    assert filled == list(range(1, len(INPUTS["random"]) + 1))
@@ -1,5 +1,6 @@
 import axios from 'axios';
 import type { AlgorithmStep } from '@/types/visualization-types';
+import { decodeColumnarTrace } from './columnar-trace';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
@@ -16,6 +17,85 @@ export async function fetchAlgorithmSteps(type: string, params: Record<string, a
     }
 }
 
+/**
+ * Same trace as fetchAlgorithmSteps through GET /generate-steps, which the
+ * browser (and any CDN in front of the backend) caches and revalidates by
+ * ETag, so reloading a page does not recompute or resend identical traces.
+ */
+export async function fetchAlgorithmStepsCached(type: string, params: Record<string, any>): Promise<AlgorithmStep[]> {
+    try {
+        const response = await axios.get(`${API_BASE_URL}/generate-steps`, {
+            params: { type, params: JSON.stringify(params) }
+        });
+        return response.data;
+    } catch (error) {
+        console.error('Error fetching algorithm steps from Python backend:', error);
+        throw error;
+    }
+}
+
+/**
+ * Expand a trace requested with `encoding: 'delta'` back into full steps.
+ * A step carrying `data.array` is a keyframe; a step carrying `data.delta`
+ * applies its [index, value] pairs to the previous array; a step with
+ * neither has no array at all.
+ */
+export function decodeDeltaSteps(steps: AlgorithmStep[]): AlgorithmStep[] {
+    let current: any[] | null = null;
+    return steps.map((step) => {
+        if (Array.isArray(step.data?.array)) {
+            current = step.data.array;
+            return step;
+        }
+        if (!Array.isArray(step.data?.delta) || current === null) return step;
+
+        const array: any[] = current.slice();
+        for (const [index, value] of step.data.delta) array[index] = value;
+        current = array;
+        const { delta: _delta, ...data } = step.data;
+        return { ...step, data: { ...data, array } };
+    });
+}
+
+export interface TraceMeta {
+    operations: Record<string, number>;
+    compute_ms: number;
+    steps: number;
+}
+
+export interface AlgorithmResult {
+    result: Record<string, any>;
+    operations: Record<string, number>;
+}
+
+/** Final state and operation counts only, without building a trace. */
+export async function fetchAlgorithmResult(type: string, params: Record<string, any>): Promise<AlgorithmResult> {
+    try {
+        const response = await axios.post(`${API_BASE_URL}/generate-steps`, {
+            type,
+            params,
+            mode: 'result'
+        });
+        return response.data;
+    } catch (error) {
+        console.error('Error fetching algorithm result from Python backend:', error);
+        throw error;
+    }
+}
+
+export async function fetchAlgorithmStepsPacked(type: string, params: Record<string, any>): Promise<AlgorithmStep[]> {
+    try {
+        const response = await axios.post(`${API_BASE_URL}/generate-steps`, { type, params }, {
+            headers: { Accept: 'application/x-msgpack' },
+            responseType: 'arraybuffer'
+        });
+        return decodeColumnarTrace(response.data);
+    } catch (error) {
+        console.error('Error fetching packed algorithm steps from Python backend:', error);
+        throw error;
+    }
+}
+
 export async function checkBackendStatus(): Promise<boolean> {
     try {
         const response = await axios.get(API_BASE_URL);
@@ -24,3 +104,126 @@ export async function checkBackendStatus(): Promise<boolean> {
         return false;
     }
 }
+
+export async function fetchAlgorithmStepsBatch(
+    types: string[],
+    params: Record<string, any>,
+    overrides: Record<string, Record<string, any>> = {}
+): Promise<Record<string, AlgorithmStep[]>> {
+    try {
+        const response = await axios.post(`${API_BASE_URL}/generate-steps/batch`, {
+            types,
+            params,
+            overrides
+        });
+        return response.data;
+    } catch (error) {
+        console.error('Error fetching batched algorithm steps from Python backend:', error);
+        throw error;
+    }
+}
+
+export async function streamAlgorithmSteps(
+    type: string,
+    params: Record<string, any>,
+    onStep: (step: AlgorithmStep) => void,
+    onMeta?: (meta: TraceMeta) => void
+): Promise<void> {
+    const response = await fetch(`${API_BASE_URL}/generate-steps`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ type, params, stream: true })
+    });
+    if (!response.ok || !response.body) {
+        throw new Error(`Streaming steps failed with status ${response.status}`);
+    }
+
+    // Steps arrive as newline-delimited JSON; a chunk may end mid-line.
+    // The last line is {"meta": ...} rather than a step.
+    const handleLine = (line: string) => {
+        const parsed = JSON.parse(line);
+        if ('meta' in parsed && !('id' in parsed)) onMeta?.(parsed.meta);
+        else onStep(parsed);
+    };
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffered = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffered += decoder.decode(value, { stream: true });
+        const lines = buffered.split('\n');
+        buffered = lines.pop() ?? '';
+        for (const line of lines) {
+            if (line) handleLine(line);
+        }
+    }
+    if (buffered) handleLine(buffered);
+}
+
+export interface PlaybackOptions {
+    speed?: number;
+    paused?: boolean;
+    encoding?: 'full' | 'delta';
+    maxSteps?: number;
+}
+
+export interface PlaybackHandlers {
+    /** Steps pushed by the server; `offset` is the index of the first one. */
+    onSteps: (offset: number, steps: AlgorithmStep[]) => void;
+    onState?: (state: { playing: boolean; position: number; speed: number }) => void;
+    onEnd?: (meta: TraceMeta) => void;
+    onError?: (detail: string) => void;
+}
+
+export interface PlaybackControls {
+    play(): void;
+    pause(): void;
+    step(): void;
+    seek(index: number): void;
+    setSpeed(stepsPerSecond: number): void;
+    close(): void;
+}
+
+/**
+ * Play a trace over the /ws/play WebSocket: the server runs the generator
+ * lazily and pushes steps at `speed` steps per second, so closing the
+ * session early saves the rest of the trace. Delta-encoded frames start
+ * with a keyframe after every seek; decode them with decodeDeltaSteps.
+ */
+export function openPlaybackSession(
+    type: string,
+    params: Record<string, any>,
+    handlers: PlaybackHandlers,
+    options: PlaybackOptions = {}
+): PlaybackControls {
+    const socket = new WebSocket(`${API_BASE_URL.replace(/^http/, 'ws')}/ws/play`);
+    const send = (message: Record<string, any>) => {
+        if (socket.readyState === WebSocket.OPEN) socket.send(JSON.stringify(message));
+    };
+    socket.onopen = () => {
+        socket.send(JSON.stringify({
+            type,
+            params,
+            speed: options.speed ?? 4,
+            paused: options.paused ?? false,
+            encoding: options.encoding ?? 'full',
+            max_steps: options.maxSteps
+        }));
+    };
+    socket.onmessage = (message) => {
+        const event = JSON.parse(message.data);
+        if (event.event === 'steps') handlers.onSteps(event.offset, event.steps);
+        else if (event.event === 'state' || event.event === 'ready') handlers.onState?.(event);
+        else if (event.event === 'end') handlers.onEnd?.(event.meta);
+        else if (event.event === 'error') handlers.onError?.(event.detail);
+    };
+    return {
+        play: () => send({ action: 'play' }),
+        pause: () => send({ action: 'pause' }),
+        step: () => send({ action: 'step' }),
+        seek: (index) => send({ action: 'seek', index }),
+        setSpeed: (stepsPerSecond) => send({ action: 'speed', value: stepsPerSecond }),
+        close: () => socket.close()
+    };
+}
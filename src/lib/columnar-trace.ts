@@ -0,0 +1,138 @@
+import type { AlgorithmStep } from '@/types/visualization-types';
+
+/**
+ * Decoder for the packed columnar trace the backend returns for
+ * `Accept: application/x-msgpack` (layout documented in backend/app/columnar.py).
+ * Only the MessagePack subset the backend emits is supported, so no extra
+ * dependency is needed.
+ */
+const BIG_INT_EXT = 1;
+
+class MsgpackReader {
+    private offset = 0;
+    private view: DataView;
+    private text = new TextDecoder();
+
+    constructor(private bytes: Uint8Array) {
+        this.view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    }
+
+    read(): any {
+        const type = this.bytes[this.offset++];
+        if (type <= 0x7f) return type;
+        if (type >= 0xe0) return type - 0x100;
+        if ((type & 0xf0) === 0x80) return this.map(type & 0x0f);
+        if ((type & 0xf0) === 0x90) return this.array(type & 0x0f);
+        if ((type & 0xe0) === 0xa0) return this.str(type & 0x1f);
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return this.bin(this.uint(1));
+            case 0xc5: return this.bin(this.uint(2));
+            case 0xc6: return this.bin(this.uint(4));
+            case 0xc7: return this.ext(this.uint(1));
+            case 0xc8: return this.ext(this.uint(2));
+            case 0xc9: return this.ext(this.uint(4));
+            case 0xca: return this.number((o) => this.view.getFloat32(o), 4);
+            case 0xcb: return this.number((o) => this.view.getFloat64(o), 8);
+            case 0xcc: return this.uint(1);
+            case 0xcd: return this.uint(2);
+            case 0xce: return this.uint(4);
+            case 0xcf: return this.number((o) => Number(this.view.getBigUint64(o)), 8);
+            case 0xd0: return this.number((o) => this.view.getInt8(o), 1);
+            case 0xd1: return this.number((o) => this.view.getInt16(o), 2);
+            case 0xd2: return this.number((o) => this.view.getInt32(o), 4);
+            case 0xd3: return this.number((o) => Number(this.view.getBigInt64(o)), 8);
+            case 0xd9: return this.str(this.uint(1));
+            case 0xda: return this.str(this.uint(2));
+            case 0xdb: return this.str(this.uint(4));
+            case 0xdc: return this.array(this.uint(2));
+            case 0xdd: return this.array(this.uint(4));
+            case 0xde: return this.map(this.uint(2));
+            case 0xdf: return this.map(this.uint(4));
+        }
+        throw new Error(`Unsupported MessagePack type 0x${type.toString(16)}`);
+    }
+
+    private number(get: (offset: number) => number, size: number): number {
+        const value = get(this.offset);
+        this.offset += size;
+        return value;
+    }
+
+    private uint(size: number): number {
+        if (size === 1) return this.number((o) => this.view.getUint8(o), 1);
+        if (size === 2) return this.number((o) => this.view.getUint16(o), 2);
+        return this.number((o) => this.view.getUint32(o), 4);
+    }
+
+    private bin(length: number): Uint8Array {
+        const value = this.bytes.subarray(this.offset, this.offset + length);
+        this.offset += length;
+        return value;
+    }
+
+    private ext(length: number): number {
+        // Type 1 is an integer past 64 bits as decimal digits; JSON.parse would give the same double
+        const code = this.number((o) => this.view.getInt8(o), 1);
+        if (code !== BIG_INT_EXT) throw new Error(`Unsupported MessagePack ext type ${code}`);
+        return Number(this.str(length));
+    }
+
+    private str(length: number): string {
+        return this.text.decode(this.bin(length));
+    }
+
+    private array(length: number): any[] {
+        const value = new Array(length);
+        for (let i = 0; i < length; i++) value[i] = this.read();
+        return value;
+    }
+
+    private map(length: number): Record<string, any> {
+        const value: Record<string, any> = {};
+        for (let i = 0; i < length; i++) {
+            const key = this.read();
+            value[key] = this.read();
+        }
+        return value;
+    }
+}
+
+function int32Column(bytes: Uint8Array): Int32Array {
+    // Copy so the view is 4-byte aligned; values are little-endian on the wire
+    const view = new DataView(bytes.slice().buffer);
+    const values = new Int32Array(bytes.byteLength / 4);
+    for (let i = 0; i < values.length; i++) values[i] = view.getInt32(i * 4, true);
+    return values;
+}
+
+function listColumn(column: { present: Uint8Array; offsets: Uint8Array; values: Uint8Array }) {
+    const offsets = int32Column(column.offsets);
+    const values = int32Column(column.values);
+    return (index: number): number[] | undefined =>
+        column.present[index] ? Array.from(values.subarray(offsets[index], offsets[index + 1])) : undefined;
+}
+
+export function decodeColumnarTrace(buffer: ArrayBuffer): AlgorithmStep[] {
+    const columns = new MsgpackReader(new Uint8Array(buffer)).read();
+    const currentValues = int32Column(columns.currentIndex.values);
+    const compared = listColumn(columns.comparedIndices);
+    const highlighted = listColumn(columns.highlightedIndices);
+    const arrays = listColumn(columns.array);
+
+    const steps: AlgorithmStep[] = [];
+    for (let i = 0; i < columns.count; i++) {
+        const array = arrays(i);
+        steps.push({
+            id: columns.id[i],
+            description: columns.description[i],
+            currentIndex: columns.currentIndex.present[i] ? currentValues[i] : undefined,
+            comparedIndices: compared(i),
+            highlightedIndices: highlighted(i),
+            data: array ? { ...columns.data[i], array } : columns.data[i],
+        });
+    }
+    return steps;
+}